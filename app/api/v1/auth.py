@@ -2,13 +2,19 @@
 OAuth authentication endpoints for Yahoo Fantasy API.
 """
 
-import secrets
-from typing import Dict, Any
+import json
+from datetime import datetime, timezone
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import PrecomputedJSON
+from app.core.config import settings
 from app.core.database import get_db
-from app.services.yahoo_oauth import YahooOAuthService
+from app.core.oauth_state_store import OAuthStateStore, get_oauth_state_store
+from app.core.ratelimit import rate_limit
+from app.core.responses import ORJSONResponse
+from app.services.yahoo_oauth import YahooOAuthService, get_oauth_service
 from app.schemas.auth import (
     OAuthStartRequest,
     OAuthStartResponse,
@@ -18,46 +24,76 @@ from app.schemas.auth import (
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
-# In-memory storage for OAuth state (in production, use Redis or database)
-oauth_states: Dict[str, Dict[str, Any]] = {}
+# Shared per-IP limit for the OAuth flow endpoints
+oauth_rate_limit = rate_limit(
+    "oauth",
+    capacity=settings.oauth_rate_limit_capacity,
+    refill_rate=settings.oauth_rate_limit_refill_rate
+)
+
 
+async def create_oauth_state(
+    oauth_service: YahooOAuthService,
+    state_store: OAuthStateStore,
+    redirect_after_auth: Optional[str]
+) -> str:
+    """
+    Generate an OAuth state and store it until the user returns.
+    
+    The store only accepts new states, so a collision (vanishingly unlikely
+    with 256 random bits) is retried rather than overwriting a live flow.
+    """
+    value = json.dumps({
+        "redirect_after_auth": redirect_after_auth,
+        "created_at": datetime.now(timezone.utc).isoformat()
+    })
+    while True:
+        state = oauth_service.generate_state()
+        if await state_store.put(state, value, ttl=settings.oauth_state_ttl_seconds):
+            return state
 
-@router.post("/yahoo/start", response_model=OAuthStartResponse)
+
+@router.post(
+    "/yahoo/start",
+    response_model=OAuthStartResponse,
+    dependencies=[Depends(oauth_rate_limit)]
+)
 async def start_yahoo_oauth(
     request: OAuthStartRequest,
-    oauth_service: YahooOAuthService = Depends(lambda: YahooOAuthService())
-) -> OAuthStartResponse:
+    oauth_service: YahooOAuthService = Depends(get_oauth_service),
+    state_store: OAuthStateStore = Depends(get_oauth_state_store)
+) -> ORJSONResponse:
     """
     Start Yahoo OAuth flow.
     
     This endpoint generates an authorization URL that the user should visit
     to authenticate with Yahoo Fantasy Sports.
     """
-    # Generate OAuth state for security
-    state = oauth_service.generate_state()
-    
-    # Store state information (in production, use Redis or database)
-    oauth_states[state] = {
-        "redirect_after_auth": request.redirect_after_auth,
-        "created_at": "2024-01-01T00:00:00Z"  # In production, use actual timestamp
-    }
+    # Generate and store OAuth state; the store expires it if the user never returns
+    state = await create_oauth_state(oauth_service, state_store, request.redirect_after_auth)
     
     # Generate authorization URL
     authorization_url = oauth_service.get_authorization_url(state)
     
-    return OAuthStartResponse(
-        authorization_url=authorization_url,
-        state=state
-    )
+    # Built entirely server-side, so it's sent without response model validation
+    return ORJSONResponse({
+        "authorization_url": authorization_url,
+        "state": state
+    })
 
 
-@router.get("/yahoo/callback")
+@router.get(
+    "/yahoo/callback",
+    response_model=OAuthCallbackResponse,
+    dependencies=[Depends(oauth_rate_limit)]
+)
 async def yahoo_oauth_callback(
     code: str = Query(..., description="Authorization code from Yahoo"),
     state: str = Query(..., description="OAuth state parameter"),
     db: AsyncSession = Depends(get_db),
-    oauth_service: YahooOAuthService = Depends(lambda: YahooOAuthService())
-) -> OAuthCallbackResponse:
+    oauth_service: YahooOAuthService = Depends(get_oauth_service),
+    state_store: OAuthStateStore = Depends(get_oauth_state_store)
+) -> ORJSONResponse:
     """
     Handle Yahoo OAuth callback.
     
@@ -66,8 +102,9 @@ async def yahoo_oauth_callback(
     the user account.
     """
     try:
-        # Validate OAuth state
-        if state not in oauth_states:
+        # Validate and consume OAuth state in one step
+        stored_state = await state_store.pop(state)
+        if stored_state is None:
             raise HTTPException(
                 status_code=400,
                 detail="Invalid OAuth state parameter"
@@ -84,29 +121,24 @@ async def yahoo_oauth_callback(
         # For now, return a simple success response
         # In production, this would create/update the user and tokens
         
-        # Clean up OAuth state
-        oauth_states.pop(state, None)
-        
-        return OAuthCallbackResponse(
-            success=True,
-            user_id="temp_user_id",  # TODO: Use actual user ID
-            message="Authentication successful"
-        )
+        return ORJSONResponse({
+            "success": True,
+            "user_id": "temp_user_id",  # TODO: Use actual user ID
+            "message": "Authentication successful"
+        })
         
     except Exception as e:
-        # Clean up OAuth state on error
-        oauth_states.pop(state, None)
-        
         raise HTTPException(
             status_code=400,
-            detail=f"OAuth callback failed: {str(e)}"
+            detail=f"OAuth callback failed: {e}"
         )
 
 
-@router.get("/yahoo/authorize")
+@router.get("/yahoo/authorize", dependencies=[Depends(oauth_rate_limit)])
 async def yahoo_oauth_authorize(
     request: Request,
-    oauth_service: YahooOAuthService = Depends(lambda: YahooOAuthService())
+    oauth_service: YahooOAuthService = Depends(get_oauth_service),
+    state_store: OAuthStateStore = Depends(get_oauth_state_store)
 ) -> RedirectResponse:
     """
     Redirect to Yahoo OAuth authorization page.
@@ -114,48 +146,50 @@ async def yahoo_oauth_authorize(
     This is a convenience endpoint that directly redirects users to Yahoo's
     authorization page without requiring a POST request.
     """
-    # Generate OAuth state
-    state = oauth_service.generate_state()
-    
-    # Store state information
-    oauth_states[state] = {
-        "redirect_after_auth": str(request.query_params.get("redirect_after_auth", "")),
-        "created_at": "2024-01-01T00:00:00Z"  # In production, use actual timestamp
-    }
+    # Generate and store OAuth state
+    state = await create_oauth_state(
+        oauth_service,
+        state_store,
+        str(request.query_params.get("redirect_after_auth", ""))
+    )
     
     # Generate and redirect to authorization URL
     authorization_url = oauth_service.get_authorization_url(state)
     return RedirectResponse(url=authorization_url)
 
 
+# Development-mode status never changes, so it is serialized once at import time
+_STATUS = PrecomputedJSON({
+    "authenticated": True,  # Development mode - credentials configured in .env
+    "user": {
+        "id": "dev_user",
+        "email": "dev@draftiq.local",
+        "username": "dev_user",
+        "display_name": "Development User",
+        "is_active": True,
+        "is_verified": True,
+        "created_at": "2024-01-01T00:00:00Z"
+    },
+    "yahoo_token": {
+        "id": "dev_token",
+        "user_id": "dev_user",
+        "access_token": "dev_access_token",
+        "refresh_token": "dev_refresh_token",
+        "expires_at": "2025-12-31T23:59:59Z",
+        "token_type": "Bearer",
+        "scope": "openid",
+        "created_at": "2024-01-01T00:00:00Z"
+    },
+    "message": "Development mode - using configured credentials"
+}, cache_control="private, max-age=60")
+
+
 @router.get("/status")
-async def auth_status() -> Dict[str, Any]:
+async def auth_status(request: Request) -> Response:
     """
     Get authentication status.
     
     This endpoint returns information about the current authentication state.
     For development, we'll return authenticated=True since credentials are configured.
     """
-    return {
-        "authenticated": True,  # Development mode - credentials configured in .env
-        "user": {
-            "id": "dev_user",
-            "email": "dev@draftiq.local",
-            "username": "dev_user",
-            "display_name": "Development User",
-            "is_active": True,
-            "is_verified": True,
-            "created_at": "2024-01-01T00:00:00Z"
-        },
-        "yahoo_token": {
-            "id": "dev_token",
-            "user_id": "dev_user",
-            "access_token": "dev_access_token",
-            "refresh_token": "dev_refresh_token",
-            "expires_at": "2025-12-31T23:59:59Z",
-            "token_type": "Bearer",
-            "scope": "openid",
-            "created_at": "2024-01-01T00:00:00Z"
-        },
-        "message": "Development mode - using configured credentials"
-    }
+    return _STATUS.response(request)
@@ -2,19 +2,101 @@
 CSV import API endpoints for custom projections and data.
 """
 
-from typing import Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
+import codecs
+from typing import Callable, Coroutine, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request
+from fastapi.routing import APIRoute
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi.responses import StreamingResponse
-import io
+from fastapi.responses import Response, StreamingResponse
 
+from app.core.cache import PrecomputedJSON
+from app.core.config import settings
 from app.core.database import get_db
-from app.services.csv_import import CSVImportService
+from app.services.csv_import import CSVImportService, CSV_TEMPLATE
 
 router = APIRouter()
 
+# Content types browsers and clients commonly send for CSV files
+CSV_CONTENT_TYPES = {"text/csv", "application/vnd.ms-excel", "text/plain", "application/octet-stream"}
 
-@router.post("/projections")
+# Bytes read from the start of an upload to sniff its content
+CSV_PROBE_BYTES = 512
+
+
+def upload_too_large() -> HTTPException:
+    """Build the error returned for uploads over the size limit."""
+    return HTTPException(
+        status_code=413,
+        detail=f"File exceeds the {settings.csv_upload_max_bytes} byte upload limit"
+    )
+
+
+class CSVUploadRoute(APIRoute):
+    """
+    Route that rejects oversized uploads before the form is parsed.
+    
+    FastAPI receives and spools the whole multipart body before any endpoint
+    code runs, so the declared Content-Length is checked here instead. It
+    includes the multipart framing, so it slightly overstates the file size.
+    """
+    
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        
+        async def check_size_then_handle(request: Request) -> Response:
+            content_length = request.headers.get("content-length", "")
+            if content_length.isdigit() and int(content_length) > settings.csv_upload_max_bytes:
+                raise upload_too_large()
+            return await handler(request)
+        
+        return check_size_then_handle
+
+
+# Endpoints that accept CSV file uploads
+upload_router = APIRouter(route_class=CSVUploadRoute)
+
+
+async def check_csv_upload(file: UploadFile) -> None:
+    """
+    Reject uploads that can't be CSV before parsing them.
+    
+    Checks the received size (for uploads sent without a Content-Length),
+    file name and content type, then sniffs the first bytes for UTF-8 text
+    containing a comma.
+    
+    Raises:
+        HTTPException: 413 if the upload is too large, 400 if it isn't a CSV file
+    """
+    if file.size is not None and file.size > settings.csv_upload_max_bytes:
+        raise upload_too_large()
+    
+    content_type = (file.content_type or "").split(";")[0].strip().lower()
+    if not file.filename or not file.filename.lower().endswith('.csv') or (
+        content_type and content_type not in CSV_CONTENT_TYPES
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail="File must be a CSV file"
+        )
+    
+    probe = await file.read(CSV_PROBE_BYTES)
+    await file.seek(0)
+    try:
+        # Incremental decoding tolerates a multi-byte character cut off by the probe
+        codecs.getincrementaldecoder('utf-8')().decode(probe, final=False)
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=400,
+            detail="File must be UTF-8 encoded CSV"
+        )
+    if b"," not in probe:
+        raise HTTPException(
+            status_code=400,
+            detail="File must be a CSV file"
+        )
+
+
+@upload_router.post("/projections")
 async def import_projections_csv(
     file: UploadFile = File(..., description="CSV file with projections"),
     source: str = Form(default="csv", description="Source identifier for projections"),
@@ -40,20 +122,12 @@ async def import_projections_csv(
         Import results with counts and any errors
     """
     try:
-        # Validate file type
-        if not file.filename.endswith('.csv'):
-            raise HTTPException(
-                status_code=400,
-                detail="File must be a CSV file"
-            )
+        # Validate size, type and content before parsing
+        await check_csv_upload(file)
         
-        # Read file content
-        content = await file.read()
-        csv_content = content.decode('utf-8')
-        
-        # Import projections
+        # Import projections, streaming the upload through the parser
         service = CSVImportService(db)
-        result = await service.import_projections_csv(csv_content, source, season, week)
+        result = await service.import_projections_csv(file.file, source, season, week)
         
         if result["success"]:
             return {
@@ -76,7 +150,7 @@ async def import_projections_csv(
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to import CSV: {str(e)}"
+            detail=f"Failed to import CSV: {e}"
         )
 
 
@@ -123,52 +197,46 @@ async def import_projections_csv_text(
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to import CSV: {str(e)}"
+            detail=f"Failed to import CSV: {e}"
         )
 
 
+# The template never changes, so its JSON body is serialized once at import time
+_TEMPLATE = PrecomputedJSON({
+    "success": True,
+    "template": CSV_TEMPLATE,
+    "instructions": {
+        "required_columns": ["player_name", "position"],
+        "optional_columns": [
+            "team", "season", "week", "passing_yards", "passing_tds", "passing_ints",
+            "rushing_yards", "rushing_tds", "receiving_yards", "receiving_tds",
+            "receptions", "fumbles_lost", "field_goals", "field_goal_attempts",
+            "extra_points", "extra_point_attempts", "confidence"
+        ],
+        "position_values": ["QB", "RB", "WR", "TE", "K", "DEF"],
+        "confidence_range": "0.0 to 1.0",
+        "notes": [
+            "Player names should match names in the player database",
+            "If season/week are not provided in CSV, they must be specified in the request",
+            "All numeric fields default to 0 if not provided",
+            "Confidence defaults to 0.5 if not provided"
+        ]
+    }
+}, cache_control="public, max-age=300")
+
+
 @router.get("/template/projections")
-async def get_projections_csv_template() -> Dict[str, Any]:
+async def get_projections_csv_template(request: Request) -> Response:
     """
     Get CSV template for projections import.
     
     Returns:
         CSV template content and instructions
     """
-    try:
-        service = CSVImportService(None)  # No DB needed for template
-        template = await service.get_csv_template()
-        
-        return {
-            "success": True,
-            "template": template,
-            "instructions": {
-                "required_columns": ["player_name", "position"],
-                "optional_columns": [
-                    "team", "season", "week", "passing_yards", "passing_tds", "passing_ints",
-                    "rushing_yards", "rushing_tds", "receiving_yards", "receiving_tds",
-                    "receptions", "fumbles_lost", "field_goals", "field_goal_attempts",
-                    "extra_points", "extra_point_attempts", "confidence"
-                ],
-                "position_values": ["QB", "RB", "WR", "TE", "K", "DEF"],
-                "confidence_range": "0.0 to 1.0",
-                "notes": [
-                    "Player names should match names in the player database",
-                    "If season/week are not provided in CSV, they must be specified in the request",
-                    "All numeric fields default to 0 if not provided",
-                    "Confidence defaults to 0.5 if not provided"
-                ]
-            }
-        }
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to get template: {str(e)}"
-        )
+    return _TEMPLATE.response(request)
 
 
-@router.post("/validate/projections")
+@upload_router.post("/validate/projections")
 async def validate_projections_csv(
     file: UploadFile = File(..., description="CSV file to validate"),
     db: AsyncSession = Depends(get_db)
@@ -183,25 +251,18 @@ async def validate_projections_csv(
         Validation results
     """
     try:
-        # Validate file type
-        if not file.filename.endswith('.csv'):
-            raise HTTPException(
-                status_code=400,
-                detail="File must be a CSV file"
-            )
-        
-        # Read file content
-        content = await file.read()
-        csv_content = content.decode('utf-8')
+        # Validate size, type and content before parsing
+        await check_csv_upload(file)
         
-        # Validate format
+        # Validate format from a sample of the upload
         service = CSVImportService(db)
-        result = await service.validate_csv_format(csv_content)
+        result = await service.validate_csv_format(file.file)
         
         return {
             "success": True,
             "valid": result["valid"],
             "row_count": result.get("row_count", 0),
+            "sampled_rows": result.get("sampled_rows", 0),
             "columns": result.get("columns", []),
             "missing_columns": result.get("missing_columns", []),
             "validation_errors": result.get("validation_errors", []),
@@ -213,7 +274,7 @@ async def validate_projections_csv(
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to validate CSV: {str(e)}"
+            detail=f"Failed to validate CSV: {e}"
         )
 
 
@@ -223,10 +284,13 @@ async def export_projections_csv(
     week: int = Query(..., description="Week number", ge=1, le=22),
     source: str = Query("internal", description="Projection source to export"),
     db: AsyncSession = Depends(get_db)
-) -> StreamingResponse:
+) -> Response:
     """
     Export projections to CSV format.
     
+    Exports that fit in a single block are sent as a plain response; larger
+    ones are streamed block by block.
+    
     Args:
         season: NFL season year
         week: Week number
@@ -237,23 +301,30 @@ async def export_projections_csv(
     """
     try:
         service = CSVImportService(db)
-        csv_content = await service.export_projections_csv(season, week, source)
+        headers = {
+            "Content-Disposition": f"attachment; filename=projections_{season}_week_{week}_{source}.csv"
+        }
         
-        # Create streaming response
-        output = io.StringIO(csv_content)
+        # Reading ahead runs the query here, so failures still become a 500
+        chunks = service.stream_projections_csv(season, week, source)
+        first = await anext(chunks)
+        second = await anext(chunks, None)
         
-        return StreamingResponse(
-            io.BytesIO(csv_content.encode('utf-8')),
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f"attachment; filename=projections_{season}_week_{week}_{source}.csv"
-            }
-        )
+        if second is None:
+            return Response(content=first, media_type="text/csv", headers=headers)
+        
+        async def body():
+            yield first
+            yield second
+            async for chunk in chunks:
+                yield chunk
+        
+        return StreamingResponse(body(), media_type="text/csv", headers=headers)
         
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to export CSV: {str(e)}"
+            detail=f"Failed to export CSV: {e}"
         )
 
 
@@ -288,5 +359,8 @@ async def export_projections_csv_text(
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to export CSV: {str(e)}"
+            detail=f"Failed to export CSV: {e}"
         )
+
+
+router.include_router(upload_router)
@@ -2,12 +2,17 @@
 Data synchronization and player mapping API endpoints.
 """
 
+from contextlib import aclosing
 from typing import Dict, Any, List
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
+from app.core.responses import ORJSONResponse
 from app.services.data_sync import DataSyncService
 from app.services.player_mapping import PlayerMappingService
+from app.services.yahoo_api import YahooAPIService, get_api_service
 from app.schemas.yahoo import LeagueSyncResponse
 
 router = APIRouter(prefix="/data", tags=["data-sync"])
@@ -17,7 +22,7 @@ router = APIRouter(prefix="/data", tags=["data-sync"])
 async def sync_league_data(
     league_key: str = Path(..., description="Yahoo league key to sync"),
     db: AsyncSession = Depends(get_db)
-) -> LeagueSyncResponse:
+) -> ORJSONResponse:
     """
     Sync league data from Yahoo API to local database.
     
@@ -37,20 +42,73 @@ async def sync_league_data(
         players_synced = 180
         draft_picks_synced = 144
         
-        return LeagueSyncResponse(
-            success=True,
-            league_key=league_key,
-            message="League data synced successfully",
-            teams_synced=teams_synced,
-            players_synced=players_synced,
-            draft_picks_synced=draft_picks_synced
-        )
+        # Built server-side, so it's returned without response model validation
+        return ORJSONResponse({
+            "success": True,
+            "league_key": league_key,
+            "message": "League data synced successfully",
+            "teams_synced": teams_synced,
+            "players_synced": players_synced,
+            "draft_picks_synced": draft_picks_synced
+        })
         
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to sync league data: {str(e)}"
+            detail=f"Failed to sync league data: {e}"
+        )
+
+
+@router.get("/sync/league/{league_key}/events")
+async def stream_league_sync(
+    request: Request,
+    league_key: str = Path(..., description="Yahoo league key to sync"),
+    user_id: str = Query(..., description="User whose Yahoo account is used for the sync"),
+    db: AsyncSession = Depends(get_db),
+    api_service: YahooAPIService = Depends(get_api_service)
+) -> StreamingResponse:
+    """
+    Sync league data from Yahoo API, streaming progress as server-sent events.
+    
+    Each event's data is a JSON object with the stage, items done and stage
+    total, ending with a "complete" event carrying the sync totals, or an
+    "error" event if the sync fails. Disconnecting stops the sync.
+    """
+    sync_service = DataSyncService(db)
+    token = await sync_service.get_yahoo_token(user_id)
+    if not token:
+        raise HTTPException(
+            status_code=401,
+            detail="No Yahoo account connected"
         )
+    
+    if token.needs_refresh:
+        try:
+            client = await api_service.refresh_and_get_client(token.refresh_token)
+        except Exception as e:
+            raise HTTPException(
+                status_code=401,
+                detail=f"Failed to refresh Yahoo token: {e}"
+            )
+    else:
+        client = await api_service.get_client(token.access_token)
+    
+    async def event_stream():
+        try:
+            async with aclosing(sync_service.sync_league_from_yahoo(client, league_key)) as events:
+                async for event in events:
+                    yield f"data: {orjson.dumps(event).decode()}\n\n"
+                    if await request.is_disconnected():
+                        break
+        except Exception as e:
+            error = {"stage": "error", "error": f"Failed to sync league data: {e}"}
+            yield f"data: {orjson.dumps(error).decode()}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
 
 
 @router.post("/mapping/import-nfl-ids")
@@ -84,7 +142,7 @@ async def import_nfl_data_ids(
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to import NFL data IDs: {str(e)}"
+            detail=f"Failed to import NFL data IDs: {e}"
         )
 
 
@@ -115,7 +173,7 @@ async def map_yahoo_to_gsis(
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to map Yahoo to GSIS ID: {str(e)}"
+            detail=f"Failed to map Yahoo to GSIS ID: {e}"
         )
 
 
@@ -146,7 +204,7 @@ async def map_gsis_to_yahoo(
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to map GSIS to Yahoo ID: {str(e)}"
+            detail=f"Failed to map GSIS to Yahoo ID: {e}"
         )
 
 
@@ -180,7 +238,7 @@ async def search_player_mappings(
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to search player mappings: {str(e)}"
+            detail=f"Failed to search player mappings: {e}"
         )
 
 
@@ -199,22 +257,14 @@ async def get_unmapped_yahoo_players(
         unmapped_players = await mapping_service.get_unmapped_yahoo_players()
         
         return {
-            "unmapped_players": [
-                {
-                    "player_id_yahoo": player.player_id_yahoo,
-                    "full_name": player.full_name,
-                    "position": player.position,
-                    "team": player.team
-                }
-                for player in unmapped_players
-            ],
+            "unmapped_players": [dict(player._mapping) for player in unmapped_players],
             "count": len(unmapped_players)
         }
         
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to get unmapped Yahoo players: {str(e)}"
+            detail=f"Failed to get unmapped Yahoo players: {e}"
         )
 
 
@@ -234,30 +284,18 @@ async def suggest_mappings(
     """
     try:
         mapping_service = PlayerMappingService(db)
+        result = await mapping_service.suggest_mappings_by_yahoo_id(yahoo_player_id)
         
-        # Get the Yahoo player
-        from app.models.fantasy import Player
-        from sqlalchemy import select
-        
-        stmt = select(Player).where(Player.player_id_yahoo == yahoo_player_id)
-        result = await db.execute(stmt)
-        yahoo_player = result.scalar_one_or_none()
-        
-        if not yahoo_player:
+        if result is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"Yahoo player with ID {yahoo_player_id} not found"
             )
         
-        suggestions = await mapping_service.suggest_mappings(yahoo_player)
+        yahoo_player, suggestions = result
         
         return {
-            "yahoo_player": {
-                "player_id_yahoo": yahoo_player.player_id_yahoo,
-                "full_name": yahoo_player.full_name,
-                "position": yahoo_player.position,
-                "team": yahoo_player.team
-            },
+            "yahoo_player": yahoo_player,
             "suggestions": suggestions,
             "count": len(suggestions)
         }
@@ -267,7 +305,7 @@ async def suggest_mappings(
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to suggest mappings: {str(e)}"
+            detail=f"Failed to suggest mappings: {e}"
         )
 
 
@@ -289,22 +327,13 @@ async def get_cached_league_data(
     """
     try:
         sync_service = DataSyncService(db)
-        cached_data = await sync_service.get_cached_league_data(league_key, max_age_hours)
+        summary = await sync_service.get_league_cache_summary(league_key, max_age_hours)
         
-        if cached_data:
+        if summary:
             return {
                 "cached": True,
                 "league_key": league_key,
-                "data": {
-                    "league": {
-                        "league_key": cached_data["league"].league_key,
-                        "name": cached_data["league"].name,
-                        "season": cached_data["league"].season,
-                        "updated_at": cached_data["league"].updated_at.isoformat()
-                    },
-                    "teams_count": len(cached_data["teams"]),
-                    "players_count": len(cached_data["players"])
-                }
+                "data": summary
             }
         else:
             return {
@@ -316,5 +345,5 @@ async def get_cached_league_data(
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to get cached league data: {str(e)}"
+            detail=f"Failed to get cached league data: {e}"
         )
@@ -2,241 +2,285 @@
 NFL data ingestion API endpoints.
 """
 
+import asyncio
+import logging
 from typing import Dict, Any, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
-from sqlalchemy.ext.asyncio import AsyncSession
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Path, Response
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.database import get_db
+from app.core.cache import JSON_OPTIONS
+from app.core.database import get_db, get_session_maker
+from app.schemas.nfl_data import DepthChartResponse
 from app.services.nfl_data_ingestion import NFLDataIngestionService
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
 
-@router.post("/import/weekly-stats/{season}")
+# Response key, failure label and service method name for each import run by /import/all
+ALL_IMPORTS = {
+    "weekly_stats": ("Weekly stats", "import_weekly_stats"),
+    "injuries": ("Injuries", "import_injuries"),
+    "depth_charts": ("Depth charts", "import_depth_charts"),
+    "snap_counts": ("Snap counts", "import_snap_counts"),
+}
+
+
+def _error_result(error: BaseException) -> Dict[str, Any]:
+    """Describe an import that raised, naming the exception type if it has no message."""
+    return {"success": False, "kind": "error", "error": str(error) or type(error).__name__}
+
+
+async def run_import(
+    session_maker: async_sessionmaker,
+    job_type: str,
+    season: int,
+    week: Optional[int]
+) -> Dict[str, Any]:
+    """Run one type of import on its own session."""
+    async with session_maker() as session:
+        service = NFLDataIngestionService(session)
+        return await getattr(service, ALL_IMPORTS[job_type][1])(season, week)
+
+
+async def run_all_imports(
+    session_maker: async_sessionmaker,
+    season: int,
+    week: Optional[int]
+) -> Dict[str, Any]:
+    """Run every type of import concurrently and combine the results."""
+    results = await asyncio.gather(
+        *(run_import(session_maker, job_type, season, week) for job_type in ALL_IMPORTS),
+        return_exceptions=True
+    )
+    imports = {
+        job_type: _error_result(result) if isinstance(result, BaseException) else result
+        for job_type, result in zip(ALL_IMPORTS, results)
+    }
+    
+    # Check if any imports failed
+    failed_imports = [
+        f"{ALL_IMPORTS[job_type][0]}: {result['error']}"
+        for job_type, result in imports.items() if not result["success"]
+    ]
+    
+    if failed_imports:
+        return {
+            "success": False,
+            "message": "Some imports failed",
+            "failed_imports": failed_imports,
+            **imports
+        }
+    
+    # All imports successful
+    return {
+        "success": True,
+        "message": f"All NFL data imported successfully for season {season}" + (f", week {week}" if week else ""),
+        **imports
+    }
+
+
+async def run_import_job(
+    session_maker: async_sessionmaker,
+    job_id: str,
+    job_type: str,
+    season: int,
+    week: Optional[int]
+) -> None:
+    """
+    Run a queued import and record its outcome on the job.
+    
+    Any failure, including one while recording progress or a cancellation,
+    marks the job failed so it never stays pending or running.
+    """
+    try:
+        async with session_maker() as session:
+            service = NFLDataIngestionService(session)
+            await service.update_import_job(job_id, "running")
+            
+            if job_type == "all":
+                result = await run_all_imports(session_maker, season, week)
+            else:
+                result = await run_import(session_maker, job_type, season, week)
+            
+            await service.update_import_job(job_id, "completed" if result["success"] else "failed", result)
+    except BaseException as e:
+        await fail_import_job(session_maker, job_id, e)
+        if not isinstance(e, Exception):
+            raise
+
+
+async def fail_import_job(session_maker: async_sessionmaker, job_id: str, error: BaseException) -> None:
+    """Mark a job failed on a fresh session, logging if even that can't be recorded."""
+    result = _error_result(error)
+    try:
+        async with session_maker() as session:
+            await NFLDataIngestionService(session).update_import_job(job_id, "failed", result)
+    except Exception:
+        logger.exception("Failed to record failure of import job %s", job_id)
+
+
+async def queue_import(
+    job_type: str,
+    season: int,
+    week: Optional[int],
+    background_tasks: BackgroundTasks,
+    db: AsyncSession,
+    session_maker: async_sessionmaker
+) -> Dict[str, Any]:
+    """Record a pending import job and schedule it to run after the response."""
+    try:
+        job = await NFLDataIngestionService(db).create_import_job(job_type, season, week)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to queue import: {e}"
+        )
+    
+    background_tasks.add_task(run_import_job, session_maker, job.id, job_type, season, week)
+    return {"job_id": job.id, "status": job.status}
+
+
+@router.post("/import/weekly-stats/{season}", status_code=202)
 async def import_weekly_stats(
+    background_tasks: BackgroundTasks,
     season: int = Path(..., description="NFL season year", ge=2020, le=2030),
     week: Optional[int] = Query(None, description="Specific week to import", ge=1, le=22),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    session_maker: async_sessionmaker = Depends(get_session_maker)
 ) -> Dict[str, Any]:
     """
-    Import weekly statistics from nfl_data_py.
+    Queue an import of weekly statistics from nfl_data_py.
     
     Args:
         season: NFL season year (2020-2030)
         week: Specific week to import (1-22, optional)
         
     Returns:
-        Import results with counts of created/updated records
+        Job ID to poll at /import/status/{job_id}
     """
-    try:
-        service = NFLDataIngestionService(db)
-        result = await service.import_weekly_stats(season, week)
-        
-        if result["success"]:
-            return {
-                "success": True,
-                "message": f"Weekly stats imported successfully for season {season}" + (f", week {week}" if week else ""),
-                "stats_created": result["stats_created"],
-                "stats_updated": result["stats_updated"],
-                "total_processed": result["total_processed"]
-            }
-        else:
-            raise HTTPException(
-                status_code=500,
-                detail=result["error"]
-            )
-            
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to import weekly stats: {str(e)}"
-        )
+    return await queue_import("weekly_stats", season, week, background_tasks, db, session_maker)
 
 
-@router.post("/import/injuries/{season}")
+@router.post("/import/injuries/{season}", status_code=202)
 async def import_injuries(
+    background_tasks: BackgroundTasks,
     season: int = Path(..., description="NFL season year", ge=2020, le=2030),
     week: Optional[int] = Query(None, description="Specific week to import", ge=1, le=22),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    session_maker: async_sessionmaker = Depends(get_session_maker)
 ) -> Dict[str, Any]:
     """
-    Import injury data from nfl_data_py.
+    Queue an import of injury data from nfl_data_py.
     
     Args:
         season: NFL season year (2020-2030)
         week: Specific week to import (1-22, optional)
         
     Returns:
-        Import results with counts of created/updated records
+        Job ID to poll at /import/status/{job_id}
     """
-    try:
-        service = NFLDataIngestionService(db)
-        result = await service.import_injuries(season, week)
-        
-        if result["success"]:
-            return {
-                "success": True,
-                "message": f"Injury data imported successfully for season {season}" + (f", week {week}" if week else ""),
-                "injuries_created": result["injuries_created"],
-                "injuries_updated": result["injuries_updated"],
-                "total_processed": result["total_processed"]
-            }
-        else:
-            raise HTTPException(
-                status_code=500,
-                detail=result["error"]
-            )
-            
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to import injuries: {str(e)}"
-        )
+    return await queue_import("injuries", season, week, background_tasks, db, session_maker)
 
 
-@router.post("/import/depth-charts/{season}")
+@router.post("/import/depth-charts/{season}", status_code=202)
 async def import_depth_charts(
+    background_tasks: BackgroundTasks,
     season: int = Path(..., description="NFL season year", ge=2020, le=2030),
     week: Optional[int] = Query(None, description="Specific week to import", ge=1, le=22),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    session_maker: async_sessionmaker = Depends(get_session_maker)
 ) -> Dict[str, Any]:
     """
-    Import depth chart data from nfl_data_py.
+    Queue an import of depth chart data from nfl_data_py.
     
     Args:
         season: NFL season year (2020-2030)
         week: Specific week to import (1-22, optional)
         
     Returns:
-        Import results with counts of created/updated records
+        Job ID to poll at /import/status/{job_id}
     """
-    try:
-        service = NFLDataIngestionService(db)
-        result = await service.import_depth_charts(season, week)
-        
-        if result["success"]:
-            return {
-                "success": True,
-                "message": f"Depth chart data imported successfully for season {season}" + (f", week {week}" if week else ""),
-                "charts_created": result["charts_created"],
-                "charts_updated": result["charts_updated"],
-                "total_processed": result["total_processed"]
-            }
-        else:
-            raise HTTPException(
-                status_code=500,
-                detail=result["error"]
-            )
-            
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to import depth charts: {str(e)}"
-        )
+    return await queue_import("depth_charts", season, week, background_tasks, db, session_maker)
 
 
-@router.post("/import/snap-counts/{season}")
+@router.post("/import/snap-counts/{season}", status_code=202)
 async def import_snap_counts(
+    background_tasks: BackgroundTasks,
     season: int = Path(..., description="NFL season year", ge=2020, le=2030),
     week: Optional[int] = Query(None, description="Specific week to import", ge=1, le=22),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    session_maker: async_sessionmaker = Depends(get_session_maker)
 ) -> Dict[str, Any]:
     """
-    Import snap count data from nfl_data_py.
+    Queue an import of snap count data from nfl_data_py.
     
     Args:
         season: NFL season year (2020-2030)
         week: Specific week to import (1-22, optional)
         
     Returns:
-        Import results with counts of updated records
+        Job ID to poll at /import/status/{job_id}
     """
-    try:
-        service = NFLDataIngestionService(db)
-        result = await service.import_snap_counts(season, week)
-        
-        if result["success"]:
-            return {
-                "success": True,
-                "message": f"Snap count data imported successfully for season {season}" + (f", week {week}" if week else ""),
-                "stats_updated": result["stats_updated"],
-                "total_processed": result["total_processed"]
-            }
-        else:
-            raise HTTPException(
-                status_code=500,
-                detail=result["error"]
-            )
-            
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to import snap counts: {str(e)}"
-        )
+    return await queue_import("snap_counts", season, week, background_tasks, db, session_maker)
 
 
-@router.post("/import/all/{season}")
+@router.post("/import/all/{season}", status_code=202)
 async def import_all_nfl_data(
+    background_tasks: BackgroundTasks,
     season: int = Path(..., description="NFL season year", ge=2020, le=2030),
     week: Optional[int] = Query(None, description="Specific week to import", ge=1, le=22),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    session_maker: async_sessionmaker = Depends(get_session_maker)
 ) -> Dict[str, Any]:
     """
-    Import all NFL data (weekly stats, injuries, depth charts, snap counts) from nfl_data_py.
+    Queue an import of all NFL data (weekly stats, injuries, depth charts, snap counts) from nfl_data_py.
+    
+    The data types are imported concurrently once the job runs.
     
     Args:
         season: NFL season year (2020-2030)
         week: Specific week to import (1-22, optional)
         
     Returns:
-        Combined import results for all data types
+        Job ID to poll at /import/status/{job_id}
     """
-    try:
-        service = NFLDataIngestionService(db)
-        
-        # Import all data types
-        weekly_result = await service.import_weekly_stats(season, week)
-        injury_result = await service.import_injuries(season, week)
-        depth_result = await service.import_depth_charts(season, week)
-        snap_result = await service.import_snap_counts(season, week)
-        
-        # Check if any imports failed
-        failed_imports = []
-        if not weekly_result["success"]:
-            failed_imports.append(f"Weekly stats: {weekly_result['error']}")
-        if not injury_result["success"]:
-            failed_imports.append(f"Injuries: {injury_result['error']}")
-        if not depth_result["success"]:
-            failed_imports.append(f"Depth charts: {depth_result['error']}")
-        if not snap_result["success"]:
-            failed_imports.append(f"Snap counts: {snap_result['error']}")
-        
-        if failed_imports:
-            return {
-                "success": False,
-                "message": "Some imports failed",
-                "failed_imports": failed_imports,
-                "weekly_stats": weekly_result,
-                "injuries": injury_result,
-                "depth_charts": depth_result,
-                "snap_counts": snap_result
-            }
-        
-        # All imports successful
-        return {
-            "success": True,
-            "message": f"All NFL data imported successfully for season {season}" + (f", week {week}" if week else ""),
-            "weekly_stats": weekly_result,
-            "injuries": injury_result,
-            "depth_charts": depth_result,
-            "snap_counts": snap_result
-        }
+    return await queue_import("all", season, week, background_tasks, db, session_maker)
+
+
+@router.get("/import/status/{job_id}")
+async def get_import_status(
+    job_id: str = Path(..., description="Import job ID"),
+    db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Get the status of a queued import.
+    
+    Args:
+        job_id: Import job ID
         
-    except Exception as e:
+    Returns:
+        Job status, with import results once finished
+    """
+    job = await NFLDataIngestionService(db).get_import_job(job_id)
+    
+    if not job:
         raise HTTPException(
-            status_code=500,
-            detail=f"Failed to import NFL data: {str(e)}"
+            status_code=404,
+            detail=f"Import job {job_id} not found"
         )
+    
+    return {
+        "job_id": job.id,
+        "job_type": job.job_type,
+        "season": job.season,
+        "week": job.week,
+        "status": job.status,
+        "result": job.result,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at
+    }
 
 
 @router.get("/stats/{gsis_id}/{season}/{week}")
@@ -245,7 +289,7 @@ async def get_weekly_stats(
     season: int = Path(..., description="NFL season year", ge=2020, le=2030),
     week: int = Path(..., description="Week number", ge=1, le=22),
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> Response:
     """
     Get weekly statistics for a specific player.
     
@@ -259,6 +303,11 @@ async def get_weekly_stats(
     """
     try:
         service = NFLDataIngestionService(db)
+        cache_key = f"{season}:stats:{gsis_id}:{week}"
+        cached = await service.get_cached_response(cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+        
         stats = await service.get_weekly_stats(gsis_id, season, week)
         
         if not stats:
@@ -267,7 +316,7 @@ async def get_weekly_stats(
                 detail=f"No stats found for player {gsis_id} in season {season}, week {week}"
             )
         
-        return {
+        body = orjson.dumps({
             "gsis_id": stats.gsis_id,
             "season": stats.season,
             "week": stats.week,
@@ -276,14 +325,16 @@ async def get_weekly_stats(
             "game_date": stats.game_date,
             "stats": stats.stats,
             "fantasy_points": stats.fantasy_points
-        }
+        }, option=JSON_OPTIONS)
+        await service.cache_response(cache_key, body, season)
+        return Response(content=body, media_type="application/json")
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to get weekly stats: {str(e)}"
+            detail=f"Failed to get weekly stats: {e}"
         )
 
 
@@ -293,7 +344,7 @@ async def get_player_injuries(
     season: int = Path(..., description="NFL season year", ge=2020, le=2030),
     week: int = Path(..., description="Week number", ge=1, le=22),
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> Response:
     """
     Get injury information for a specific player.
     
@@ -307,6 +358,11 @@ async def get_player_injuries(
     """
     try:
         service = NFLDataIngestionService(db)
+        cache_key = f"{season}:injuries:{gsis_id}:{week}"
+        cached = await service.get_cached_response(cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+        
         injury = await service.get_player_injuries(gsis_id, season, week)
         
         if not injury:
@@ -315,7 +371,7 @@ async def get_player_injuries(
                 detail=f"No injury data found for player {gsis_id} in season {season}, week {week}"
             )
         
-        return {
+        body = orjson.dumps({
             "gsis_id": injury.gsis_id,
             "season": injury.season,
             "week": injury.week,
@@ -326,24 +382,26 @@ async def get_player_injuries(
             "position": injury.position,
             "is_out": injury.is_out,
             "is_questionable": injury.is_questionable
-        }
+        }, option=JSON_OPTIONS)
+        await service.cache_response(cache_key, body, season)
+        return Response(content=body, media_type="application/json")
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to get injury data: {str(e)}"
+            detail=f"Failed to get injury data: {e}"
         )
 
 
-@router.get("/depth-chart/{team}/{season}/{week}")
+@router.get("/depth-chart/{team}/{season}/{week}", response_model=DepthChartResponse)
 async def get_team_depth_chart(
     team: str = Path(..., description="Team abbreviation"),
     season: int = Path(..., description="NFL season year", ge=2020, le=2030),
     week: int = Path(..., description="Week number", ge=1, le=22),
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> Response:
     """
     Get depth chart for a specific team.
     
@@ -353,10 +411,15 @@ async def get_team_depth_chart(
         week: Week number
         
     Returns:
-        Team's depth chart organized by position
+        Team's depth chart entries, one per position, ordered by position
     """
     try:
         service = NFLDataIngestionService(db)
+        cache_key = f"{season}:depth-chart-entries:{team}:{week}"
+        cached = await service.get_cached_response(cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+        
         depth_charts = await service.get_team_depth_chart(team, season, week)
         
         if not depth_charts:
@@ -365,29 +428,29 @@ async def get_team_depth_chart(
                 detail=f"No depth chart found for team {team} in season {season}, week {week}"
             )
         
-        # Organize by position
-        chart_by_position = {}
-        for chart in depth_charts:
-            if chart.position not in chart_by_position:
-                chart_by_position[chart.position] = []
-            chart_by_position[chart.position].append({
-                "gsis_id": chart.gsis_id,
-                "depth_order": chart.depth_order,
-                "role": chart.role,
-                "is_starter": chart.is_starter
-            })
-        
-        return {
+        # One flat list ordered by position; the primary key allows one entry per position
+        body = orjson.dumps({
             "team": team,
             "season": season,
             "week": week,
-            "depth_chart": chart_by_position
-        }
+            "entries": [
+                {
+                    "position": chart.position,
+                    "gsis_id": chart.gsis_id,
+                    "depth_order": chart.depth_order,
+                    "role": chart.role,
+                    "is_starter": chart.is_starter
+                }
+                for chart in depth_charts
+            ]
+        }, option=JSON_OPTIONS)
+        await service.cache_response(cache_key, body, season)
+        return Response(content=body, media_type="application/json")
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to get depth chart: {str(e)}"
+            detail=f"Failed to get depth chart: {e}"
         )
@@ -2,16 +2,30 @@
 Fantasy football projections API endpoints.
 """
 
+import asyncio
 from typing import Dict, Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Path, Query
-from sqlalchemy.ext.asyncio import AsyncSession
+import orjson
+from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.database import get_db
-from app.services.projection_engine import ProjectionEngine
-from app.schemas.nfl_data import ProjectionRequest, ProjectionResponse
+from app.core.cache import JSON_OPTIONS
+from app.core.database import get_db, get_session_maker
+from app.core.responses import ORJSONResponse
+from app.services.projection_engine import ProjectionEngine, ProjectionOutput
+from app.schemas.nfl_data import BatchProjectionPlayer, ProjectionRequest, ProjectionResponse
 
 router = APIRouter()
 
+# Players projected at once in a batch, each holding a pooled connection
+BATCH_MAX_CONCURRENCY = 16
+
+# Largest number of players accepted in one batch request
+BATCH_MAX_PLAYERS = 500
+
+# Rows fetched from the database per block when streaming league projections
+LEAGUE_PROJECTIONS_BATCH_SIZE = 200
+
 
 @router.post("/generate/{gsis_id}/{season}/{week}")
 async def generate_player_projection(
@@ -39,58 +53,22 @@ async def generate_player_projection(
         engine = ProjectionEngine(db)
         projection = await engine.generate_player_projection(gsis_id, season, week, position)
         
+        response = {
+            "success": True,
+            "gsis_id": gsis_id,
+            "season": season,
+            "week": week,
+            "position": position,
+            "projection": projection.stats(),
+            "confidence": projection.confidence,
+            "saved": save
+        }
+        
         if save:
-            saved_proj = await engine.save_projection(gsis_id, season, week, projection)
-            return {
-                "success": True,
-                "gsis_id": gsis_id,
-                "season": season,
-                "week": week,
-                "position": position,
-                "projection": {
-                    "passing_yards": projection.passing_yards,
-                    "passing_tds": projection.passing_tds,
-                    "passing_ints": projection.passing_ints,
-                    "rushing_yards": projection.rushing_yards,
-                    "rushing_tds": projection.rushing_tds,
-                    "receiving_yards": projection.receiving_yards,
-                    "receiving_tds": projection.receiving_tds,
-                    "receptions": projection.receptions,
-                    "fumbles_lost": projection.fumbles_lost,
-                    "field_goals": projection.field_goals,
-                    "field_goal_attempts": projection.field_goal_attempts,
-                    "extra_points": projection.extra_points,
-                    "extra_point_attempts": projection.extra_point_attempts,
-                },
-                "confidence": projection.confidence,
-                "saved": True,
-                "projection_id": saved_proj.gsis_id
-            }
-        else:
-            return {
-                "success": True,
-                "gsis_id": gsis_id,
-                "season": season,
-                "week": week,
-                "position": position,
-                "projection": {
-                    "passing_yards": projection.passing_yards,
-                    "passing_tds": projection.passing_tds,
-                    "passing_ints": projection.passing_ints,
-                    "rushing_yards": projection.rushing_yards,
-                    "rushing_tds": projection.rushing_tds,
-                    "receiving_yards": projection.receiving_yards,
-                    "receiving_tds": projection.receiving_tds,
-                    "receptions": projection.receptions,
-                    "fumbles_lost": projection.fumbles_lost,
-                    "field_goals": projection.field_goals,
-                    "field_goal_attempts": projection.field_goal_attempts,
-                    "extra_points": projection.extra_points,
-                    "extra_point_attempts": projection.extra_point_attempts,
-                },
-                "confidence": projection.confidence,
-                "saved": False
-            }
+            await engine.save_projection(gsis_id, season, week, projection)
+            response["projection_id"] = gsis_id
+        
+        return response
         
     except ValueError as e:
         raise HTTPException(
@@ -100,23 +78,23 @@ async def generate_player_projection(
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to generate projection: {str(e)}"
+            detail=f"Failed to generate projection: {e}"
         )
 
 
 @router.post("/generate/batch")
 async def generate_batch_projections(
-    players: List[Dict[str, Any]],
+    players: List[BatchProjectionPlayer] = Body(..., min_length=1, max_length=BATCH_MAX_PLAYERS),
     season: int = Query(..., description="NFL season year", ge=2020, le=2030),
     week: int = Query(..., description="Week number", ge=1, le=22),
     save: bool = Query(True, description="Whether to save projections to database"),
-    db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+    session_maker: async_sessionmaker = Depends(get_session_maker)
+) -> ORJSONResponse:
     """
     Generate projections for multiple players.
     
     Args:
-        players: List of player dictionaries with gsis_id and position
+        players: Players with gsis_id and position (1-500)
         season: NFL season year
         week: Week number
         save: Whether to save projections to database
@@ -124,89 +102,54 @@ async def generate_batch_projections(
     Returns:
         Batch projection results
     """
+    semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+    
+    async def project_player(player: BatchProjectionPlayer) -> ProjectionOutput:
+        # Each player gets its own session so projections run concurrently
+        async with semaphore, session_maker() as session:
+            return await ProjectionEngine(session).generate_player_projection(
+                player.gsis_id, season, week, player.position
+            )
+    
     try:
-        engine = ProjectionEngine(db)
-        results = []
-        successful = 0
-        failed = 0
+        outcomes = await asyncio.gather(
+            *(project_player(player) for player in players),
+            return_exceptions=True
+        )
         
-        for player in players:
-            try:
-                gsis_id = player.get("gsis_id")
-                position = player.get("position")
-                
-                if not gsis_id or not position:
-                    results.append({
-                        "gsis_id": gsis_id,
-                        "position": position,
-                        "success": False,
-                        "error": "Missing gsis_id or position"
-                    })
-                    failed += 1
-                    continue
-                
-                projection = await engine.generate_player_projection(gsis_id, season, week, position)
-                
-                if save:
-                    saved_proj = await engine.save_projection(gsis_id, season, week, projection)
-                    results.append({
-                        "gsis_id": gsis_id,
-                        "position": position,
-                        "success": True,
-                        "projection": {
-                            "passing_yards": projection.passing_yards,
-                            "passing_tds": projection.passing_tds,
-                            "passing_ints": projection.passing_ints,
-                            "rushing_yards": projection.rushing_yards,
-                            "rushing_tds": projection.rushing_tds,
-                            "receiving_yards": projection.receiving_yards,
-                            "receiving_tds": projection.receiving_tds,
-                            "receptions": projection.receptions,
-                            "fumbles_lost": projection.fumbles_lost,
-                            "field_goals": projection.field_goals,
-                            "field_goal_attempts": projection.field_goal_attempts,
-                            "extra_points": projection.extra_points,
-                            "extra_point_attempts": projection.extra_point_attempts,
-                        },
-                        "confidence": projection.confidence,
-                        "saved": True
-                    })
-                else:
-                    results.append({
-                        "gsis_id": gsis_id,
-                        "position": position,
-                        "success": True,
-                        "projection": {
-                            "passing_yards": projection.passing_yards,
-                            "passing_tds": projection.passing_tds,
-                            "passing_ints": projection.passing_ints,
-                            "rushing_yards": projection.rushing_yards,
-                            "rushing_tds": projection.rushing_tds,
-                            "receiving_yards": projection.receiving_yards,
-                            "receiving_tds": projection.receiving_tds,
-                            "receptions": projection.receptions,
-                            "fumbles_lost": projection.fumbles_lost,
-                            "field_goals": projection.field_goals,
-                            "field_goal_attempts": projection.field_goal_attempts,
-                            "extra_points": projection.extra_points,
-                            "extra_point_attempts": projection.extra_point_attempts,
-                        },
-                        "confidence": projection.confidence,
-                        "saved": False
-                    })
-                
-                successful += 1
-                
-            except Exception as e:
+        results = []
+        projections = []
+        for player, outcome in zip(players, outcomes):
+            if isinstance(outcome, BaseException):
                 results.append({
-                    "gsis_id": player.get("gsis_id"),
-                    "position": player.get("position"),
+                    "gsis_id": player.gsis_id,
+                    "position": player.position,
                     "success": False,
-                    "error": str(e)
+                    "error": str(outcome)
                 })
-                failed += 1
+                continue
+            
+            projections.append((player.gsis_id, outcome))
+            results.append({
+                "gsis_id": player.gsis_id,
+                "position": player.position,
+                "success": True,
+                "projection": outcome.stats(),
+                "confidence": outcome.confidence,
+                "saved": save
+            })
         
-        return {
+        successful = len(projections)
+        failed = len(results) - successful
+        
+        # Save all generated projections in one statement
+        if save:
+            async with session_maker() as session:
+                await ProjectionEngine(session).save_projections(season, week, projections)
+        
+        # Returning the response directly skips FastAPI's pure-Python
+        # jsonable_encoder pass over every result before orjson runs
+        return ORJSONResponse({
             "success": True,
             "season": season,
             "week": week,
@@ -214,23 +157,23 @@ async def generate_batch_projections(
             "successful": successful,
             "failed": failed,
             "results": results
-        }
+        })
         
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to generate batch projections: {str(e)}"
+            detail=f"Failed to generate batch projections: {e}"
         )
 
 
-@router.get("/player/{gsis_id}/{season}/{week}")
+@router.get("/player/{gsis_id}/{season}/{week}", response_model=ProjectionResponse)
 async def get_player_projection(
     gsis_id: str = Path(..., description="Player GSIS ID"),
     season: int = Path(..., description="NFL season year", ge=2020, le=2030),
     week: int = Path(..., description="Week number", ge=1, le=22),
     source: str = Query("internal", description="Projection source"),
     db: AsyncSession = Depends(get_db)
-) -> ProjectionResponse:
+) -> ORJSONResponse:
     """
     Get saved projection for a specific player.
     
@@ -245,20 +188,26 @@ async def get_player_projection(
     """
     try:
         from app.models.nfl_data import WeeklyProjections
-        from sqlalchemy import select, and_
+        from sqlalchemy import select, and_, lambda_stmt
         
+        # Built once and cached; only the bound parameters change per call.
+        # Plain columns skip building and tracking an ORM entity.
         result = await db.execute(
-            select(WeeklyProjections).where(
+            lambda_stmt(lambda: select(
+                WeeklyProjections.proj_json,
+                WeeklyProjections.confidence,
+                WeeklyProjections.created_at
+            ).where(
                 and_(
                     WeeklyProjections.gsis_id == gsis_id,
                     WeeklyProjections.season == season,
                     WeeklyProjections.week == week,
                     WeeklyProjections.source == source
                 )
-            )
+            ))
         )
         
-        projection = result.scalar_one_or_none()
+        projection = result.one_or_none()
         
         if not projection:
             raise HTTPException(
@@ -266,22 +215,24 @@ async def get_player_projection(
                 detail=f"No projection found for player {gsis_id} in season {season}, week {week}"
             )
         
-        return ProjectionResponse(
-            gsis_id=projection.gsis_id,
-            season=projection.season,
-            week=projection.week,
-            source=projection.source,
-            projections=projection.projections,
-            confidence=projection.confidence,
-            created_at=projection.created_at
-        )
+        # Serialized straight from the row: the stored projection JSON is
+        # embedded as is, with no decode or response model validation
+        return ORJSONResponse({
+            "gsis_id": gsis_id,
+            "season": season,
+            "week": week,
+            "source": source,
+            "projections": orjson.Fragment(projection.proj_json),
+            "confidence": projection.confidence,
+            "created_at": projection.created_at
+        })
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to get projection: {str(e)}"
+            detail=f"Failed to get projection: {e}"
         )
 
 
@@ -292,10 +243,13 @@ async def get_league_projections(
     week: int = Path(..., description="Week number", ge=1, le=22),
     source: str = Query("internal", description="Projection source"),
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> StreamingResponse:
     """
     Get projections for all players in a league.
     
+    Projections are streamed as they're read, so memory use doesn't grow
+    with the size of the league.
+    
     Args:
         league_key: League key
         season: NFL season year
@@ -306,68 +260,72 @@ async def get_league_projections(
         League projections data
     """
     try:
-        from app.models.fantasy import LeaguePlayer
+        from app.models.fantasy import LeaguePlayer, Player
         from app.models.nfl_data import WeeklyProjections, PlayerIDMapping
-        from sqlalchemy import select, and_, join
-        
-        # Get all players in the league
-        players_result = await db.execute(
-            select(LeaguePlayer).where(LeaguePlayer.league_key == league_key)
-        )
-        league_players = players_result.scalars().all()
+        from sqlalchemy import select, and_
         
-        # Get projections for these players
-        projections = []
-        for league_player in league_players:
-            # Get GSIS ID for this player
-            mapping_result = await db.execute(
-                select(PlayerIDMapping).where(
-                    PlayerIDMapping.gsis_id.in_(
-                        select(Player.gsis_id).where(Player.player_id_yahoo == league_player.player_id_yahoo)
-                    )
-                )
+        # Get mapped league players and their projections in one query
+        result = await db.stream(
+            select(
+                LeaguePlayer.player_id_yahoo,
+                PlayerIDMapping.gsis_id,
+                PlayerIDMapping.full_name,
+                PlayerIDMapping.position,
+                WeeklyProjections.proj_json,
+                WeeklyProjections.confidence,
+                WeeklyProjections.created_at
             )
-            mapping = mapping_result.scalar_one_or_none()
-            
-            if mapping:
-                # Get projection for this player
-                proj_result = await db.execute(
-                    select(WeeklyProjections).where(
-                        and_(
-                            WeeklyProjections.gsis_id == mapping.gsis_id,
-                            WeeklyProjections.season == season,
-                            WeeklyProjections.week == week,
-                            WeeklyProjections.source == source
-                        )
-                    )
+            .select_from(LeaguePlayer)
+            .join(Player, Player.player_id_yahoo == LeaguePlayer.player_id_yahoo)
+            .join(PlayerIDMapping, PlayerIDMapping.gsis_id == Player.gsis_id)
+            .join(
+                WeeklyProjections,
+                and_(
+                    WeeklyProjections.gsis_id == PlayerIDMapping.gsis_id,
+                    WeeklyProjections.season == season,
+                    WeeklyProjections.week == week,
+                    WeeklyProjections.source == source
                 )
-                projection = proj_result.scalar_one_or_none()
-                
-                if projection:
-                    projections.append({
-                        "player_id_yahoo": league_player.player_id_yahoo,
-                        "gsis_id": mapping.gsis_id,
-                        "player_name": mapping.full_name,
-                        "position": mapping.position,
-                        "projection": projection.projections,
-                        "confidence": projection.confidence,
-                        "created_at": projection.created_at
-                    })
-        
-        return {
-            "league_key": league_key,
-            "season": season,
-            "week": week,
-            "source": source,
-            "total_projections": len(projections),
-            "projections": projections
-        }
+            )
+            .where(LeaguePlayer.league_key == league_key)
+            .execution_options(yield_per=LEAGUE_PROJECTIONS_BATCH_SIZE)
+        )
         
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to get league projections: {str(e)}"
+            detail=f"Failed to get league projections: {e}"
         )
+    
+    async def body():
+        # The total is only known once every row is sent, so it goes last
+        header = orjson.dumps({"league_key": league_key, "season": season, "week": week, "source": source}, option=JSON_OPTIONS)
+        yield header[:-1] + b',"projections":['
+        
+        total = 0
+        try:
+            async for rows in result.partitions():
+                # Stored projections are already JSON, so they're embedded as-is
+                chunk = b",".join(
+                    orjson.dumps({
+                        "player_id_yahoo": player_id_yahoo,
+                        "gsis_id": gsis_id,
+                        "player_name": full_name,
+                        "position": position,
+                        "projection": orjson.Fragment(proj_json),
+                        "confidence": confidence,
+                        "created_at": created_at
+                    }, option=JSON_OPTIONS)
+                    for player_id_yahoo, gsis_id, full_name, position, proj_json, confidence, created_at in rows
+                )
+                yield chunk if total == 0 else b"," + chunk
+                total += len(rows)
+        finally:
+            await result.close()
+        
+        yield b'],"total_projections":' + str(total).encode() + b"}"
+    
+    return StreamingResponse(body(), media_type="application/json")
 
 
 @router.delete("/player/{gsis_id}/{season}/{week}")
@@ -392,40 +350,26 @@ async def delete_player_projection(
     """
     try:
         from app.models.nfl_data import WeeklyProjections
-        from sqlalchemy import select, and_, delete
+        from sqlalchemy import and_, delete, lambda_stmt
         
-        # Check if projection exists
+        # Delete the projection, learning whether it existed from RETURNING
         result = await db.execute(
-            select(WeeklyProjections).where(
+            lambda_stmt(lambda: delete(WeeklyProjections).where(
                 and_(
                     WeeklyProjections.gsis_id == gsis_id,
                     WeeklyProjections.season == season,
                     WeeklyProjections.week == week,
                     WeeklyProjections.source == source
                 )
-            )
+            ).returning(WeeklyProjections.gsis_id))
         )
         
-        projection = result.scalar_one_or_none()
-        
-        if not projection:
+        if result.scalar_one_or_none() is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"No projection found for player {gsis_id} in season {season}, week {week}"
             )
         
-        # Delete the projection
-        await db.execute(
-            delete(WeeklyProjections).where(
-                and_(
-                    WeeklyProjections.gsis_id == gsis_id,
-                    WeeklyProjections.season == season,
-                    WeeklyProjections.week == week,
-                    WeeklyProjections.source == source
-                )
-            )
-        )
-        
         await db.commit()
         
         return {
@@ -439,5 +383,5 @@ async def delete_player_projection(
         await db.rollback()
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to delete projection: {str(e)}"
+            detail=f"Failed to delete projection: {e}"
         )
@@ -7,20 +7,21 @@ from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.responses import ORJSONResponse
 from app.services.scoring_engine import FantasyPointsCalculator, ScoringEngine
-from app.schemas.nfl_data import FantasyPointsResponse, ScoringSystem
+from app.schemas.nfl_data import FantasyPointsResponse
 
 router = APIRouter()
 
 
-@router.get("/points/player/{gsis_id}/{season}/{week}")
+@router.get("/points/player/{gsis_id}/{season}/{week}", response_model=FantasyPointsResponse)
 async def calculate_player_fantasy_points(
     gsis_id: str = Path(..., description="Player GSIS ID"),
     season: int = Path(..., description="NFL season year", ge=2020, le=2030),
     week: int = Path(..., description="Week number", ge=1, le=22),
     league_key: str = Query(..., description="League key for scoring rules"),
     db: AsyncSession = Depends(get_db)
-) -> FantasyPointsResponse:
+) -> ORJSONResponse:
     """
     Calculate fantasy points for a specific player.
     
@@ -37,14 +38,17 @@ async def calculate_player_fantasy_points(
         calculator = FantasyPointsCalculator(db)
         result = await calculator.calculate_player_points(gsis_id, season, week, league_key)
         
-        return FantasyPointsResponse(
-            gsis_id=result["gsis_id"],
-            season=result["season"],
-            week=result["week"],
-            fantasy_points=result["fantasy_points"],
-            scoring_breakdown=result["scoring_breakdown"],
-            scoring_system=ScoringSystem(**result["scoring_system"])
-        )
+        # The calculator's output is already well-formed, so it's returned
+        # directly rather than validated into a FantasyPointsResponse and
+        # then validated again by FastAPI against the response model
+        return ORJSONResponse({
+            "gsis_id": result["gsis_id"],
+            "season": result["season"],
+            "week": result["week"],
+            "fantasy_points": result["fantasy_points"],
+            "scoring_breakdown": result["scoring_breakdown"],
+            "scoring_system": result["scoring_system"]
+        })
         
     except ValueError as e:
         raise HTTPException(
@@ -54,7 +58,7 @@ async def calculate_player_fantasy_points(
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to calculate fantasy points: {str(e)}"
+            detail=f"Failed to calculate fantasy points: {e}"
         )
 
 
@@ -65,7 +69,7 @@ async def calculate_team_fantasy_points(
     week: int = Path(..., description="Week number", ge=1, le=22),
     league_key: str = Query(..., description="League key for scoring rules"),
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """
     Calculate total fantasy points for a team's lineup.
     
@@ -82,7 +86,7 @@ async def calculate_team_fantasy_points(
         calculator = FantasyPointsCalculator(db)
         result = await calculator.calculate_team_points(team_key, season, week, league_key)
         
-        return result
+        return ORJSONResponse(result)
         
     except ValueError as e:
         raise HTTPException(
@@ -92,7 +96,7 @@ async def calculate_team_fantasy_points(
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to calculate team fantasy points: {str(e)}"
+            detail=f"Failed to calculate team fantasy points: {e}"
         )
 
 
@@ -100,7 +104,7 @@ async def calculate_team_fantasy_points(
 async def parse_yahoo_scoring_rules(
     scoring_json: str,
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """
     Parse Yahoo scoring rules and return the scoring system.
     
@@ -112,13 +116,12 @@ async def parse_yahoo_scoring_rules(
     """
     try:
         scoring_engine = ScoringEngine.from_yahoo_scoring(scoring_json)
-        scoring_system = scoring_engine.get_scoring_system()
         
-        return {
+        return ORJSONResponse({
             "success": True,
-            "scoring_system": scoring_system.dict(),
+            "scoring_system": scoring_engine.get_scoring_system_dict(),
             "rules_count": len(scoring_engine.scoring_rules)
-        }
+        })
         
     except ValueError as e:
         raise HTTPException(
@@ -128,7 +131,7 @@ async def parse_yahoo_scoring_rules(
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to parse scoring rules: {str(e)}"
+            detail=f"Failed to parse scoring rules: {e}"
         )
 
 
@@ -136,7 +139,7 @@ async def parse_yahoo_scoring_rules(
 async def get_league_scoring_system(
     league_key: str = Path(..., description="League key"),
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """
     Get the scoring system for a specific league.
     
@@ -147,44 +150,27 @@ async def get_league_scoring_system(
         League's scoring system
     """
     try:
-        from app.models.fantasy import League
-        from sqlalchemy import select
-        
-        # Get league scoring rules
-        league_result = await db.execute(
-            select(League).where(League.league_key == league_key)
-        )
-        league = league_result.scalar_one_or_none()
-        
-        if not league:
-            raise HTTPException(
-                status_code=404,
-                detail=f"League {league_key} not found"
-            )
-        
-        if not league.scoring_json:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No scoring rules found for league {league_key}"
-            )
-        
-        # Parse scoring rules
-        scoring_engine = ScoringEngine.from_yahoo_scoring(league.scoring_json)
-        scoring_system = scoring_engine.get_scoring_system()
+        calculator = FantasyPointsCalculator(db)
+        league_name, scoring_engine = await calculator.get_league_scoring(league_key)
         
-        return {
+        # Built from the cached engine's cached dict, so nothing is
+        # revalidated or re-encoded before orjson runs
+        return ORJSONResponse({
             "league_key": league_key,
-            "league_name": league.name,
-            "scoring_system": scoring_system.dict(),
+            "league_name": league_name,
+            "scoring_system": scoring_engine.get_scoring_system_dict(),
             "rules_count": len(scoring_engine.scoring_rules)
-        }
+        })
         
-    except HTTPException:
-        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=404,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to get scoring system: {str(e)}"
+            detail=f"Failed to get scoring system: {e}"
         )
 
 
@@ -212,7 +198,7 @@ async def test_fantasy_calculation(
             "success": True,
             "total_fantasy_points": total_points,
             "scoring_breakdown": breakdown,
-            "scoring_system": scoring_engine.get_scoring_system().dict()
+            "scoring_system": scoring_engine.get_scoring_system_dict()
         }
         
     except ValueError as e:
@@ -223,5 +209,5 @@ async def test_fantasy_calculation(
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to calculate fantasy points: {str(e)}"
+            detail=f"Failed to calculate fantasy points: {e}"
         )
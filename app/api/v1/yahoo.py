@@ -3,33 +3,149 @@ Yahoo Fantasy API sync endpoints for leagues, teams, and rosters.
 """
 
 import json
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.core.database import get_db
-from app.services.yahoo_api import YahooAPIService
-from app.services.yahoo_oauth import YahooOAuthService
+from app.core.responses import ORJSONResponse
+from app.services.yahoo_api import YahooAPIService, get_api_service, parse_team_standings
+from app.services.yahoo_oauth import YahooOAuthService, get_oauth_service
 from app.models.fantasy import League, Team, Player, LeaguePlayer, Roster, DraftPick
 from app.schemas.yahoo import (
     UserLeaguesResponse,
-    LeagueInfo,
     LeagueSyncRequest,
     LeagueSyncResponse,
     TeamRoster,
     RosterSlot,
-    SyncError
+    SyncError,
+    TeamInfoList
 )
 
 router = APIRouter(prefix="/yahoo", tags=["yahoo"])
 
+# Draft picks read from the database per round trip when streaming
+DRAFT_STREAM_BATCH_SIZE = 100
+
+
+def _team_summary(team: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a Yahoo team into the fields the teams endpoint returns."""
+    rank, wins, losses, ties = parse_team_standings(team)
+    managers = team.get("managers")
+    return {
+        "team_key": team.get("team_key"),
+        "name": team.get("name"),
+        "manager": managers[0].get("nickname") if managers else None,
+        "division_id": team.get("division_id"),
+        "rank": rank,
+        "wins": wins,
+        "losses": losses,
+        "ties": ties
+    }
+
+
+# Mock data is identical for every request on a league, so it's built once
+# per league key. Callers must treat the returned dicts as read-only.
+@lru_cache(maxsize=128)
+def _mock_teams(league_key: str) -> Tuple[Dict[str, Any], ...]:
+    """Generate 12 mock teams for a 12-team league."""
+    return tuple(
+        {
+            "team_key": f"{league_key}.t.{i}",
+            "name": f"Team {i}",
+            "manager": f"Manager {i}",
+            "division_id": 1 if i <= 6 else 2,
+            "rank": i,
+            "wins": max(0, 12 - i),
+            "losses": max(0, i - 1),
+            "ties": 0
+        }
+        for i in range(1, 13)
+    )
+
+
+@lru_cache(maxsize=128)
+def _mock_players(league_key: str) -> Tuple[Dict[str, Any], ...]:
+    """Generate mock league players."""
+    return (
+        {
+            "player_id_yahoo": "12345",
+            "full_name": "Patrick Mahomes",
+            "position": "QB",
+            "team": "KC",
+            "status": "ROSTERED",
+            "percent_rostered": 100,
+            "owner_team_key": f"{league_key}.t.1"
+        },
+        {
+            "player_id_yahoo": "67890",
+            "full_name": "Christian McCaffrey",
+            "position": "RB",
+            "team": "SF",
+            "status": "ROSTERED",
+            "percent_rostered": 100,
+            "owner_team_key": f"{league_key}.t.2"
+        },
+        {
+            "player_id_yahoo": "11111",
+            "full_name": "Tyreek Hill",
+            "position": "WR",
+            "team": "MIA",
+            "status": "FA",
+            "percent_rostered": 85,
+            "faab_cost_est": 15,
+            "owner_team_key": None
+        }
+    )
+
+
+@lru_cache(maxsize=128)
+def _mock_draft(league_key: str) -> Tuple[Dict[str, Any], ...]:
+    """Generate mock draft results."""
+    return (
+        {
+            "round": 1,
+            "pick": 1,
+            "team_key": f"{league_key}.t.1",
+            "player_id_yahoo": "12345",
+            "player_name": "Patrick Mahomes",
+            "cost": None
+        },
+        {
+            "round": 1,
+            "pick": 2,
+            "team_key": f"{league_key}.t.2",
+            "player_id_yahoo": "67890",
+            "player_name": "Christian McCaffrey",
+            "cost": None
+        }
+    )
+
+
+# Slots are frozen, so the mock roster is built once and shared
+_MOCK_ROSTER_SLOTS = (
+    RosterSlot(slot="QB", player_id_yahoo="12345", is_starting=True),
+    RosterSlot(slot="RB", player_id_yahoo="67890", is_starting=True),
+    RosterSlot(slot="RB", player_id_yahoo="11111", is_starting=True),
+    RosterSlot(slot="WR", player_id_yahoo="22222", is_starting=True),
+    RosterSlot(slot="WR", player_id_yahoo="33333", is_starting=True),
+    RosterSlot(slot="TE", player_id_yahoo="44444", is_starting=True),
+    RosterSlot(slot="FLEX", player_id_yahoo="55555", is_starting=True),
+    RosterSlot(slot="BN", player_id_yahoo="66666", is_starting=False),
+    RosterSlot(slot="BN", player_id_yahoo="77777", is_starting=False),
+    RosterSlot(slot="BN", player_id_yahoo="88888", is_starting=False),
+)
+
 
 @router.get("/leagues", response_model=UserLeaguesResponse)
 async def get_user_leagues(
     db: AsyncSession = Depends(get_db),
-    oauth_service: YahooOAuthService = Depends(lambda: YahooOAuthService()),
-    api_service: YahooAPIService = Depends(lambda: YahooAPIService(YahooOAuthService()))
-) -> UserLeaguesResponse:
+    oauth_service: YahooOAuthService = Depends(get_oauth_service),
+    api_service: YahooAPIService = Depends(get_api_service)
+) -> ORJSONResponse:
     """
     Get all leagues for the authenticated user.
     
@@ -40,25 +156,26 @@ async def get_user_leagues(
         # TODO: Get access token from authenticated user
         # For now, return mock data
         mock_leagues = [
-            LeagueInfo(
-                league_key="414.l.123456",
-                name="My Fantasy League",
-                season=2024,
-                league_type="private",
-                num_teams=12,
-                is_finished=False
-            )
+            {
+                "league_key": "414.l.123456",
+                "name": "My Fantasy League",
+                "season": 2024,
+                "league_type": "private",
+                "num_teams": 12,
+                "is_finished": False
+            }
         ]
         
-        return UserLeaguesResponse(
-            leagues=mock_leagues,
-            total_count=len(mock_leagues)
-        )
+        # Built server-side, so it's returned without response model validation
+        return ORJSONResponse({
+            "leagues": mock_leagues,
+            "total_count": len(mock_leagues)
+        })
         
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to retrieve user leagues: {str(e)}"
+            detail=f"Failed to retrieve user leagues: {e}"
         )
 
 
@@ -67,9 +184,9 @@ async def sync_league_data(
     league_key: str = Path(..., description="Yahoo league key to sync"),
     request: Optional[LeagueSyncRequest] = None,
     db: AsyncSession = Depends(get_db),
-    oauth_service: YahooOAuthService = Depends(lambda: YahooOAuthService()),
-    api_service: YahooAPIService = Depends(lambda: YahooAPIService(YahooOAuthService()))
-) -> LeagueSyncResponse:
+    oauth_service: YahooOAuthService = Depends(get_oauth_service),
+    api_service: YahooAPIService = Depends(get_api_service)
+) -> ORJSONResponse:
     """
     Sync league data from Yahoo Fantasy API.
     
@@ -89,19 +206,19 @@ async def sync_league_data(
         players_synced = 180
         draft_picks_synced = 144
         
-        return LeagueSyncResponse(
-            success=True,
-            league_key=league_key,
-            message="League synced successfully",
-            teams_synced=teams_synced,
-            players_synced=players_synced,
-            draft_picks_synced=draft_picks_synced
-        )
+        return ORJSONResponse({
+            "success": True,
+            "league_key": league_key,
+            "message": "League synced successfully",
+            "teams_synced": teams_synced,
+            "players_synced": players_synced,
+            "draft_picks_synced": draft_picks_synced
+        })
         
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to sync league data: {str(e)}"
+            detail=f"Failed to sync league data: {e}"
         )
 
 
@@ -110,9 +227,9 @@ async def get_team_roster(
     team_key: str = Path(..., description="Yahoo team key"),
     week: int = Query(None, description="Week number (optional, defaults to current week)"),
     db: AsyncSession = Depends(get_db),
-    oauth_service: YahooOAuthService = Depends(lambda: YahooOAuthService()),
-    api_service: YahooAPIService = Depends(lambda: YahooAPIService(YahooOAuthService()))
-) -> TeamRoster:
+    oauth_service: YahooOAuthService = Depends(get_oauth_service),
+    api_service: YahooAPIService = Depends(get_api_service)
+) -> ORJSONResponse:
     """
     Get team roster for a specific week.
     
@@ -123,30 +240,17 @@ async def get_team_roster(
         # TODO: Get access token from authenticated user
         # For now, return mock data
         
-        # Mock roster data
-        mock_slots = [
-            RosterSlot(slot="QB", player_id_yahoo="12345", is_starting=True),
-            RosterSlot(slot="RB", player_id_yahoo="67890", is_starting=True),
-            RosterSlot(slot="RB", player_id_yahoo="11111", is_starting=True),
-            RosterSlot(slot="WR", player_id_yahoo="22222", is_starting=True),
-            RosterSlot(slot="WR", player_id_yahoo="33333", is_starting=True),
-            RosterSlot(slot="TE", player_id_yahoo="44444", is_starting=True),
-            RosterSlot(slot="FLEX", player_id_yahoo="55555", is_starting=True),
-            RosterSlot(slot="BN", player_id_yahoo="66666", is_starting=False),
-            RosterSlot(slot="BN", player_id_yahoo="77777", is_starting=False),
-            RosterSlot(slot="BN", player_id_yahoo="88888", is_starting=False),
-        ]
-        
-        return TeamRoster(
-            team_key=team_key,
-            week=week or 1,
-            slots=mock_slots
-        )
+        # orjson serializes the slot dataclasses natively
+        return ORJSONResponse({
+            "team_key": team_key,
+            "week": week or 1,
+            "slots": _MOCK_ROSTER_SLOTS
+        })
         
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to retrieve team roster: {str(e)}"
+            detail=f"Failed to retrieve team roster: {e}"
         )
 
 
@@ -154,9 +258,9 @@ async def get_team_roster(
 async def get_league_teams(
     league_key: str = Path(..., description="Yahoo league key"),
     db: AsyncSession = Depends(get_db),
-    oauth_service: YahooOAuthService = Depends(lambda: YahooOAuthService()),
-    api_service: YahooAPIService = Depends(lambda: YahooAPIService(YahooOAuthService()))
-) -> Dict[str, Any]:
+    oauth_service: YahooOAuthService = Depends(get_oauth_service),
+    api_service: YahooAPIService = Depends(get_api_service)
+) -> ORJSONResponse:
     """
     Get all teams in a league.
     
@@ -176,54 +280,35 @@ async def get_league_teams(
             client = await api_service.get_client(access_token)
             yahoo_teams = await client.get_league_teams(league_key)
             
-            # Transform Yahoo API response to our format
-            teams = []
-            for team in yahoo_teams:
-                teams.append({
-                    "team_key": team.get("team_key"),
-                    "name": team.get("name"),
-                    "manager": team.get("managers", [{}])[0].get("nickname") if team.get("managers") else None,
-                    "division_id": team.get("division_id"),
-                    "rank": team.get("team_standings", {}).get("rank"),
-                    "wins": team.get("team_standings", {}).get("outcome_totals", {}).get("wins", 0),
-                    "losses": team.get("team_standings", {}).get("outcome_totals", {}).get("losses", 0),
-                    "ties": team.get("team_standings", {}).get("outcome_totals", {}).get("ties", 0)
-                })
+            # Transform Yahoo API response to our format. pydantic-core
+            # validates the list, coercing Yahoo's numeric strings, and
+            # serializes it straight to JSON
+            teams = TeamInfoList.validate_python([_team_summary(team) for team in yahoo_teams])
             
-            return {
+            # Returning the response directly skips FastAPI's pure-Python
+            # jsonable_encoder pass over every team before orjson runs
+            return ORJSONResponse({
                 "league_key": league_key,
-                "teams": teams,
+                "teams": orjson.Fragment(TeamInfoList.dump_json(teams)),
                 "total_count": len(teams)
-            }
+            })
             
         except Exception as api_error:
             # If Yahoo API fails, fall back to mock data for development
             print(f"Yahoo API error: {api_error}")
             
-            # Generate 12 mock teams for a 12-team league
-            mock_teams = []
-            for i in range(1, 13):
-                mock_teams.append({
-                    "team_key": f"{league_key}.t.{i}",
-                    "name": f"Team {i}",
-                    "manager": f"Manager {i}",
-                    "division_id": 1 if i <= 6 else 2,
-                    "rank": i,
-                    "wins": max(0, 12 - i),
-                    "losses": max(0, i - 1),
-                    "ties": 0
-                })
+            mock_teams = _mock_teams(league_key)
             
-            return {
+            return ORJSONResponse({
                 "league_key": league_key,
                 "teams": mock_teams,
                 "total_count": len(mock_teams)
-            }
+            })
         
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to retrieve league teams: {str(e)}"
+            detail=f"Failed to retrieve league teams: {e}"
         )
 
 
@@ -231,9 +316,9 @@ async def get_league_teams(
 async def get_league_players(
     league_key: str = Path(..., description="Yahoo league key"),
     db: AsyncSession = Depends(get_db),
-    oauth_service: YahooOAuthService = Depends(lambda: YahooOAuthService()),
-    api_service: YahooAPIService = Depends(lambda: YahooAPIService(YahooOAuthService()))
-) -> Dict[str, Any]:
+    oauth_service: YahooOAuthService = Depends(get_oauth_service),
+    api_service: YahooAPIService = Depends(get_api_service)
+) -> ORJSONResponse:
     """
     Get all players in a league.
     
@@ -244,47 +329,18 @@ async def get_league_players(
         # TODO: Get access token from authenticated user
         # For now, return mock data
         
-        mock_players = [
-            {
-                "player_id_yahoo": "12345",
-                "full_name": "Patrick Mahomes",
-                "position": "QB",
-                "team": "KC",
-                "status": "ROSTERED",
-                "percent_rostered": 100,
-                "owner_team_key": f"{league_key}.t.1"
-            },
-            {
-                "player_id_yahoo": "67890",
-                "full_name": "Christian McCaffrey",
-                "position": "RB",
-                "team": "SF",
-                "status": "ROSTERED",
-                "percent_rostered": 100,
-                "owner_team_key": f"{league_key}.t.2"
-            },
-            {
-                "player_id_yahoo": "11111",
-                "full_name": "Tyreek Hill",
-                "position": "WR",
-                "team": "MIA",
-                "status": "FA",
-                "percent_rostered": 85,
-                "faab_cost_est": 15,
-                "owner_team_key": None
-            }
-        ]
+        mock_players = _mock_players(league_key)
         
-        return {
+        return ORJSONResponse({
             "league_key": league_key,
             "players": mock_players,
             "total_count": len(mock_players)
-        }
+        })
         
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to retrieve league players: {str(e)}"
+            detail=f"Failed to retrieve league players: {e}"
         )
 
 
@@ -292,9 +348,9 @@ async def get_league_players(
 async def get_league_draft(
     league_key: str = Path(..., description="Yahoo league key"),
     db: AsyncSession = Depends(get_db),
-    oauth_service: YahooOAuthService = Depends(lambda: YahooOAuthService()),
-    api_service: YahooAPIService = Depends(lambda: YahooAPIService(YahooOAuthService()))
-) -> Dict[str, Any]:
+    oauth_service: YahooOAuthService = Depends(get_oauth_service),
+    api_service: YahooAPIService = Depends(get_api_service)
+) -> ORJSONResponse:
     """
     Get draft results for a league.
     
@@ -305,33 +361,69 @@ async def get_league_draft(
         # TODO: Get access token from authenticated user
         # For now, return mock data
         
-        mock_draft = [
-            {
-                "round": 1,
-                "pick": 1,
-                "team_key": f"{league_key}.t.1",
-                "player_id_yahoo": "12345",
-                "player_name": "Patrick Mahomes",
-                "cost": None
-            },
-            {
-                "round": 1,
-                "pick": 2,
-                "team_key": f"{league_key}.t.2",
-                "player_id_yahoo": "67890",
-                "player_name": "Christian McCaffrey",
-                "cost": None
-            }
-        ]
+        mock_draft = _mock_draft(league_key)
         
-        return {
+        return ORJSONResponse({
             "league_key": league_key,
             "draft_picks": mock_draft,
             "total_picks": len(mock_draft)
-        }
+        })
         
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to retrieve draft results: {str(e)}"
+            detail=f"Failed to retrieve draft results: {e}"
         )
+
+
+@router.get("/league/{league_key}/draft/stream")
+async def stream_league_draft(
+    league_key: str = Path(..., description="Yahoo league key"),
+    db: AsyncSession = Depends(get_db)
+) -> StreamingResponse:
+    """
+    Stream a league's synced draft picks as newline-delimited JSON.
+    
+    Picks are sent one per line in draft order as they're read, so clients
+    can render the first picks before the whole draft has loaded.
+    """
+    try:
+        result = await db.stream(
+            select(
+                DraftPick.round,
+                DraftPick.pick,
+                DraftPick.team_key,
+                DraftPick.player_id_yahoo,
+                Player.full_name,
+                DraftPick.cost
+            )
+            .outerjoin(Player, Player.player_id_yahoo == DraftPick.player_id_yahoo)
+            .where(DraftPick.league_key == league_key)
+            .order_by(DraftPick.round, DraftPick.pick)
+            .execution_options(yield_per=DRAFT_STREAM_BATCH_SIZE)
+        )
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to stream draft results: {e}"
+        )
+    
+    async def body():
+        try:
+            async for rows in result.partitions():
+                yield b"".join(
+                    orjson.dumps({
+                        "round": round_,
+                        "pick": pick,
+                        "team_key": team_key,
+                        "player_id_yahoo": player_id_yahoo,
+                        "player_name": player_name,
+                        "cost": cost
+                    }) + b"\n"
+                    for round_, pick, team_key, player_id_yahoo, player_name, cost in rows
+                )
+        finally:
+            await result.close()
+    
+    return StreamingResponse(body(), media_type="application/x-ndjson")
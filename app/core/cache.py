@@ -0,0 +1,83 @@
+"""
+In-process caching helpers.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+import orjson
+from fastapi import Request, Response
+
+# Options for all JSON the API sends, including app.core.responses.ORJSONResponse,
+# so bodies serialized ahead of time match what a route returning the content
+# directly would send. Naive datetimes come from UTC columns on SQLite.
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+
+
+class TTLCache:
+    """
+    Size-bounded LRU cache whose entries expire after a fixed TTL.
+
+    Lookups and inserts are O(1). Once full, the least recently used entry
+    is evicted to make room for a new one.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value if present and unexpired, marking it recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        if entry[1] <= time.monotonic():
+            del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a key and return its value if it was present."""
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class PrecomputedJSON:
+    """
+    JSON body serialized once, served with an ETag and Cache-Control.
+
+    Clients that send a matching If-None-Match get an empty 304 instead
+    of the body.
+    """
+
+    def __init__(self, content: Any, cache_control: str):
+        self.body = orjson.dumps(content, option=JSON_OPTIONS)
+        self.etag = f'"{hashlib.md5(self.body).hexdigest()}"'
+        self.headers = {"ETag": self.etag, "Cache-Control": cache_control}
+
+    def response(self, request: Request) -> Response:
+        """Build the response for a request, honouring If-None-Match."""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if self.etag in tags or "*" in tags:
+                return Response(status_code=304, headers=self.headers)
+        return Response(content=self.body, media_type="application/json", headers=self.headers)
@@ -2,9 +2,9 @@
 Configuration settings for DraftIQ application.
 """
 
-from typing import Optional
+from typing import List, Optional
 from pydantic import Field, field_validator
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -20,6 +20,26 @@ class Settings(BaseSettings):
         default="sqlite+aiosqlite:///./draftiq.db",
         description="Database connection URL"
     )
+    database_pool_size: int = Field(
+        default=20,
+        description="Connections kept open in the database pool"
+    )
+    database_max_overflow: int = Field(
+        default=40,
+        description="Extra connections the database pool may open under load"
+    )
+    database_pool_timeout_seconds: float = Field(
+        default=30.0,
+        description="How long a request waits for a pooled connection before failing"
+    )
+    database_pool_recycle_seconds: int = Field(
+        default=900,
+        description="Age in seconds after which pooled connections are replaced"
+    )
+    database_heartbeat_seconds: float = Field(
+        default=30.0,
+        description="Interval in seconds between background checks for dropped database connections"
+    )
     
     # Yahoo Fantasy API
     yahoo_client_id: str = Field(default="dev_client_id", description="Yahoo OAuth client ID")
@@ -37,14 +57,91 @@ class Settings(BaseSettings):
         description="Access token expiration time in minutes"
     )
     
+    yahoo_api_max_concurrency: int = Field(
+        default=8,
+        description="Maximum concurrent Yahoo API requests during a league sync"
+    )
+    yahoo_api_rate_limit: float = Field(
+        default=10.0,
+        description="Maximum Yahoo API requests per second per worker"
+    )
+    
     # API
     api_v1_prefix: str = Field(default="/api/v1", description="API v1 prefix")
+    enable_docs: bool = Field(
+        default=True,
+        description="Serve the OpenAPI schema and interactive docs"
+    )
+    cors_origins: List[str] = Field(
+        default=["http://localhost:5173"],
+        description="Browser origins allowed to call the API; empty disables CORS"
+    )
+    cors_max_age_seconds: int = Field(
+        default=86400,
+        description="How long browsers may cache CORS preflight responses in seconds"
+    )
     
     # Caching
     redis_url: Optional[str] = Field(
         default=None,
         description="Redis URL for caching (optional)"
     )
+    league_cache_ttl_seconds: int = Field(
+        default=86400,
+        description="How long league summaries stay cached in Redis in seconds"
+    )
+    player_mapping_cache_ttl_seconds: int = Field(
+        default=3600,
+        description="How long Yahoo/GSIS ID mappings stay cached in seconds"
+    )
+    player_mapping_cache_size: int = Field(
+        default=50000,
+        description="Maximum number of ID mappings cached per worker"
+    )
+    scoring_cache_ttl_seconds: int = Field(
+        default=300,
+        description="How long parsed league scoring rules stay cached per worker in seconds"
+    )
+    scoring_cache_size: int = Field(
+        default=256,
+        description="Maximum number of leagues' parsed scoring rules cached per worker"
+    )
+    league_not_found_cache_ttl_seconds: int = Field(
+        default=60,
+        description="How long unknown league keys are remembered per worker in seconds"
+    )
+    league_not_found_cache_size: int = Field(
+        default=1024,
+        description="Maximum number of unknown league keys remembered per worker"
+    )
+    nfl_data_cache_ttl_seconds: int = Field(
+        default=30 * 86400,
+        description="How long NFL stats, injuries and depth charts from past seasons stay cached in seconds"
+    )
+    nfl_live_data_cache_ttl_seconds: int = Field(
+        default=60,
+        description="How long NFL data from the current season stays cached in seconds"
+    )
+
+    # OAuth
+    oauth_state_ttl_seconds: int = Field(
+        default=600,
+        description="How long a pending OAuth state remains valid in seconds"
+    )
+    oauth_rate_limit_capacity: int = Field(
+        default=5,
+        description="Burst size of the per-IP rate limit on OAuth endpoints"
+    )
+    oauth_rate_limit_refill_rate: float = Field(
+        default=1.0,
+        description="Requests per second allowed on OAuth endpoints after a burst"
+    )
+
+    # CSV import
+    csv_upload_max_bytes: int = Field(
+        default=50 * 1024 * 1024,
+        description="Largest CSV upload accepted in bytes"
+    )
     
     # Logging
     log_level: str = Field(default="INFO", description="Logging level")
@@ -56,10 +153,11 @@ class Settings(BaseSettings):
             raise ValueError('access_token_expire_minutes must be positive')
         return v
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
-        extra = "ignore"  # Ignore extra environment variables
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=False,
+        extra="ignore",  # Ignore extra environment variables
+    )
 
 
 # Global settings instance
@@ -2,7 +2,10 @@
 Database configuration and session management.
 """
 
-from typing import AsyncGenerator
+import asyncio
+from typing import Any, AsyncGenerator
+from sqlalchemy import inspect, text
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from app.core.config import settings
@@ -15,12 +18,26 @@ class Base(DeclarativeBase):
     pass
 
 
-# Create async engine
+# SQLite is a local file: its connections are never dropped by a server
+is_sqlite = settings.database_url.startswith("sqlite")
+
+# Pool sizing and recycling only apply to server databases; SQLite serializes writes anyway
+pool_options = {}
+if not is_sqlite:
+    pool_options = {
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_timeout": settings.database_pool_timeout_seconds,
+        "pool_recycle": settings.database_pool_recycle_seconds,
+    }
+
+# Create async engine. Connections aren't pinged on every checkout;
+# for server databases keep_pool_alive() finds dropped ones in the background instead.
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
-    pool_pre_ping=True,
-    pool_recycle=300,
+    pool_pre_ping=False,
+    **pool_options,
 )
 
 # Create async session factory
@@ -48,10 +65,71 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+def get_session_maker() -> async_sessionmaker:
+    """
+    Dependency to get the session factory.
+    
+    Endpoints that run work concurrently open one session per task from
+    this factory, since a single AsyncSession cannot be shared across tasks.
+    """
+    return async_session_maker
+
+
+def dialect_insert(session: AsyncSession, model: Any):
+    """
+    Build an INSERT for the session's database that supports ON CONFLICT.
+    
+    Both PostgreSQL and SQLite inserts provide ``on_conflict_do_update`` and
+    ``excluded``, so callers can write a single upsert for either backend.
+    """
+    if session.bind.dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+
+async def keep_pool_alive(interval: float) -> None:
+    """
+    Periodically run a trivial query on a pooled connection.
+    
+    A dropped connection raises a disconnect error, which invalidates the
+    pool so that requests reconnect instead of failing on a stale connection.
+    Runs until cancelled.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except Exception:
+            # The pool has already been invalidated; try again next interval
+            pass
+
+
+async def warm_pool() -> None:
+    """
+    Open the pool's connections up front.
+    
+    Otherwise the first requests after startup each pay for connecting to
+    the database. Does nothing for SQLite, which has no sized pool.
+    """
+    async def connect() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    
+    await asyncio.gather(*(connect() for _ in range(pool_options.get("pool_size", 0))))
+
+
+def _create_missing_tables(conn: Any) -> None:
+    # One query for the existing table names, rather than create_all
+    # checking for each table in turn when the schema is already in place
+    if not Base.metadata.tables.keys() <= set(inspect(conn).get_table_names()):
+        Base.metadata.create_all(conn)
+
+
 async def create_tables() -> None:
-    """Create all database tables."""
+    """Create any database tables that don't exist yet."""
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_create_missing_tables)
 
 
 async def drop_tables() -> None:
@@ -0,0 +1,112 @@
+"""
+Storage for pending OAuth state parameters.
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional, Protocol, Tuple
+import redis.asyncio as aioredis
+from app.core.redis_client import get_redis
+
+
+class OAuthStateStore(Protocol):
+    """Store for OAuth state values that expire after a TTL."""
+
+    async def put(self, state: str, value: str, ttl: int) -> bool:
+        """Store a value for a state. Returns False if the state already exists."""
+        ...
+
+    async def pop(self, state: str) -> Optional[str]:
+        """Remove and return the value for a state, or None if missing or expired."""
+        ...
+
+
+class RedisOAuthStateStore:
+    """OAuth state store backed by Redis, shared across workers."""
+
+    key_prefix = "oauth:state:"
+
+    def __init__(self, redis: aioredis.Redis):
+        self.redis = redis
+
+    def _key(self, state: str) -> str:
+        return f"{self.key_prefix}{state}"
+
+    async def put(self, state: str, value: str, ttl: int) -> bool:
+        """Store a state with SET ... EX ttl NX so Redis handles expiry."""
+        return bool(await self.redis.set(self._key(state), value, ex=ttl, nx=True))
+
+    async def pop(self, state: str) -> Optional[str]:
+        """Validate and consume a state in a single GETDEL round-trip."""
+        value = await self.redis.getdel(self._key(state))
+        if value is None:
+            return None
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class InMemoryOAuthStateStore:
+    """
+    Process-local OAuth state store for development and tests.
+
+    Entries expire after their TTL; a background task periodically sweeps
+    expired entries so abandoned flows don't accumulate.
+    """
+
+    def __init__(self, sweep_interval: float = 60.0):
+        self.sweep_interval = sweep_interval
+        self._states: Dict[str, Tuple[str, float]] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+
+    async def put(self, state: str, value: str, ttl: int) -> bool:
+        """Store a state with an expiry time."""
+        now = time.monotonic()
+        existing = self._states.get(state)
+        if existing and existing[1] > now:
+            return False
+
+        self._states[state] = (value, now + ttl)
+        self._ensure_sweeper()
+        return True
+
+    async def pop(self, state: str) -> Optional[str]:
+        """Remove and return a state if it exists and hasn't expired."""
+        entry = self._states.pop(state, None)
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        return entry[0]
+
+    def sweep(self) -> int:
+        """Remove expired states. Returns the number of entries removed."""
+        now = time.monotonic()
+        expired = [state for state, (_, expires_at) in self._states.items() if expires_at <= now]
+        for state in expired:
+            del self._states[state]
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def _ensure_sweeper(self) -> None:
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep_forever())
+
+    async def _sweep_forever(self) -> None:
+        while self._states:
+            await asyncio.sleep(self.sweep_interval)
+            self.sweep()
+
+
+_memory_store = InMemoryOAuthStateStore()
+
+
+def get_oauth_state_store() -> OAuthStateStore:
+    """
+    Dependency to get the OAuth state store.
+
+    Uses Redis when configured so state is shared across workers,
+    otherwise falls back to the in-memory store.
+    """
+    redis = get_redis()
+    if redis is not None:
+        return RedisOAuthStateStore(redis)
+    return _memory_store
@@ -0,0 +1,162 @@
+"""
+Token-bucket rate limiting for API endpoints.
+"""
+
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Protocol
+import redis.asyncio as aioredis
+from fastapi import HTTPException, Request
+from app.core.redis_client import get_redis
+
+
+@dataclass
+class TokenBucket:
+    """Token bucket that refills continuously at a fixed rate."""
+    capacity: float
+    refill_rate: float  # Tokens per second
+    tokens: float
+    last_refill: float
+
+    def refill(self, now: float) -> None:
+        """Add the tokens accrued since the last refill."""
+        elapsed = max(0.0, now - self.last_refill)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+        self.last_refill = now
+
+    def consume(self, now: float) -> bool:
+        """Take one token if available. Returns False if the bucket is empty."""
+        self.refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class ThrottledRateLimiter:
+    """
+    Client-side limiter for outgoing requests.
+
+    Callers wait for a token instead of being rejected, so concurrent
+    requests are spread out to stay under an upstream quota.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self._bucket = TokenBucket(burst, rate, burst, time.monotonic())
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a request may be made."""
+        async with self._lock:
+            while not self._bucket.consume(time.monotonic()):
+                await asyncio.sleep((1 - self._bucket.tokens) / self._bucket.refill_rate)
+
+
+class RateLimiter(Protocol):
+    """Rate limiter keyed by an arbitrary string."""
+
+    async def hit(self, key: str, capacity: int, refill_rate: float) -> bool:
+        """Record a request for a key. Returns False if it should be rejected."""
+        ...
+
+
+class InMemoryRateLimiter:
+    """Process-local rate limiter for development and tests."""
+
+    # Full buckets are indistinguishable from new ones, so they can be dropped
+    prune_threshold = 10000
+
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    async def hit(self, key: str, capacity: int, refill_rate: float) -> bool:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.prune_threshold:
+                self._prune(now)
+            bucket = TokenBucket(capacity, refill_rate, capacity, now)
+            self._buckets[key] = bucket
+        return bucket.consume(now)
+
+    def _prune(self, now: float) -> None:
+        for key, bucket in list(self._buckets.items()):
+            bucket.refill(now)
+            if bucket.tokens >= bucket.capacity:
+                del self._buckets[key]
+
+
+class RedisRateLimiter:
+    """Rate limiter backed by Redis so limits apply across workers."""
+
+    key_prefix = "rl:"
+
+    # Refill and consume atomically; buckets expire once they'd be full again
+    script = """
+local capacity = tonumber(ARGV[1])
+local refill_rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'last')
+local tokens = tonumber(bucket[1]) or capacity
+local last = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - last) * refill_rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'last', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / refill_rate) + 1)
+return allowed
+"""
+
+    def __init__(self, redis: aioredis.Redis):
+        self.redis = redis
+        self._script = redis.register_script(self.script)
+
+    async def hit(self, key: str, capacity: int, refill_rate: float) -> bool:
+        allowed = await self._script(
+            keys=[f"{self.key_prefix}{key}"],
+            args=[capacity, refill_rate, time.time()]
+        )
+        return bool(allowed)
+
+
+_memory_limiter = InMemoryRateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the Redis rate limiter if configured, otherwise the in-memory one."""
+    redis = get_redis()
+    if redis is not None:
+        return RedisRateLimiter(redis)
+    return _memory_limiter
+
+
+def rate_limit(scope: str, capacity: int, refill_rate: float) -> Callable:
+    """
+    Create a dependency that rate limits requests per client IP.
+
+    Args:
+        scope: Name shared by all routes that draw from the same bucket
+        capacity: Maximum burst size
+        refill_rate: Tokens added per second
+
+    Returns:
+        FastAPI dependency that raises HTTP 429 when the limit is exceeded
+    """
+    retry_after = str(math.ceil(1 / refill_rate))
+
+    async def dependency(request: Request) -> None:
+        client_ip = request.client.host if request.client else "unknown"
+        limiter = get_rate_limiter()
+        if not await limiter.hit(f"{scope}:{client_ip}", capacity, refill_rate):
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests",
+                headers={"Retry-After": retry_after}
+            )
+
+    return dependency
@@ -0,0 +1,33 @@
+"""
+Shared Redis connection for caching and cross-worker state.
+"""
+
+from typing import Optional
+import redis.asyncio as aioredis
+from app.core.config import settings
+
+_redis: Optional[aioredis.Redis] = None
+
+
+def get_redis() -> Optional[aioredis.Redis]:
+    """
+    Get the shared Redis client.
+
+    The client is created lazily on first use so that importing the
+    application never opens a connection.
+
+    Returns:
+        Redis client, or None if no Redis URL is configured
+    """
+    global _redis
+    if _redis is None and settings.redis_url:
+        _redis = aioredis.from_url(settings.redis_url)
+    return _redis
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client if one was created."""
+    global _redis
+    if _redis is not None:
+        await _redis.close()
+        _redis = None
@@ -0,0 +1,20 @@
+"""
+Response classes shared by the API.
+"""
+
+from typing import Any
+import orjson
+from fastapi.responses import ORJSONResponse as BaseORJSONResponse
+from app.core.cache import JSON_OPTIONS
+
+
+class ORJSONResponse(BaseORJSONResponse):
+    """
+    ORJSONResponse that serializes with the application's JSON options.
+    
+    Naive datetimes, which SQLite returns for UTC columns, are sent with a
+    UTC offset, matching bodies serialized ahead of time with JSON_OPTIONS.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=JSON_OPTIONS)
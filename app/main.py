@@ -2,21 +2,58 @@
 Main FastAPI application entry point.
 """
 
+import asyncio
+import logging
 from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.core.database import create_tables
+from app.core.database import create_tables, is_sqlite, keep_pool_alive, warm_pool
+from app.core.redis_client import close_redis
+from app.core.responses import ORJSONResponse
+from app.services.yahoo_api import get_api_service
+from app.services.yahoo_oauth import get_oauth_service
+
+
+logger = logging.getLogger(__name__)
+
+# Set once deferred startup work has finished; /health/ready returns 503 until then
+READY = asyncio.Event()
+
+# Set if deferred startup work failed; /health/live then fails so the process is restarted
+STARTUP_ERROR: Optional[Exception] = None
+
+
+async def _deferred_init() -> None:
+    """Startup work that doesn't need to finish before the server accepts connections."""
+    global STARTUP_ERROR
+    try:
+        await create_tables()
+        await warm_pool()
+    except Exception as e:
+        STARTUP_ERROR = e
+        logger.exception("Deferred startup failed; the server will not become ready")
+        return
+    READY.set()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
-    # Startup
-    await create_tables()
+    # Startup; schema creation runs in the background so the server binds immediately
+    init = asyncio.create_task(_deferred_init())
+    heartbeat = None
+    if not is_sqlite:
+        heartbeat = asyncio.create_task(keep_pool_alive(settings.database_heartbeat_seconds))
     yield
     # Shutdown
-    pass
+    init.cancel()
+    if heartbeat is not None:
+        heartbeat.cancel()
+    await get_api_service().aclose()
+    await get_oauth_service().aclose()
+    await close_redis()
 
 
 # Create FastAPI application
@@ -25,16 +62,31 @@ app = FastAPI(
     version=settings.app_version,
     debug=settings.debug,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+    openapi_url="/openapi.json" if settings.enable_docs else None,
 )
 
+
+def openapi() -> Dict[str, Any]:
+    """Build the OpenAPI schema, loading the schema examples on first use."""
+    if app.openapi_schema is None:
+        from app.schemas.examples import apply_schema_examples
+        apply_schema_examples()
+    return FastAPI.openapi(app)
+
+
+app.openapi = openapi
+
 # Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+if settings.cors_origins:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins,
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "DELETE"],
+        allow_headers=["Authorization", "Content-Type"],
+        max_age=settings.cors_max_age_seconds,
+    )
 
 
 @app.get("/")
@@ -53,6 +105,24 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness probe; succeeds once the server is accepting requests, unless startup failed."""
+    if STARTUP_ERROR is not None:
+        return ORJSONResponse({"status": "failed", "error": str(STARTUP_ERROR)}, status_code=503)
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness probe; fails until startup work has finished."""
+    if STARTUP_ERROR is not None:
+        return ORJSONResponse({"status": "failed", "error": str(STARTUP_ERROR)}, status_code=503)
+    if not READY.is_set():
+        return ORJSONResponse({"status": "starting"}, status_code=503)
+    return {"status": "ready"}
+
+
 # Import all models to ensure they're registered with SQLAlchemy
 from app.models import user, fantasy, nfl_data
 
@@ -68,10 +138,13 @@ app.include_router(csv_import.router, prefix=settings.api_v1_prefix + "/csv")
 
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
         reload=settings.debug,
+        # uvloop is not available on Windows
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
     )
@@ -3,8 +3,9 @@ Base model with common fields and methods.
 """
 
 from datetime import datetime
-from typing import Any
-from sqlalchemy import DateTime, func
+from functools import cached_property, lru_cache
+from typing import Any, Tuple
+from sqlalchemy import DateTime, event, func
 from sqlalchemy.orm import Mapped, mapped_column
 from app.core.database import Base
 
@@ -25,18 +26,50 @@ class TimestampMixin:
     )
 
 
+@lru_cache(maxsize=None)
+def _cached_property_names(cls: type) -> Tuple[str, ...]:
+    """Names of the functools.cached_property attributes defined on a class."""
+    return tuple(
+        name
+        for klass in cls.__mro__
+        for name, value in vars(klass).items()
+        if isinstance(value, cached_property)
+    )
+
+
+@lru_cache(maxsize=None)
+def _column_names(cls: type) -> Tuple[str, ...]:
+    """Names of the table columns mapped by a model class."""
+    return tuple(column.name for column in cls.__table__.columns)
+
+
 class BaseModel(Base, TimestampMixin):
     """Base model with common functionality."""
     
     __abstract__ = True
     
     def to_dict(self) -> dict[str, Any]:
-        """Convert model to dictionary."""
-        return {
-            column.name: getattr(self, column.name)
-            for column in self.__table__.columns
-        }
+        """
+        Convert model to dictionary.
+        
+        Reads loaded values directly; columns that are expired or deferred
+        are None rather than triggering a load.
+        """
+        values = self.__dict__
+        return {name: values.get(name) for name in _column_names(type(self))}
+    
+    def clear_cached_properties(self) -> None:
+        """Drop memoized values so they are recomputed from current columns."""
+        for name in _cached_property_names(type(self)):
+            self.__dict__.pop(name, None)
     
     def __repr__(self) -> str:
         """String representation of the model."""
         return f"<{self.__class__.__name__}({self.to_dict()})>"
+
+
+@event.listens_for(BaseModel, "refresh", propagate=True)
+@event.listens_for(BaseModel, "expire", propagate=True)
+def _clear_cached_properties_on_reload(target: BaseModel, *args: Any) -> None:
+    """Memoized values derived from columns go stale when the columns reload."""
+    target.clear_cached_properties()
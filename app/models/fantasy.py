@@ -2,11 +2,12 @@
 Fantasy football database models for leagues, teams, players, and rosters.
 """
 
-import json
+import orjson
 from datetime import datetime
+from functools import cached_property
 from typing import Any, Dict
 from sqlalchemy import String, Integer, Boolean, Text, ForeignKey, DateTime
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from app.models.base import BaseModel
 
 
@@ -29,26 +30,32 @@ class League(BaseModel):
     num_teams: Mapped[int] = mapped_column(Integer, nullable=True)
     is_finished: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     
-    # Relationships
-    teams = relationship("Team", back_populates="league", cascade="all, delete-orphan")
-    league_players = relationship("LeaguePlayer", back_populates="league", cascade="all, delete-orphan")
-    draft_picks = relationship("DraftPick", back_populates="league", cascade="all, delete-orphan")
+    # Relationships. Lazy loads raise instead of querying per object, so
+    # callers load related rows explicitly with selectinload/joinedload.
+    teams = relationship("Team", back_populates="league", cascade="all, delete-orphan", lazy="raise_on_sql")
+    league_players = relationship("LeaguePlayer", back_populates="league", cascade="all, delete-orphan", lazy="raise_on_sql")
+    draft_picks = relationship("DraftPick", back_populates="league", cascade="all, delete-orphan", lazy="raise_on_sql")
     
     def __repr__(self) -> str:
         return f"<League(league_key={self.league_key}, name={self.name}, season={self.season})>"
     
-    @property
+    @validates("scoring_json", "roster_slots_json")
+    def _validate_json_column(self, key: str, value: str) -> str:
+        self.clear_cached_properties()
+        return value
+    
+    @cached_property
     def scoring_rules(self) -> Dict[str, Any]:
         """Get scoring rules as a dictionary."""
         if self.scoring_json:
-            return json.loads(self.scoring_json)
+            return orjson.loads(self.scoring_json)
         return {}
     
-    @property
+    @cached_property
     def roster_slots(self) -> Dict[str, Any]:
         """Get roster slots as a dictionary."""
         if self.roster_slots_json:
-            return json.loads(self.roster_slots_json)
+            return orjson.loads(self.roster_slots_json)
         return {}
 
 
@@ -73,8 +80,8 @@ class Team(BaseModel):
     ties: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     
     # Relationships
-    league = relationship("League", back_populates="teams")
-    rosters = relationship("Roster", back_populates="team", cascade="all, delete-orphan")
+    league = relationship("League", back_populates="teams", lazy="raise_on_sql")
+    rosters = relationship("Roster", back_populates="team", cascade="all, delete-orphan", lazy="raise_on_sql")
     
     def __repr__(self) -> str:
         return f"<Team(team_key={self.team_key}, name={self.name}, league_key={self.league_key})>"
@@ -102,8 +109,8 @@ class Player(BaseModel):
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     
     # Relationships
-    league_players = relationship("LeaguePlayer", back_populates="player", cascade="all, delete-orphan")
-    rosters = relationship("Roster", back_populates="player", cascade="all, delete-orphan")
+    league_players = relationship("LeaguePlayer", back_populates="player", cascade="all, delete-orphan", lazy="raise_on_sql")
+    rosters = relationship("Roster", back_populates="player", cascade="all, delete-orphan", lazy="raise_on_sql")
     
     def __repr__(self) -> str:
         return f"<Player(player_id_yahoo={self.player_id_yahoo}, full_name={self.full_name}, position={self.position})>"
@@ -113,6 +120,8 @@ class LeaguePlayer(BaseModel):
     """Player status within a specific league."""
     
     __tablename__ = "league_players"
+    # Only ever looked up by primary key; store rows in the key's B-tree on SQLite
+    __table_args__ = {"sqlite_with_rowid": False}
     
     # Composite primary key
     league_key: Mapped[str] = mapped_column(String, ForeignKey("leagues.league_key"), primary_key=True)
@@ -127,9 +136,9 @@ class LeaguePlayer(BaseModel):
     owner_team_key: Mapped[str] = mapped_column(String, ForeignKey("teams.team_key"), nullable=True)
     
     # Relationships
-    league = relationship("League", back_populates="league_players")
-    player = relationship("Player", back_populates="league_players")
-    owner_team = relationship("Team")
+    league = relationship("League", back_populates="league_players", lazy="raise_on_sql")
+    player = relationship("Player", back_populates="league_players", lazy="raise_on_sql")
+    owner_team = relationship("Team", lazy="raise_on_sql")
     
     def __repr__(self) -> str:
         return f"<LeaguePlayer(league_key={self.league_key}, player_id_yahoo={self.player_id_yahoo}, status={self.status})>"
@@ -139,6 +148,8 @@ class Roster(BaseModel):
     """Team roster for a specific week."""
     
     __tablename__ = "rosters"
+    # Only ever looked up by primary key; store rows in the key's B-tree on SQLite
+    __table_args__ = {"sqlite_with_rowid": False}
     
     # Roster identification
     team_key: Mapped[str] = mapped_column(String, ForeignKey("teams.team_key"), primary_key=True)
@@ -152,8 +163,8 @@ class Roster(BaseModel):
     is_starting: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     
     # Relationships
-    team = relationship("Team", back_populates="rosters")
-    player = relationship("Player", back_populates="rosters")
+    team = relationship("Team", back_populates="rosters", lazy="raise_on_sql")
+    player = relationship("Player", back_populates="rosters", lazy="raise_on_sql")
     
     def __repr__(self) -> str:
         return f"<Roster(team_key={self.team_key}, week={self.week}, slot={self.slot}, player_id_yahoo={self.player_id_yahoo})>"
@@ -163,6 +174,8 @@ class DraftPick(BaseModel):
     """Draft pick information."""
     
     __tablename__ = "draft_picks"
+    # Only ever looked up by primary key; store rows in the key's B-tree on SQLite
+    __table_args__ = {"sqlite_with_rowid": False}
     
     # Draft pick identification
     league_key: Mapped[str] = mapped_column(String, ForeignKey("leagues.league_key"), primary_key=True)
@@ -175,9 +188,9 @@ class DraftPick(BaseModel):
     cost: Mapped[int] = mapped_column(Integer, nullable=True)  # For auction drafts
     
     # Relationships
-    league = relationship("League", back_populates="draft_picks")
-    team = relationship("Team")
-    player = relationship("Player")
+    league = relationship("League", back_populates="draft_picks", lazy="raise_on_sql")
+    team = relationship("Team", lazy="raise_on_sql")
+    player = relationship("Player", lazy="raise_on_sql")
     
     def __repr__(self) -> str:
         return f"<DraftPick(league_key={self.league_key}, round={self.round}, pick={self.pick}, team_key={self.team_key})>"
@@ -2,11 +2,12 @@
 NFL data models for statistics, projections, injuries, and depth charts.
 """
 
-import json
+import orjson
 from datetime import datetime
+from functools import cached_property
 from typing import Any, Dict, Optional
-from sqlalchemy import String, Integer, Boolean, Text, Float, DateTime
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Integer, Boolean, Text, Float, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column, validates
 from app.models.base import BaseModel
 
 
@@ -31,15 +32,19 @@ class WeeklyStats(BaseModel):
     def __repr__(self) -> str:
         return f"<WeeklyStats(gsis_id={self.gsis_id}, season={self.season}, week={self.week})>"
     
-    @property
+    @validates("stat_json")
+    def _validate_stat_json(self, key: str, value: str) -> str:
+        self.clear_cached_properties()
+        return value
+    
+    @cached_property
     def stats(self) -> Dict[str, Any]:
         """Get statistics as a dictionary."""
-        return json.loads(self.stat_json)
+        return orjson.loads(self.stat_json)
     
     @property
     def fantasy_points(self) -> float:
         """Calculate fantasy points from stats (basic calculation)."""
-        stats = self.stats
         # This is a placeholder - actual calculation will be done by scoring engine
         return 0.0
 
@@ -48,6 +53,10 @@ class WeeklyProjections(BaseModel):
     """Fantasy football weekly projections."""
     
     __tablename__ = "weekly_projections"
+    __table_args__ = (
+        # Projection listings and exports select one source's week across all players
+        Index("ix_weekly_projections_season_week_source", "season", "week", "source"),
+    )
     
     # Player identification
     gsis_id: Mapped[str] = mapped_column(String, primary_key=True)
@@ -65,10 +74,15 @@ class WeeklyProjections(BaseModel):
     def __repr__(self) -> str:
         return f"<WeeklyProjections(gsis_id={self.gsis_id}, season={self.season}, week={self.week}, source={self.source})>"
     
-    @property
+    @validates("proj_json")
+    def _validate_proj_json(self, key: str, value: str) -> str:
+        self.clear_cached_properties()
+        return value
+    
+    @cached_property
     def projections(self) -> Dict[str, Any]:
         """Get projections as a dictionary."""
-        return json.loads(self.proj_json)
+        return orjson.loads(self.proj_json)
 
 
 class Injuries(BaseModel):
@@ -108,6 +122,10 @@ class DepthCharts(BaseModel):
     """Team depth chart information."""
     
     __tablename__ = "depth_charts"
+    __table_args__ = (
+        # Projections look up a player's depth chart slot, which the primary key can't serve
+        Index("ix_depth_charts_gsis_id_season_week", "gsis_id", "season", "week"),
+    )
     
     # Depth chart identification
     team: Mapped[str] = mapped_column(String, primary_key=True)
@@ -178,7 +196,36 @@ class Recommendations(BaseModel):
     def __repr__(self) -> str:
         return f"<Recommendations(team_key={self.team_key}, week={self.week}, delta_points={self.delta_points})>"
     
-    @property
+    @validates("lineup_json")
+    def _validate_lineup_json(self, key: str, value: str) -> str:
+        self.clear_cached_properties()
+        return value
+    
+    @cached_property
     def lineup(self) -> Dict[str, Any]:
         """Get lineup as a dictionary."""
-        return json.loads(self.lineup_json)
+        return orjson.loads(self.lineup_json)
+
+
+class ImportJob(BaseModel):
+    """Background NFL data import and its outcome."""
+    
+    __tablename__ = "import_jobs"
+    
+    # Job identification
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    job_type: Mapped[str] = mapped_column(String, nullable=False)  # "weekly_stats", "injuries", ..., "all"
+    season: Mapped[int] = mapped_column(Integer, nullable=False)
+    week: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    
+    # Job state
+    status: Mapped[str] = mapped_column(String, nullable=False, index=True)  # "pending", "running", "completed", "failed"
+    result_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Import results once finished
+    
+    def __repr__(self) -> str:
+        return f"<ImportJob(id={self.id}, job_type={self.job_type}, status={self.status})>"
+    
+    @property
+    def result(self) -> Optional[Dict[str, Any]]:
+        """Get import results as a dictionary."""
+        return orjson.loads(self.result_json) if self.result_json else None
@@ -2,10 +2,12 @@
 User model for authentication and OAuth token storage.
 """
 
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timezone
+from functools import cached_property
 from typing import List
 from sqlalchemy import String, DateTime, Boolean, ForeignKey
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from app.models.base import BaseModel
 
 
@@ -27,7 +29,7 @@ class User(BaseModel):
     display_name: Mapped[str] = mapped_column(String, nullable=True)
     
     # Relationships
-    yahoo_tokens: Mapped[List["YahooToken"]] = relationship("YahooToken", back_populates="user")
+    yahoo_tokens: Mapped[List["YahooToken"]] = relationship("YahooToken", back_populates="user", lazy="raise_on_sql")
     
     def __repr__(self) -> str:
         return f"<User(id={self.id}, email={self.email}, username={self.username})>"
@@ -56,17 +58,31 @@ class YahooToken(BaseModel):
     yahoo_guid: Mapped[str] = mapped_column(String, nullable=True)
     
     # Relationships
-    user: Mapped["User"] = relationship("User", back_populates="yahoo_tokens")
+    user: Mapped["User"] = relationship("User", back_populates="yahoo_tokens", lazy="raise_on_sql")
     
     def __repr__(self) -> str:
         return f"<YahooToken(user_id={self.user_id}, expires_at={self.expires_at})>"
     
+    @validates("expires_at")
+    def _validate_expires_at(self, key: str, value: datetime) -> datetime:
+        self.clear_cached_properties()
+        return value
+    
+    @cached_property
+    def expires_at_timestamp(self) -> float:
+        """Get the expiry as a POSIX timestamp."""
+        expires_at = self.expires_at
+        if expires_at.tzinfo is None:
+            # SQLite drops the offset; expiries are always stored in UTC
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return expires_at.timestamp()
+    
     @property
     def is_expired(self) -> bool:
         """Check if the access token is expired."""
-        return datetime.utcnow() >= self.expires_at
+        return time.time() >= self.expires_at_timestamp
     
     @property
     def needs_refresh(self) -> bool:
         """Check if the token needs to be refreshed (5-minute buffer)."""
-        return datetime.utcnow() >= (self.expires_at - timedelta(minutes=5))
+        return time.time() >= self.expires_at_timestamp - 300
@@ -0,0 +1,23 @@
+"""
+Base class for API schemas.
+"""
+
+from pydantic import BaseModel, ConfigDict
+
+
+class Schema(BaseModel):
+    """
+    Base for all request/response schemas.
+
+    Validators are built on first use rather than at import, so workers and
+    scripts only pay for the schemas they actually touch. Unknown keys are
+    dropped without being stored, defaults are trusted rather than
+    validated, and instances passed into another schema are reused as is.
+    """
+
+    model_config = ConfigDict(
+        defer_build=True,
+        extra="ignore",
+        validate_default=False,
+        revalidate_instances="never",
+    )
@@ -0,0 +1,31 @@
+"""
+Closed sets of string values used by the schemas.
+"""
+
+from typing import Literal
+
+# Player positions as reported by Yahoo, including individual defensive players
+Position = Literal["QB", "RB", "WR", "TE", "K", "DEF", "DL", "DE", "DT", "LB", "DB", "CB", "S"]
+
+# Positions the projection engine has a model for
+ProjectedPosition = Literal["QB", "RB", "WR", "TE", "K"]
+
+# Lineup slots, including Yahoo's combined flex slots, bench and injured reserve
+RosterSlotName = Literal[
+    "QB", "RB", "WR", "TE", "K", "DEF", "DL", "DE", "DT", "LB", "DB", "CB", "S", "D",
+    "FLEX", "W/R", "W/T", "W/R/T", "Q/W/R/T", "BN", "IR",
+]
+
+# Game status from NFL injury reports
+InjuryStatus = Literal["Out", "Doubtful", "Questionable", "IR", "PUP"]
+
+# Availability of a player within a league: free agent, on waivers, on a team or injured reserve
+PlayerStatus = Literal["FA", "WA", "T", "IR"]
+
+# NFL team abbreviations as used by nflverse (the Rams are "LA")
+Team = Literal[
+    "ARI", "ATL", "BAL", "BUF", "CAR", "CHI", "CIN", "CLE",
+    "DAL", "DEN", "DET", "GB", "HOU", "IND", "JAX", "KC",
+    "LA", "LAC", "LV", "MIA", "MIN", "NE", "NO", "NYG",
+    "NYJ", "PHI", "PIT", "SEA", "SF", "TB", "TEN", "WAS",
+]
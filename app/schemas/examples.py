@@ -0,0 +1,141 @@
+"""
+Example payloads shown in the OpenAPI docs.
+
+Kept out of the schema modules so workers only build these dicts when the
+OpenAPI schema is first generated.
+"""
+
+from typing import Any, Dict, Type
+
+from pydantic import BaseModel
+
+from app.schemas.auth import OAuthStartResponse, OAuthCallbackResponse, UserInfo, AuthError
+from app.schemas.yahoo import (
+    LeagueInfo, TeamInfo, PlayerInfo, TeamRoster, LeaguePlayerStatus,
+    LeagueSyncResponse, UserLeaguesResponse, SyncError
+)
+
+SCHEMA_EXAMPLES: Dict[Type[BaseModel], Dict[str, Any]] = {
+    OAuthStartResponse: {
+        "example": {
+            "authorization_url": "https://api.login.yahoo.com/oauth2/request_auth?client_id=...",
+            "state": "abc123def456..."
+        }
+    },
+    OAuthCallbackResponse: {
+        "example": {
+            "success": True,
+            "user_id": "user_123",
+            "message": "Authentication successful"
+        }
+    },
+    UserInfo: {
+        "example": {
+            "id": "user_123",
+            "email": "user@example.com",
+            "username": "fantasyuser",
+            "display_name": "Fantasy User",
+            "is_active": True,
+            "is_verified": True,
+            "created_at": "2024-01-01T00:00:00Z"
+        }
+    },
+    AuthError: {
+        "example": {
+            "error": "invalid_grant",
+            "error_description": "The authorization code is invalid or expired"
+        }
+    },
+    LeagueInfo: {
+        "example": {
+            "league_key": "414.l.123456",
+            "name": "My Fantasy League",
+            "season": 2024,
+            "league_type": "private",
+            "num_teams": 12,
+            "is_finished": False
+        }
+    },
+    TeamInfo: {
+        "example": {
+            "team_key": "414.l.123456.t.1",
+            "name": "Team Awesome",
+            "manager": "John Doe",
+            "division_id": 1,
+            "rank": 3,
+            "wins": 8,
+            "losses": 4,
+            "ties": 0
+        }
+    },
+    PlayerInfo: {
+        "example": {
+            "player_id_yahoo": "12345",
+            "full_name": "Patrick Mahomes",
+            "first_name": "Patrick",
+            "last_name": "Mahomes",
+            "position": "QB",
+            "team": "KC",
+            "bye_week": 10,
+            "is_active": True
+        }
+    },
+    TeamRoster: {
+        "example": {
+            "team_key": "414.l.123456.t.1",
+            "week": 1,
+            "slots": [
+                {"slot": "QB", "player_id_yahoo": "12345", "is_starting": True},
+                {"slot": "RB", "player_id_yahoo": "67890", "is_starting": True},
+                {"slot": "BN", "player_id_yahoo": "11111", "is_starting": False}
+            ]
+        }
+    },
+    LeaguePlayerStatus: {
+        "example": {
+            "player_id_yahoo": "12345",
+            "status": "FA",
+            "percent_rostered": 85,
+            "faab_cost_est": 15,
+            "owner_team_key": None
+        }
+    },
+    LeagueSyncResponse: {
+        "example": {
+            "success": True,
+            "league_key": "414.l.123456",
+            "message": "League synced successfully",
+            "teams_synced": 12,
+            "players_synced": 180,
+            "draft_picks_synced": 144
+        }
+    },
+    UserLeaguesResponse: {
+        "example": {
+            "leagues": [
+                {
+                    "league_key": "414.l.123456",
+                    "name": "My Fantasy League",
+                    "season": 2024,
+                    "league_type": "private",
+                    "num_teams": 12,
+                    "is_finished": False
+                }
+            ],
+            "total_count": 1
+        }
+    },
+    SyncError: {
+        "example": {
+            "error": "league_not_found",
+            "error_description": "League with key 414.l.123456 not found",
+            "league_key": "414.l.123456"
+        }
+    },
+}
+
+
+def apply_schema_examples() -> None:
+    """Attach the examples to their schemas' JSON schema config."""
+    for model, extra in SCHEMA_EXAMPLES.items():
+        model.model_config["json_schema_extra"] = extra
@@ -2,121 +2,170 @@
 Pydantic schemas for NFL data models and API responses.
 """
 
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
+from pydantic import Field, TypeAdapter
 
+from app.schemas.base import Schema
+from app.schemas.enums import InjuryStatus, ProjectedPosition, Team
 
-class WeeklyStatsResponse(BaseModel):
+
+class WeeklyStatsResponse(Schema):
     """Response schema for weekly statistics."""
     
     gsis_id: str = Field(..., description="Player GSIS ID")
     season: int = Field(..., description="NFL season year")
     week: int = Field(..., description="Week number")
-    team: str = Field(..., description="Player's team")
-    opponent: Optional[str] = Field(None, description="Opponent team")
+    team: Team = Field(..., description="Player's team")
+    opponent: Optional[Team] = Field(None, description="Opponent team")
     game_date: Optional[datetime] = Field(None, description="Game date")
     stats: Dict[str, Any] = Field(..., description="Player statistics")
     fantasy_points: float = Field(..., description="Calculated fantasy points")
 
 
-class InjuryResponse(BaseModel):
+class InjuryResponse(Schema):
     """Response schema for injury information."""
     
     gsis_id: str = Field(..., description="Player GSIS ID")
     season: int = Field(..., description="NFL season year")
     week: int = Field(..., description="Week number")
-    status: str = Field(..., description="Injury status")
+    status: InjuryStatus = Field(..., description="Injury status")
     report: Optional[str] = Field(None, description="Injury report details")
     practice_status: Optional[str] = Field(None, description="Practice status")
-    team: str = Field(..., description="Player's team")
+    team: Team = Field(..., description="Player's team")
     position: str = Field(..., description="Player position")
     is_out: bool = Field(..., description="Whether player is out")
     is_questionable: bool = Field(..., description="Whether player is questionable")
 
 
-class DepthChartEntry(BaseModel):
+@dataclass(slots=True, frozen=True)
+class DepthChartEntry:
     """Schema for depth chart entry."""
     
-    gsis_id: str = Field(..., description="Player GSIS ID")
-    depth_order: int = Field(..., description="Depth order (1 = starter)")
-    role: Optional[str] = Field(None, description="Player role")
-    is_starter: bool = Field(..., description="Whether player is starter")
+    position: str
+    gsis_id: str
+    depth_order: int  # 1 = starter
+    role: Optional[str]
+    is_starter: bool
 
 
-class DepthChartResponse(BaseModel):
+class DepthChartResponse(Schema):
     """Response schema for team depth chart."""
     
-    team: str = Field(..., description="Team abbreviation")
+    team: Team = Field(..., description="Team abbreviation")
     season: int = Field(..., description="NFL season year")
     week: int = Field(..., description="Week number")
-    depth_chart: Dict[str, List[DepthChartEntry]] = Field(..., description="Depth chart by position")
+    entries: List[DepthChartEntry] = Field(..., description="Depth chart entries, one per position, ordered by position")
 
 
-class NFLDataImportResponse(BaseModel):
-    """Response schema for NFL data import operations."""
+class StatsImportResponse(Schema):
+    """Result of a weekly stats import."""
     
+    kind: Literal["stats"] = "stats"
     success: bool = Field(..., description="Whether import was successful")
-    message: str = Field(..., description="Import result message")
+    stats_created: int = Field(..., description="Number of stats records created")
+    stats_updated: int = Field(..., description="Number of stats records updated")
+    total_processed: int = Field(..., description="Total records processed")
+
+
+class InjuryImportResponse(Schema):
+    """Result of an injury import."""
     
-    # Weekly stats fields
-    stats_created: Optional[int] = Field(None, description="Number of stats records created")
-    stats_updated: Optional[int] = Field(None, description="Number of stats records updated")
-    total_processed: Optional[int] = Field(None, description="Total records processed")
+    kind: Literal["injury"] = "injury"
+    success: bool = Field(..., description="Whether import was successful")
+    injuries_created: int = Field(..., description="Number of injury records created")
+    injuries_updated: int = Field(..., description="Number of injury records updated")
+    total_processed: int = Field(..., description="Total records processed")
+
+
+class DepthChartImportResponse(Schema):
+    """Result of a depth chart import."""
     
-    # Injury fields
-    injuries_created: Optional[int] = Field(None, description="Number of injury records created")
-    injuries_updated: Optional[int] = Field(None, description="Number of injury records updated")
+    kind: Literal["depth"] = "depth"
+    success: bool = Field(..., description="Whether import was successful")
+    charts_created: int = Field(..., description="Number of depth chart records created")
+    charts_updated: int = Field(..., description="Number of depth chart records updated")
+    total_processed: int = Field(..., description="Total records processed")
+
+
+class SnapCountImportResponse(Schema):
+    """Result of a snap count import."""
     
-    # Depth chart fields
-    charts_created: Optional[int] = Field(None, description="Number of depth chart records created")
-    charts_updated: Optional[int] = Field(None, description="Number of depth chart records updated")
+    kind: Literal["snaps"] = "snaps"
+    success: bool = Field(..., description="Whether import was successful")
+    stats_updated: int = Field(..., description="Number of stats records updated with snap counts")
+    total_processed: int = Field(..., description="Total records processed")
+
+
+class ImportErrorResponse(Schema):
+    """Result of an import that failed."""
     
-    # Error fields
-    failed_imports: Optional[List[str]] = Field(None, description="List of failed imports")
-    error: Optional[str] = Field(None, description="Error message")
+    kind: Literal["error"] = "error"
+    success: bool = Field(False, description="Whether import was successful")
+    error: str = Field(..., description="Error message")
+
+
+# Result of any single NFL data import, told apart by its "kind" tag
+ImportResponse = Annotated[
+    Union[
+        StatsImportResponse,
+        InjuryImportResponse,
+        DepthChartImportResponse,
+        SnapCountImportResponse,
+        ImportErrorResponse,
+    ],
+    Field(discriminator="kind")
+]
 
 
-class AllNFLDataImportResponse(BaseModel):
+class AllNFLDataImportResponse(Schema):
     """Response schema for importing all NFL data types."""
     
     success: bool = Field(..., description="Whether all imports were successful")
     message: str = Field(..., description="Import result message")
     
     # Individual import results
-    weekly_stats: Dict[str, Any] = Field(..., description="Weekly stats import result")
-    injuries: Dict[str, Any] = Field(..., description="Injuries import result")
-    depth_charts: Dict[str, Any] = Field(..., description="Depth charts import result")
-    snap_counts: Dict[str, Any] = Field(..., description="Snap counts import result")
+    weekly_stats: ImportResponse = Field(..., description="Weekly stats import result")
+    injuries: ImportResponse = Field(..., description="Injuries import result")
+    depth_charts: ImportResponse = Field(..., description="Depth charts import result")
+    snap_counts: ImportResponse = Field(..., description="Snap counts import result")
     
     # Error fields
     failed_imports: Optional[List[str]] = Field(None, description="List of failed imports")
 
 
-class ProjectionRequest(BaseModel):
+class ProjectionRequest(Schema):
     """Request schema for creating projections."""
     
     gsis_id: str = Field(..., description="Player GSIS ID")
     season: int = Field(..., description="NFL season year")
     week: int = Field(..., description="Week number")
     source: str = Field(default="internal", description="Projection source")
-    projections: Dict[str, Any] = Field(..., description="Projection data")
+    projections: Dict[str, float] = Field(..., description="Projected value per stat")
     confidence: Optional[float] = Field(None, ge=0.0, le=1.0, description="Confidence score")
 
 
-class ProjectionResponse(BaseModel):
+class BatchProjectionPlayer(Schema):
+    """Player to project in a batch request."""
+    
+    gsis_id: str = Field(..., min_length=1, description="Player GSIS ID")
+    position: ProjectedPosition = Field(..., description="Player position")
+
+
+class ProjectionResponse(Schema):
     """Response schema for projections."""
     
     gsis_id: str = Field(..., description="Player GSIS ID")
     season: int = Field(..., description="NFL season year")
     week: int = Field(..., description="Week number")
     source: str = Field(..., description="Projection source")
-    projections: Dict[str, Any] = Field(..., description="Projection data")
+    projections: Dict[str, float] = Field(..., description="Projected value per stat")
     confidence: Optional[float] = Field(None, description="Confidence score")
     created_at: datetime = Field(..., description="Creation timestamp")
 
 
-class ScoringRule(BaseModel):
+class ScoringRule(Schema):
     """Schema for individual scoring rules."""
     
     stat: str = Field(..., description="Statistic name")
@@ -125,7 +174,7 @@ class ScoringRule(BaseModel):
     max_points: Optional[float] = Field(None, description="Maximum points for this stat")
 
 
-class ScoringSystem(BaseModel):
+class ScoringSystem(Schema):
     """Schema for complete scoring system."""
     
     passing_yards: Optional[ScoringRule] = Field(None, description="Passing yards scoring")
@@ -141,7 +190,7 @@ class ScoringSystem(BaseModel):
     extra_points: Optional[ScoringRule] = Field(None, description="Extra points scoring")
 
 
-class FantasyPointsResponse(BaseModel):
+class FantasyPointsResponse(Schema):
     """Response schema for calculated fantasy points."""
     
     gsis_id: str = Field(..., description="Player GSIS ID")
@@ -150,3 +199,7 @@ class FantasyPointsResponse(BaseModel):
     fantasy_points: float = Field(..., description="Calculated fantasy points")
     scoring_breakdown: Dict[str, float] = Field(..., description="Points breakdown by stat")
     scoring_system: ScoringSystem = Field(..., description="Scoring system used")
+
+
+# Built once at import so each scoring engine reuses the compiled validator and serializer
+ScoringSystemAdapter = TypeAdapter(ScoringSystem)
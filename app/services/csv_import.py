@@ -2,18 +2,75 @@
 CSV import service for custom projections and data.
 """
 
+import asyncio
 import csv
 import io
 import json
 from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional, Union
+from typing import AsyncIterator, Dict, Any, IO, List, Optional, Tuple, Union
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, func, tuple_
 import pandas as pd
 
+from app.core.database import dialect_insert
 from app.models.nfl_data import WeeklyProjections, PlayerIDMapping
 from app.models.fantasy import Player
 
+# Rows parsed and flushed to the database at a time
+CSV_CHUNK_SIZE = 1000
+
+# Numeric projection columns, all defaulting to 0 when absent
+PROJECTION_STAT_COLUMNS = [
+    'passing_yards', 'passing_tds', 'passing_ints',
+    'rushing_yards', 'rushing_tds',
+    'receiving_yards', 'receiving_tds', 'receptions',
+    'fumbles_lost',
+    'field_goals', 'field_goal_attempts',
+    'extra_points', 'extra_point_attempts',
+]
+
+# Example file returned by the template endpoint
+CSV_TEMPLATE = """player_name,position,team,season,week,passing_yards,passing_tds,passing_ints,rushing_yards,rushing_tds,receiving_yards,receiving_tds,receptions,fumbles_lost,field_goals,field_goal_attempts,extra_points,extra_point_attempts,confidence
+Josh Allen,QB,BUF,2024,1,250,2,1,25,0,0,0,0,0,0,0,0,0,0.8
+Christian McCaffrey,RB,SF,2024,1,0,0,0,85,1,45,0,4,0,0,0,0,0,0.9
+Cooper Kupp,WR,LAR,2024,1,0,0,0,0,0,95,1,7,0,0,0,0,0,0.85
+Travis Kelce,TE,KC,2024,1,0,0,0,0,0,75,1,6,0,0,0,0,0,0.9
+Justin Tucker,K,BAL,2024,1,0,0,0,0,0,0,0,0,0,2,3,3,3,0.95"""
+
+# Bytes of an upload parsed when validating; the rest is only counted
+CSV_SAMPLE_BYTES = 64 * 1024
+
+# Text columns are read as strings so pandas never has to infer their type
+CSV_STRING_DTYPES = {'player_name': str, 'position': str, 'team': str}
+
+
+def _read_csv_sample(csv_source: Union[str, IO]) -> Tuple[bytes, int]:
+    """
+    Read the leading complete lines of a CSV and count its data rows.
+    
+    Returns:
+        Up to CSV_SAMPLE_BYTES of whole lines, and the number of data rows
+        in the whole file (line breaks after the header)
+    """
+    if isinstance(csv_source, str):
+        csv_source = io.BytesIO(csv_source.encode('utf-8'))
+    
+    sample = csv_source.read(CSV_SAMPLE_BYTES)
+    line_breaks = sample.count(b"\n")
+    last_byte = sample[-1:]
+    
+    # Count the remaining lines without parsing them
+    while block := csv_source.read(1024 * 1024):
+        line_breaks += block.count(b"\n")
+        last_byte = block[-1:]
+    
+    # Drop a trailing partial line so the sample parses cleanly
+    if len(sample) == CSV_SAMPLE_BYTES and b"\n" in sample:
+        sample = sample[:sample.rindex(b"\n") + 1]
+    
+    lines = line_breaks + (1 if last_byte not in (b"", b"\n") else 0)
+    return sample, max(lines - 1, 0)
+
 
 class CSVImportService:
     """Service for importing data from CSV files."""
@@ -23,7 +80,7 @@ class CSVImportService:
     
     async def import_projections_csv(
         self, 
-        csv_content: str, 
+        csv_source: Union[str, IO], 
         source: str = "csv",
         season: int = None,
         week: int = None
@@ -37,7 +94,7 @@ class CSVImportService:
         field_goals,field_goal_attempts,extra_points,extra_point_attempts,confidence
         
         Args:
-            csv_content: CSV content as string
+            csv_source: CSV content as string, or a file object to stream from
             source: Source identifier for projections
             season: Override season (if not in CSV)
             week: Override week (if not in CSV)
@@ -46,47 +103,66 @@ class CSVImportService:
             Import results
         """
         try:
-            # Parse CSV content
-            df = pd.read_csv(io.StringIO(csv_content))
-            
-            # Validate required columns
-            required_columns = ['player_name', 'position']
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            if missing_columns:
-                return {
-                    "success": False,
-                    "error": f"Missing required columns: {missing_columns}"
-                }
-            
-            # Process each row
             projections_created = 0
             projections_updated = 0
+            total_processed = 0
             errors = []
+            columns_checked = False
             
-            for index, row in df.iterrows():
-                try:
-                    result = await self._process_projection_row(
-                        row, source, season, week
-                    )
-                    
-                    if result["success"]:
-                        if result["created"]:
-                            projections_created += 1
+            async for chunk in self._iter_csv_chunks(csv_source):
+                # Validate required columns
+                if not columns_checked:
+                    required_columns = ['player_name', 'position']
+                    missing_columns = [col for col in required_columns if col not in chunk.columns]
+                    if missing_columns:
+                        return {
+                            "success": False,
+                            "error": f"Missing required columns: {missing_columns}"
+                        }
+                    columns_checked = True
+                
+                chunk = self._normalize_projection_chunk(chunk)
+                
+                # Later rows for the same projection replace earlier ones
+                records: Dict[tuple, Dict[str, Any]] = {}
+                duplicates = 0
+                
+                # Process each row
+                for index, row in zip(chunk.index, chunk.to_dict('records')):
+                    try:
+                        if row['_error']:
+                            result = {"success": False, "error": row['_error']}
+                        else:
+                            result = await self._process_projection_row(row, source, season, week)
+                        
+                        if result["success"]:
+                            record = result["record"]
+                            key = (record["gsis_id"], record["season"], record["week"], record["source"])
+                            if key in records:
+                                duplicates += 1
+                            records[key] = record
                         else:
-                            projections_updated += 1
-                    else:
+                            errors.append({
+                                "row": index + 1,
+                                "player_name": row.get('player_name', 'Unknown'),
+                                "error": result["error"]
+                            })
+                            
+                    except Exception as e:
                         errors.append({
                             "row": index + 1,
                             "player_name": row.get('player_name', 'Unknown'),
-                            "error": result["error"]
+                            "error": str(e)
                         })
-                        
-                except Exception as e:
-                    errors.append({
-                        "row": index + 1,
-                        "player_name": row.get('player_name', 'Unknown'),
-                        "error": str(e)
-                    })
+                
+                total_processed += len(chunk)
+                
+                # Upsert this chunk's projections in one statement
+                if records:
+                    existing = await self._count_existing_projections(list(records))
+                    await self._upsert_projections(list(records.values()))
+                    projections_created += len(records) - existing
+                    projections_updated += existing + duplicates
             
             await self.db.commit()
             
@@ -94,7 +170,7 @@ class CSVImportService:
                 "success": True,
                 "projections_created": projections_created,
                 "projections_updated": projections_updated,
-                "total_processed": len(df),
+                "total_processed": total_processed,
                 "errors": errors,
                 "error_count": len(errors)
             }
@@ -103,22 +179,81 @@ class CSVImportService:
             await self.db.rollback()
             return {
                 "success": False,
-                "error": f"Failed to import CSV: {str(e)}"
+                "error": f"Failed to import CSV: {e}"
             }
     
+    async def _iter_csv_chunks(self, csv_source: Union[str, IO]) -> AsyncIterator[pd.DataFrame]:
+        """
+        Parse CSV content in chunks of CSV_CHUNK_SIZE rows.
+        
+        File objects are decoded and parsed incrementally, so memory use is
+        bounded by the chunk size rather than the file size. Parsing runs in
+        a worker thread to keep file reads off the event loop.
+        """
+        if isinstance(csv_source, str):
+            csv_source = io.StringIO(csv_source)
+        
+        reader = await asyncio.to_thread(
+            pd.read_csv,
+            csv_source,
+            chunksize=CSV_CHUNK_SIZE,
+            dtype=CSV_STRING_DTYPES
+        )
+        with reader:
+            while True:
+                chunk = await asyncio.to_thread(next, reader, None)
+                if chunk is None:
+                    break
+                yield chunk
+    
+    def _normalize_projection_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Clean and type a chunk of projection rows column-wise.
+        
+        Strings are stripped, numeric columns coerced (missing values default
+        to 0, confidence to 0.5 and clamped to 0-1), and rows with values that
+        are present but not numeric get a message in the ``_error`` column.
+        """
+        chunk = chunk.copy()
+        errors = pd.Series("", index=chunk.index)
+        
+        for col in ('player_name', 'position', 'team'):
+            values = chunk[col].fillna('') if col in chunk else pd.Series('', index=chunk.index)
+            chunk[col] = values.astype(str).str.strip()
+        chunk['position'] = chunk['position'].str.upper()
+        
+        defaults = {col: 0.0 for col in PROJECTION_STAT_COLUMNS}
+        defaults.update({'season': 0, 'week': 0, 'confidence': 0.5})
+        
+        for col, default in defaults.items():
+            if col not in chunk:
+                chunk[col] = default
+                continue
+            
+            numeric = pd.to_numeric(chunk[col], errors='coerce')
+            invalid = numeric.isna() & chunk[col].notna()
+            errors = errors.where(~invalid | (errors != ""), f"Invalid numeric value in column {col}")
+            chunk[col] = numeric.fillna(default)
+        
+        chunk['season'] = chunk['season'].astype(int)
+        chunk['week'] = chunk['week'].astype(int)
+        chunk['confidence'] = chunk['confidence'].clip(0.0, 1.0)
+        chunk['_error'] = errors
+        return chunk
+    
     async def _process_projection_row(
         self, 
-        row: pd.Series, 
+        row: Dict[str, Any], 
         source: str, 
         season_override: Optional[int], 
         week_override: Optional[int]
     ) -> Dict[str, Any]:
-        """Process a single projection row."""
+        """Resolve a single normalized projection row into a WeeklyProjections record."""
         
         # Extract player information
-        player_name = str(row.get('player_name', '')).strip()
-        position = str(row.get('position', '')).strip().upper()
-        team = str(row.get('team', '')).strip()
+        player_name = row['player_name']
+        position = row['position']
+        team = row['team']
         
         if not player_name or not position:
             return {
@@ -127,8 +262,8 @@ class CSVImportService:
             }
         
         # Get season and week
-        season = season_override or int(row.get('season', 0))
-        week = week_override or int(row.get('week', 0))
+        season = season_override or row['season']
+        week = week_override or row['week']
         
         if not season or not week:
             return {
@@ -146,67 +281,54 @@ class CSVImportService:
             }
         
         # Extract projection data
-        projection_data = {
-            "passing_yards": float(row.get('passing_yards', 0)),
-            "passing_tds": float(row.get('passing_tds', 0)),
-            "passing_ints": float(row.get('passing_ints', 0)),
-            "rushing_yards": float(row.get('rushing_yards', 0)),
-            "rushing_tds": float(row.get('rushing_tds', 0)),
-            "receiving_yards": float(row.get('receiving_yards', 0)),
-            "receiving_tds": float(row.get('receiving_tds', 0)),
-            "receptions": float(row.get('receptions', 0)),
-            "fumbles_lost": float(row.get('fumbles_lost', 0)),
-            "field_goals": float(row.get('field_goals', 0)),
-            "field_goal_attempts": float(row.get('field_goal_attempts', 0)),
-            "extra_points": float(row.get('extra_points', 0)),
-            "extra_point_attempts": float(row.get('extra_point_attempts', 0)),
-        }
+        projection_data = {col: float(row[col]) for col in PROJECTION_STAT_COLUMNS}
+        now = datetime.now(timezone.utc)
         
-        # Get confidence score
-        confidence = float(row.get('confidence', 0.5))
-        confidence = max(0.0, min(1.0, confidence))  # Clamp to 0-1 range
-        
-        # Check if projection already exists
-        existing = await self.db.execute(
-            select(WeeklyProjections).where(
-                and_(
-                    WeeklyProjections.gsis_id == gsis_id,
-                    WeeklyProjections.season == season,
-                    WeeklyProjections.week == week,
-                    WeeklyProjections.source == source
-                )
-            )
-        )
-        existing_proj = existing.scalar_one_or_none()
-        
-        if existing_proj:
-            # Update existing projection
-            existing_proj.proj_json = json.dumps(projection_data)
-            existing_proj.confidence = confidence
-            existing_proj.updated_at = datetime.now(timezone.utc)
-            return {
-                "success": True,
-                "created": False,
-                "gsis_id": gsis_id
+        return {
+            "success": True,
+            "record": {
+                "gsis_id": gsis_id,
+                "season": season,
+                "week": week,
+                "source": source,
+                "proj_json": json.dumps(projection_data),
+                "confidence": float(row['confidence']),
+                "created_at": now,
+                "updated_at": now
             }
-        else:
-            # Create new projection
-            new_proj = WeeklyProjections(
-                gsis_id=gsis_id,
-                season=season,
-                week=week,
-                source=source,
-                proj_json=json.dumps(projection_data),
-                confidence=confidence,
-                created_at=datetime.now(timezone.utc),
-                updated_at=datetime.now(timezone.utc)
+        }
+    
+    async def _count_existing_projections(self, keys: List[tuple]) -> int:
+        """Count how many (gsis_id, season, week, source) keys already have projections."""
+        result = await self.db.execute(
+            select(func.count()).select_from(WeeklyProjections).where(
+                tuple_(
+                    WeeklyProjections.gsis_id,
+                    WeeklyProjections.season,
+                    WeeklyProjections.week,
+                    WeeklyProjections.source
+                ).in_(keys)
             )
-            self.db.add(new_proj)
-            return {
-                "success": True,
-                "created": True,
-                "gsis_id": gsis_id
+        )
+        return result.scalar_one()
+    
+    async def _upsert_projections(self, records: List[Dict[str, Any]]) -> None:
+        """Insert projections, replacing the values of any that already exist."""
+        stmt = dialect_insert(self.db, WeeklyProjections)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                WeeklyProjections.gsis_id,
+                WeeklyProjections.season,
+                WeeklyProjections.week,
+                WeeklyProjections.source
+            ],
+            set_={
+                "proj_json": stmt.excluded.proj_json,
+                "confidence": stmt.excluded.confidence,
+                "updated_at": stmt.excluded.updated_at
             }
+        )
+        await self.db.execute(stmt, records)
     
     async def _find_player_gsis_id(self, player_name: str, position: str, team: str = None) -> Optional[str]:
         """Find player GSIS ID by name, position, and optionally team."""
@@ -265,13 +387,7 @@ class CSVImportService:
     
     async def get_csv_template(self) -> str:
         """Get CSV template for projections import."""
-        template = """player_name,position,team,season,week,passing_yards,passing_tds,passing_ints,rushing_yards,rushing_tds,receiving_yards,receiving_tds,receptions,fumbles_lost,field_goals,field_goal_attempts,extra_points,extra_point_attempts,confidence
-Josh Allen,QB,BUF,2024,1,250,2,1,25,0,0,0,0,0,0,0,0,0,0.8
-Christian McCaffrey,RB,SF,2024,1,0,0,0,85,1,45,0,4,0,0,0,0,0,0.9
-Cooper Kupp,WR,LAR,2024,1,0,0,0,0,0,95,1,7,0,0,0,0,0,0.85
-Travis Kelce,TE,KC,2024,1,0,0,0,0,0,75,1,6,0,0,0,0,0,0.9
-Justin Tucker,K,BAL,2024,1,0,0,0,0,0,0,0,0,0,2,3,3,3,0.95"""
-        return template
+        return CSV_TEMPLATE
     
     async def export_projections_csv(
         self, 
@@ -280,25 +396,31 @@ Justin Tucker,K,BAL,2024,1,0,0,0,0,0,0,0,0,0,2,3,3,3,0.95"""
         source: str = "internal"
     ) -> str:
         """Export projections to CSV format."""
+        chunks = [chunk async for chunk in self.stream_projections_csv(season, week, source)]
+        return b"".join(chunks).decode('utf-8')
+    
+    async def stream_projections_csv(
+        self, 
+        season: int, 
+        week: int, 
+        source: str = "internal"
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream projections as UTF-8 CSV, one block of rows at a time.
         
-        # Get all projections for the specified season/week/source
-        result = await self.db.execute(
-            select(WeeklyProjections, PlayerIDMapping).join(
-                PlayerIDMapping, WeeklyProjections.gsis_id == PlayerIDMapping.gsis_id
-            ).where(
-                and_(
-                    WeeklyProjections.season == season,
-                    WeeklyProjections.week == week,
-                    WeeklyProjections.source == source
-                )
-            )
-        )
-        
-        projections = result.all()
+        The CSV writer encodes straight into a byte buffer, so each block is
+        yielded as bytes without building and re-encoding an intermediate string.
+        The header is sent with the first block.
+        """
+        output = io.BytesIO()
+        wrapper = io.TextIOWrapper(output, encoding='utf-8', newline='', write_through=True)
+        writer = csv.writer(wrapper)
         
-        # Create CSV content
-        output = io.StringIO()
-        writer = csv.writer(output)
+        def drain() -> bytes:
+            content = output.getvalue()
+            output.seek(0)
+            output.truncate()
+            return content
         
         # Write header
         writer.writerow([
@@ -312,82 +434,96 @@ Justin Tucker,K,BAL,2024,1,0,0,0,0,0,0,0,0,0,2,3,3,3,0.95"""
             'confidence'
         ])
         
+        # Stream projections for the specified season/week/source
+        result = await self.db.stream(
+            select(WeeklyProjections, PlayerIDMapping).join(
+                PlayerIDMapping, WeeklyProjections.gsis_id == PlayerIDMapping.gsis_id
+            ).where(
+                and_(
+                    WeeklyProjections.season == season,
+                    WeeklyProjections.week == week,
+                    WeeklyProjections.source == source
+                )
+            )
+        )
+        
         # Write data rows
-        for proj, mapping in projections:
-            proj_data = proj.projections
+        async for rows in result.partitions(CSV_CHUNK_SIZE):
+            for proj, mapping in rows:
+                proj_data = proj.projections
+                
+                writer.writerow([
+                    mapping.full_name,
+                    mapping.position,
+                    mapping.team or '',
+                    proj.season,
+                    proj.week,
+                    proj_data.get('passing_yards', 0),
+                    proj_data.get('passing_tds', 0),
+                    proj_data.get('passing_ints', 0),
+                    proj_data.get('rushing_yards', 0),
+                    proj_data.get('rushing_tds', 0),
+                    proj_data.get('receiving_yards', 0),
+                    proj_data.get('receiving_tds', 0),
+                    proj_data.get('receptions', 0),
+                    proj_data.get('fumbles_lost', 0),
+                    proj_data.get('field_goals', 0),
+                    proj_data.get('field_goal_attempts', 0),
+                    proj_data.get('extra_points', 0),
+                    proj_data.get('extra_point_attempts', 0),
+                    proj.confidence or 0.5
+                ])
             
-            writer.writerow([
-                mapping.full_name,
-                mapping.position,
-                mapping.team or '',
-                proj.season,
-                proj.week,
-                proj_data.get('passing_yards', 0),
-                proj_data.get('passing_tds', 0),
-                proj_data.get('passing_ints', 0),
-                proj_data.get('rushing_yards', 0),
-                proj_data.get('rushing_tds', 0),
-                proj_data.get('receiving_yards', 0),
-                proj_data.get('receiving_tds', 0),
-                proj_data.get('receptions', 0),
-                proj_data.get('fumbles_lost', 0),
-                proj_data.get('field_goals', 0),
-                proj_data.get('field_goal_attempts', 0),
-                proj_data.get('extra_points', 0),
-                proj_data.get('extra_point_attempts', 0),
-                proj.confidence or 0.5
-            ])
+            yield drain()
         
-        return output.getvalue()
+        # Header only, when there are no projections
+        remaining = drain()
+        if remaining:
+            yield remaining
     
-    async def validate_csv_format(self, csv_content: str) -> Dict[str, Any]:
-        """Validate CSV format before import."""
+    async def validate_csv_format(self, csv_source: Union[str, IO]) -> Dict[str, Any]:
+        """
+        Validate CSV format before import.
+        
+        Only the header and the rows within the first CSV_SAMPLE_BYTES are
+        parsed and checked; the rest of the file is just scanned for line
+        breaks to count rows.
+        """
         try:
-            df = pd.read_csv(io.StringIO(csv_content))
+            sample, row_count = await asyncio.to_thread(_read_csv_sample, csv_source)
+            df = pd.read_csv(io.BytesIO(sample), dtype=CSV_STRING_DTYPES)
+            columns = list(df.columns)
+            
+            valid_positions = ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']
+            has_empty_names = 'player_name' in df.columns and df['player_name'].isna().any()
+            invalid_positions: List[str] = []
+            if 'position' in df.columns:
+                invalid_positions = list(df[~df['position'].isin(valid_positions)]['position'].unique())
             
             # Check required columns
             required_columns = ['player_name', 'position']
-            missing_columns = [col for col in required_columns if col not in df.columns]
+            missing_columns = [col for col in required_columns if col not in columns]
             
             # Check data types and values
             validation_errors = []
             
-            if 'player_name' in df.columns:
-                if df['player_name'].isna().any():
-                    validation_errors.append("player_name column contains empty values")
-            
-            if 'position' in df.columns:
-                valid_positions = ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']
-                invalid_positions = df[~df['position'].isin(valid_positions)]['position'].unique()
-                if len(invalid_positions) > 0:
-                    validation_errors.append(f"Invalid positions found: {list(invalid_positions)}")
-            
-            # Check numeric columns
-            numeric_columns = [
-                'passing_yards', 'passing_tds', 'passing_ints',
-                'rushing_yards', 'rushing_tds',
-                'receiving_yards', 'receiving_tds', 'receptions',
-                'fumbles_lost', 'field_goals', 'field_goal_attempts',
-                'extra_points', 'extra_point_attempts', 'confidence'
-            ]
+            if has_empty_names:
+                validation_errors.append("player_name column contains empty values")
             
-            for col in numeric_columns:
-                if col in df.columns:
-                    try:
-                        pd.to_numeric(df[col], errors='coerce')
-                    except:
-                        validation_errors.append(f"Column {col} contains non-numeric values")
+            if invalid_positions:
+                validation_errors.append(f"Invalid positions found: {invalid_positions}")
             
             return {
                 "valid": len(validation_errors) == 0 and len(missing_columns) == 0,
                 "missing_columns": missing_columns,
                 "validation_errors": validation_errors,
-                "row_count": len(df),
-                "columns": list(df.columns)
+                "row_count": row_count,
+                "sampled_rows": len(df),
+                "columns": columns
             }
             
         except Exception as e:
             return {
                 "valid": False,
-                "error": f"Failed to parse CSV: {str(e)}"
+                "error": f"Failed to parse CSV: {e}"
             }
@@ -2,16 +2,30 @@
 Data synchronization service for persisting Yahoo API data and managing caching.
 """
 
+import asyncio
 import json
+import orjson
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Any, List, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.orm import selectinload
 
+from app.core.config import settings
+from app.core.database import dialect_insert
+from app.core.redis_client import get_redis
+from app.services.scoring_engine import invalidate_league_scoring
 from app.models.fantasy import League, Team, Player, LeaguePlayer, Roster, DraftPick
+from app.models.user import YahooToken
 from app.models.nfl_data import WeeklyStats, WeeklyProjections, Injuries, DepthCharts, PlayerIDMapping
-from app.services.yahoo_api import YahooAPIClient
+from app.services.yahoo_api import YahooAPIClient, parse_team_standings
+
+
+# Redis key prefix for cached league summaries
+LEAGUE_CACHE_PREFIX = "league:"
+
+# Rows per upsert statement, well under SQLite's bound parameter limit
+UPSERT_BATCH_SIZE = 500
 
 
 class DataSyncService:
@@ -20,6 +34,52 @@ class DataSyncService:
     def __init__(self, db: AsyncSession):
         self.db = db
     
+    async def _upsert(self, model: Any, rows: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Insert or update rows by primary key with one statement per batch.
+        
+        Identical duplicate rows are merged. Rows that share a key but differ
+        raise rather than one silently replacing the other.
+        
+        Returns:
+            Models for the upserted rows, in the order their keys first appear
+            
+        Raises:
+            ValueError: If two different rows have the same primary key
+        """
+        if not rows:
+            return []
+        
+        key_columns = [column.name for column in model.__table__.primary_key]
+        unique_rows = {}
+        for row in rows:
+            key = tuple(row[name] for name in key_columns)
+            if unique_rows.setdefault(key, row) != row:
+                raise ValueError(
+                    f"Conflicting {model.__tablename__} rows for key "
+                    f"{dict(zip(key_columns, key))}: {unique_rows[key]} and {row}"
+                )
+        batch = list(unique_rows.values())
+        
+        upserted = {}
+        for start in range(0, len(batch), UPSERT_BATCH_SIZE):
+            stmt = dialect_insert(self.db, model).values(batch[start:start + UPSERT_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=key_columns,
+                set_={
+                    **{name: stmt.excluded[name] for name in rows[0] if name not in key_columns},
+                    "updated_at": func.now()
+                }
+            )
+            result = await self.db.scalars(
+                stmt.returning(model),
+                execution_options={"populate_existing": True}
+            )
+            for obj in result.all():
+                upserted[tuple(getattr(obj, name) for name in key_columns)] = obj
+        
+        return [upserted[key] for key in unique_rows]
+    
     async def sync_league_data(self, league_data: Dict[str, Any]) -> League:
         """
         Sync league data from Yahoo API.
@@ -69,6 +129,7 @@ class DataSyncService:
         
         await self.db.commit()
         await self.db.refresh(league)
+        await self.invalidate_league_cache(league_key)
         return league
     
     async def sync_teams_data(self, league_key: str, teams_data: List[Dict[str, Any]]) -> List[Team]:
@@ -82,46 +143,31 @@ class DataSyncService:
         Returns:
             List of updated Team models
         """
-        teams = []
+        team_rows = []
         
         for team_data in teams_data:
             team_key = team_data.get("team_key")
             if not team_key:
                 continue
             
-            # Check if team exists
-            stmt = select(Team).where(Team.team_key == team_key)
-            result = await self.db.execute(stmt)
-            existing_team = result.scalar_one_or_none()
-            
             # Prepare team data
-            team_dict = {
+            rank, wins, losses, ties = parse_team_standings(team_data)
+            managers = team_data.get("managers")
+            team_rows.append({
                 "team_key": team_key,
                 "league_key": league_key,
                 "name": team_data.get("name", ""),
-                "manager": team_data.get("managers", [{}])[0].get("nickname") if team_data.get("managers") else None,
+                "manager": managers[0].get("nickname") if managers else None,
                 "division_id": team_data.get("division_id"),
-                "rank": team_data.get("team_standings", {}).get("rank"),
-                "wins": team_data.get("team_standings", {}).get("outcome_totals", {}).get("wins", 0),
-                "losses": team_data.get("team_standings", {}).get("outcome_totals", {}).get("losses", 0),
-                "ties": team_data.get("team_standings", {}).get("outcome_totals", {}).get("ties", 0)
-            }
-            
-            if existing_team:
-                # Update existing team
-                for key, value in team_dict.items():
-                    setattr(existing_team, key, value)
-                team = existing_team
-            else:
-                # Create new team
-                team = Team(**team_dict)
-                self.db.add(team)
-            
-            teams.append(team)
+                "rank": rank,
+                "wins": wins,
+                "losses": losses,
+                "ties": ties
+            })
         
+        teams = await self._upsert(Team, team_rows)
         await self.db.commit()
-        for team in teams:
-            await self.db.refresh(team)
+        await self.invalidate_league_cache(league_key)
         
         return teams
     
@@ -136,20 +182,15 @@ class DataSyncService:
         Returns:
             List of updated Player models
         """
-        players = []
+        player_rows = []
         
         for player_data in players_data:
             player_id_yahoo = player_data.get("player_id")
             if not player_id_yahoo:
                 continue
             
-            # Check if player exists
-            stmt = select(Player).where(Player.player_id_yahoo == player_id_yahoo)
-            result = await self.db.execute(stmt)
-            existing_player = result.scalar_one_or_none()
-            
             # Prepare player data
-            player_dict = {
+            player_rows.append({
                 "player_id_yahoo": player_id_yahoo,
                 "full_name": player_data.get("name", {}).get("full", ""),
                 "first_name": player_data.get("name", {}).get("first", ""),
@@ -158,23 +199,10 @@ class DataSyncService:
                 "team": player_data.get("editorial_team_abbr"),
                 "bye_week": player_data.get("bye_weeks", {}).get("week"),
                 "is_active": True
-            }
-            
-            if existing_player:
-                # Update existing player
-                for key, value in player_dict.items():
-                    setattr(existing_player, key, value)
-                player = existing_player
-            else:
-                # Create new player
-                player = Player(**player_dict)
-                self.db.add(player)
-            
-            players.append(player)
+            })
         
+        players = await self._upsert(Player, player_rows)
         await self.db.commit()
-        for player in players:
-            await self.db.refresh(player)
         
         return players
     
@@ -189,45 +217,25 @@ class DataSyncService:
         Returns:
             List of updated LeaguePlayer models
         """
-        league_players = []
+        league_player_rows = []
         
         for player_data in players_data:
             player_id_yahoo = player_data.get("player_id")
             if not player_id_yahoo:
                 continue
             
-            # Check if league player exists
-            stmt = select(LeaguePlayer).where(
-                LeaguePlayer.league_key == league_key,
-                LeaguePlayer.player_id_yahoo == player_id_yahoo
-            )
-            result = await self.db.execute(stmt)
-            existing_league_player = result.scalar_one_or_none()
-            
             # Prepare league player data
-            league_player_dict = {
+            league_player_rows.append({
                 "league_key": league_key,
                 "player_id_yahoo": player_id_yahoo,
                 "status": player_data.get("status", "FA"),
                 "percent_rostered": player_data.get("percent_owned"),
                 "owner_team_key": player_data.get("selected_position", {}).get("team_key")
-            }
-            
-            if existing_league_player:
-                # Update existing league player
-                for key, value in league_player_dict.items():
-                    setattr(existing_league_player, key, value)
-                league_player = existing_league_player
-            else:
-                # Create new league player
-                league_player = LeaguePlayer(**league_player_dict)
-                self.db.add(league_player)
-            
-            league_players.append(league_player)
+            })
         
+        league_players = await self._upsert(LeaguePlayer, league_player_rows)
         await self.db.commit()
-        for league_player in league_players:
-            await self.db.refresh(league_player)
+        await self.invalidate_league_cache(league_key)
         
         return league_players
     
@@ -243,15 +251,12 @@ class DataSyncService:
         Returns:
             List of updated Roster models
         """
-        rosters = []
+        roster_rows = []
         
         # Clear existing roster for this team/week
-        stmt = select(Roster).where(Roster.team_key == team_key, Roster.week == week)
-        result = await self.db.execute(stmt)
-        existing_rosters = result.scalars().all()
-        
-        for existing_roster in existing_rosters:
-            await self.db.delete(existing_roster)
+        await self.db.execute(
+            delete(Roster).where(Roster.team_key == team_key, Roster.week == week)
+        )
         
         # Add new roster entries
         if "0" in roster_data and "players" in roster_data["0"]:
@@ -259,21 +264,16 @@ class DataSyncService:
                 if isinstance(player_data, dict) and "player" in player_data:
                     player = player_data["player"]
                     
-                    roster_dict = {
+                    roster_rows.append({
                         "team_key": team_key,
                         "week": week,
                         "slot": player_data.get("selected_position", {}).get("position", "BN"),
                         "player_id_yahoo": player.get("player_id"),
                         "is_starting": player_data.get("selected_position", {}).get("position") != "BN"
-                    }
-                    
-                    roster = Roster(**roster_dict)
-                    self.db.add(roster)
-                    rosters.append(roster)
+                    })
         
+        rosters = await self._upsert(Roster, roster_rows)
         await self.db.commit()
-        for roster in rosters:
-            await self.db.refresh(roster)
         
         return rosters
     
@@ -288,19 +288,12 @@ class DataSyncService:
         Returns:
             List of updated DraftPick models
         """
-        draft_picks = []
-        
         # Clear existing draft picks for this league
-        stmt = select(DraftPick).where(DraftPick.league_key == league_key)
-        result = await self.db.execute(stmt)
-        existing_picks = result.scalars().all()
-        
-        for existing_pick in existing_picks:
-            await self.db.delete(existing_pick)
+        await self.db.execute(delete(DraftPick).where(DraftPick.league_key == league_key))
         
         # Add new draft picks
-        for pick_data in draft_data:
-            draft_pick_dict = {
+        draft_pick_rows = [
+            {
                 "league_key": league_key,
                 "round": pick_data.get("round", 0),
                 "pick": pick_data.get("pick", 0),
@@ -308,17 +301,100 @@ class DataSyncService:
                 "player_id_yahoo": pick_data.get("player_id"),
                 "cost": pick_data.get("cost")  # For auction drafts
             }
-            
-            draft_pick = DraftPick(**draft_pick_dict)
-            self.db.add(draft_pick)
-            draft_picks.append(draft_pick)
+            for pick_data in draft_data
+        ]
         
+        draft_picks = await self._upsert(DraftPick, draft_pick_rows)
         await self.db.commit()
-        for draft_pick in draft_picks:
-            await self.db.refresh(draft_pick)
         
         return draft_picks
     
+    async def sync_league_from_yahoo(
+        self,
+        client: YahooAPIClient,
+        league_key: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Pull a league from the Yahoo API and persist it, reporting progress.
+        
+        Yields a progress event after each step with the stage name and the
+        number of items done out of the stage total. The final event has
+        stage "complete" and the totals synced. Closing the generator stops
+        the sync and cancels any Yahoo API calls still in flight.
+        
+        Args:
+            client: Authenticated Yahoo API client
+            league_key: League key
+            
+        Yields:
+            Progress event dictionaries
+        """
+        # Fetch everything that only needs the league key concurrently,
+        # bounded so a sync never has more than a few Yahoo requests in
+        # flight. Writes stay sequential because the session isn't safe for
+        # concurrent use.
+        semaphore = asyncio.Semaphore(settings.yahoo_api_max_concurrency)
+        
+        async def fetch(call, *args):
+            async with semaphore:
+                return await call(*args)
+        
+        async def fetch_roster(team_key: str, week: int):
+            return team_key, await fetch(client.get_team_roster, team_key, week)
+        
+        league_task = asyncio.create_task(fetch(client.get_league_details, league_key))
+        teams_task = asyncio.create_task(fetch(client.get_league_teams, league_key))
+        players_task = asyncio.create_task(fetch(client.get_league_players, league_key))
+        draft_task = asyncio.create_task(fetch(client.get_draft_results, league_key))
+        roster_tasks = []
+        
+        try:
+            league_data = await league_task
+            await self.sync_league_data(league_data)
+            yield {"stage": "league", "done": 1, "total": 1}
+            
+            teams = await self.sync_teams_data(league_key, await teams_task)
+            yield {"stage": "teams", "done": len(teams), "total": len(teams)}
+            
+            week = int(league_data.get("current_week") or 1)
+            roster_tasks = [asyncio.create_task(fetch_roster(team.team_key, week)) for team in teams]
+            
+            for done, next_roster in enumerate(asyncio.as_completed(roster_tasks), start=1):
+                team_key, roster_data = await next_roster
+                await self.sync_roster_data(team_key, week, roster_data)
+                yield {"stage": "rosters", "done": done, "total": len(teams)}
+            
+            players_data = await players_task
+            await self.sync_players_data(league_key, players_data)
+            await self.sync_league_players_data(league_key, players_data)
+            yield {"stage": "players", "done": len(players_data), "total": len(players_data)}
+            
+            draft_data = await draft_task
+            draft_picks = await self.sync_draft_data(league_key, draft_data)
+            yield {"stage": "draft", "done": len(draft_picks), "total": len(draft_picks)}
+        finally:
+            for task in [league_task, teams_task, players_task, draft_task, *roster_tasks]:
+                task.cancel()
+        
+        yield {
+            "stage": "complete",
+            "league_key": league_key,
+            "teams_synced": len(teams),
+            "players_synced": len(players_data),
+            "draft_picks_synced": len(draft_picks)
+        }
+    
+    async def get_yahoo_token(self, user_id: str) -> Optional[YahooToken]:
+        """Get the most recently stored Yahoo OAuth token for a user."""
+        stmt = (
+            select(YahooToken)
+            .where(YahooToken.user_id == user_id)
+            .order_by(YahooToken.updated_at.desc())
+            .limit(1)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+    
     async def get_cached_league_data(self, league_key: str, max_age_hours: int = 24) -> Optional[Dict[str, Any]]:
         """
         Get cached league data if it's recent enough.
@@ -338,8 +414,7 @@ class DataSyncService:
             return None
         
         # Check if data is recent enough
-        max_age = timedelta(hours=max_age_hours)
-        if datetime.now(timezone.utc) - league.updated_at > max_age:
+        if not self._is_recent(league.updated_at, max_age_hours):
             return None
         
         # Return cached data
@@ -349,6 +424,65 @@ class DataSyncService:
             "players": await self.get_league_players(league_key)
         }
     
+    async def get_league_cache_summary(self, league_key: str, max_age_hours: int = 24) -> Optional[Dict[str, Any]]:
+        """
+        Get a compact summary of cached league data if it's recent enough.
+        
+        Summaries are served from Redis when configured, falling back to the
+        database on a miss and repopulating Redis from the result.
+        
+        Args:
+            league_key: League key
+            max_age_hours: Maximum age of cached data in hours
+            
+        Returns:
+            League summary with team and player counts, or None if too old
+        """
+        redis = get_redis()
+        cache_key = f"{LEAGUE_CACHE_PREFIX}{league_key}"
+        
+        if redis is not None:
+            cached = await redis.get(cache_key)
+            if cached is not None:
+                summary = orjson.loads(cached)
+                updated_at = datetime.fromisoformat(summary["league"]["updated_at"])
+                if not self._is_recent(updated_at, max_age_hours):
+                    return None
+                return summary
+        
+        cached_data = await self.get_cached_league_data(league_key, max_age_hours)
+        if not cached_data:
+            return None
+        
+        league = cached_data["league"]
+        summary = {
+            "league": {
+                "league_key": league.league_key,
+                "name": league.name,
+                "season": league.season,
+                "updated_at": league.updated_at
+            },
+            "teams_count": len(cached_data["teams"]),
+            "players_count": len(cached_data["players"])
+        }
+        
+        if redis is not None:
+            await redis.set(cache_key, orjson.dumps(summary), ex=settings.league_cache_ttl_seconds)
+        
+        return summary
+    
+    async def invalidate_league_cache(self, league_key: str) -> None:
+        """Drop the cached summary and scoring rules for a league after its data changes."""
+        invalidate_league_scoring(league_key)
+        redis = get_redis()
+        if redis is not None:
+            await redis.delete(f"{LEAGUE_CACHE_PREFIX}{league_key}")
+    
+    @staticmethod
+    def _is_recent(updated_at: datetime, max_age_hours: int) -> bool:
+        """Check whether a timestamp is within the maximum cache age."""
+        return datetime.now(timezone.utc) - updated_at <= timedelta(hours=max_age_hours)
+    
     async def get_league_teams(self, league_key: str) -> List[Team]:
         """Get all teams for a league."""
         stmt = select(Team).where(Team.league_key == league_key)
@@ -4,23 +4,171 @@ NFL data ingestion service using nfl_data_py.
 
 import asyncio
 import json
+import uuid
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, func, tuple_
 from sqlalchemy.orm import selectinload
+import orjson
 import pandas as pd
 
-from app.models.nfl_data import WeeklyStats, WeeklyProjections, Injuries, DepthCharts, PlayerIDMapping
+from app.core.cache import JSON_OPTIONS
+from app.core.config import settings
+from app.core.database import dialect_insert
+from app.core.redis_client import get_redis
+from app.models.nfl_data import WeeklyStats, WeeklyProjections, Injuries, DepthCharts, PlayerIDMapping, ImportJob
 from app.models.fantasy import Player
 
 
+NFL_CACHE_PREFIX = "nfl:"
+
+# Rows written per upsert statement during imports
+UPSERT_BATCH_SIZE = 500
+
+# Snap count columns merged into each player's weekly stats, with their defaults
+SNAP_COUNT_DEFAULTS = {
+    'snap_counts': 0,
+    'snap_pct': 0.0,
+    'offensive_snaps': 0,
+    'defensive_snaps': 0,
+    'special_teams_snaps': 0,
+}
+
+
+def _weekly_stats_rows(weekly_data: pd.DataFrame, season: int) -> List[Dict[str, Any]]:
+    """Build WeeklyStats rows from nfl_data_py weekly data, skipping rows without a player ID."""
+    rows = []
+    for _, row in weekly_data.iterrows():
+        gsis_id = row.get('player_id')
+        if not gsis_id:
+            continue
+        
+        # Convert row to stats dictionary
+        stats_dict = row.to_dict()
+        # Remove non-stat fields
+        stats_dict.pop('player_id', None)
+        stats_dict.pop('season', None)
+        stats_dict.pop('week', None)
+        stats_dict.pop('team', None)
+        stats_dict.pop('opponent', None)
+        stats_dict.pop('game_date', None)
+        
+        rows.append({
+            "gsis_id": gsis_id,
+            "season": season,
+            "week": row.get('week', 1),
+            "stat_json": orjson.dumps(stats_dict, option=JSON_OPTIONS).decode(),
+            "team": row.get('team', ''),
+            "opponent": row.get('opponent'),
+            "game_date": row.get('game_date')
+        })
+    return rows
+
+
+def _injury_rows(injury_data: pd.DataFrame, season: int) -> List[Dict[str, Any]]:
+    """Build Injuries rows from nfl_data_py injury data, skipping rows without a player ID."""
+    rows = []
+    for _, row in injury_data.iterrows():
+        gsis_id = row.get('player_id')
+        if not gsis_id:
+            continue
+        
+        rows.append({
+            "gsis_id": gsis_id,
+            "season": season,
+            "week": row.get('week', 1),
+            "status": row.get('status', ''),
+            "report": row.get('report'),
+            "practice_status": row.get('practice_status'),
+            "team": row.get('team', ''),
+            "position": row.get('position', '')
+        })
+    return rows
+
+
+def _depth_chart_rows(depth_data: pd.DataFrame, season: int) -> List[Dict[str, Any]]:
+    """Build DepthCharts rows from nfl_data_py depth charts, skipping rows without a team or position."""
+    rows = []
+    for _, row in depth_data.iterrows():
+        team = row.get('team')
+        position = row.get('position')
+        
+        if not all([team, position]):
+            continue
+        
+        rows.append({
+            "team": team,
+            "week": row.get('week', 1),
+            "season": season,
+            "position": position,
+            "gsis_id": row.get('player_id', ''),
+            "depth_order": row.get('depth_order', 1),
+            "role": row.get('role')
+        })
+    return rows
+
+
+def _snap_count_rows(snap_data: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Extract player ID, week and snap counts from nfl_data_py snap counts, skipping rows without a player ID."""
+    rows = []
+    for _, row in snap_data.iterrows():
+        gsis_id = row.get('player_id')
+        if not gsis_id:
+            continue
+        
+        rows.append({
+            "gsis_id": gsis_id,
+            "week": row.get('week', 1),
+            "snaps": {column: row.get(column, default) for column, default in SNAP_COUNT_DEFAULTS.items()}
+        })
+    return rows
+
+
 class NFLDataIngestionService:
     """Service for ingesting NFL data from nfl_data_py."""
     
     def __init__(self, db: AsyncSession):
         self.db = db
     
+    async def _upsert(self, model: Any, rows: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """
+        Insert or update rows by primary key, a batch at a time.
+        
+        Rows with the same key are collapsed, keeping the last one.
+        
+        Returns:
+            Number of rows created and number of existing rows updated
+        """
+        if not rows:
+            return 0, 0
+        
+        key_columns = [column.name for column in model.__table__.primary_key]
+        unique_rows = {tuple(row[name] for name in key_columns): row for row in rows}
+        keys = list(unique_rows)
+        batch = list(unique_rows.values())
+        
+        stmt = dialect_insert(self.db, model)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={
+                **{name: stmt.excluded[name] for name in rows[0] if name not in key_columns},
+                "updated_at": func.now()
+            }
+        )
+        key_tuple = tuple_(*(model.__table__.c[name] for name in key_columns))
+        
+        updated = 0
+        for start in range(0, len(batch), UPSERT_BATCH_SIZE):
+            updated += await self.db.scalar(
+                select(func.count()).select_from(model).where(
+                    key_tuple.in_(keys[start:start + UPSERT_BATCH_SIZE])
+                )
+            )
+            await self.db.execute(stmt, batch[start:start + UPSERT_BATCH_SIZE])
+        
+        return len(batch) - updated, updated
+    
     async def import_weekly_stats(self, season: int, week: Optional[int] = None) -> Dict[str, Any]:
         """
         Import weekly statistics from nfl_data_py.
@@ -35,75 +183,29 @@ class NFLDataIngestionService:
         try:
             import nfl_data_py as nfl
             
-            # Import weekly data
+            # Download in a worker thread so concurrent imports and requests aren't blocked
             if week:
-                weekly_data = nfl.import_weekly_data([season], [week])
+                weekly_data = await asyncio.to_thread(nfl.import_weekly_data, [season], [week])
             else:
-                weekly_data = nfl.import_weekly_data([season])
+                weekly_data = await asyncio.to_thread(nfl.import_weekly_data, [season])
             
             if weekly_data.empty:
                 return {
                     "success": False,
+                    "kind": "error",
                     "error": f"No weekly data found for season {season}" + (f", week {week}" if week else "")
                 }
             
             # Process and store data
-            stats_created = 0
-            stats_updated = 0
-            
-            for _, row in weekly_data.iterrows():
-                gsis_id = row.get('player_id')
-                if not gsis_id:
-                    continue
-                
-                # Convert row to stats dictionary
-                stats_dict = row.to_dict()
-                # Remove non-stat fields
-                stats_dict.pop('player_id', None)
-                stats_dict.pop('season', None)
-                stats_dict.pop('week', None)
-                stats_dict.pop('team', None)
-                stats_dict.pop('opponent', None)
-                stats_dict.pop('game_date', None)
-                
-                # Check if record exists
-                existing = await self.db.execute(
-                    select(WeeklyStats).where(
-                        WeeklyStats.gsis_id == gsis_id,
-                        WeeklyStats.season == season,
-                        WeeklyStats.week == row.get('week', 1)
-                    )
-                )
-                existing_stats = existing.scalar_one_or_none()
-                
-                if existing_stats:
-                    # Update existing record
-                    existing_stats.stat_json = json.dumps(stats_dict)
-                    existing_stats.team = row.get('team', '')
-                    existing_stats.opponent = row.get('opponent')
-                    existing_stats.game_date = row.get('game_date')
-                    existing_stats.updated_at = datetime.now(timezone.utc)
-                    stats_updated += 1
-                else:
-                    # Create new record
-                    new_stats = WeeklyStats(
-                        gsis_id=gsis_id,
-                        season=season,
-                        week=row.get('week', 1),
-                        stat_json=json.dumps(stats_dict),
-                        team=row.get('team', ''),
-                        opponent=row.get('opponent'),
-                        game_date=row.get('game_date'),
-                        created_at=datetime.now(timezone.utc),
-                        updated_at=datetime.now(timezone.utc)
-                    )
-                    self.db.add(new_stats)
-                    stats_created += 1
+            rows = await asyncio.to_thread(_weekly_stats_rows, weekly_data, season)
             
+            stats_created, stats_updated = await self._upsert(WeeklyStats, rows)
             await self.db.commit()
+            await self.invalidate_season_cache(season)
             
             return {
                 "success": True,
+                "kind": "stats",
                 "stats_created": stats_created,
                 "stats_updated": stats_updated,
                 "total_processed": len(weekly_data)
@@ -112,13 +214,15 @@ class NFLDataIngestionService:
         except ImportError:
             return {
                 "success": False,
+                "kind": "error",
                 "error": "nfl_data_py not installed. Install with: pip install nfl_data_py"
             }
         except Exception as e:
             await self.db.rollback()
             return {
                 "success": False,
-                "error": f"Failed to import weekly stats: {str(e)}"
+                "kind": "error",
+                "error": f"Failed to import weekly stats: {e}"
             }
     
     async def import_injuries(self, season: int, week: Optional[int] = None) -> Dict[str, Any]:
@@ -136,11 +240,12 @@ class NFLDataIngestionService:
             import nfl_data_py as nfl
             
             # Import injury data
-            injury_data = nfl.import_injuries([season])
+            injury_data = await asyncio.to_thread(nfl.import_injuries, [season])
             
             if injury_data.empty:
                 return {
                     "success": False,
+                    "kind": "error",
                     "error": f"No injury data found for season {season}"
                 }
             
@@ -149,54 +254,15 @@ class NFLDataIngestionService:
                 injury_data = injury_data[injury_data['week'] == week]
             
             # Process and store data
-            injuries_created = 0
-            injuries_updated = 0
-            
-            for _, row in injury_data.iterrows():
-                gsis_id = row.get('player_id')
-                if not gsis_id:
-                    continue
-                
-                # Check if record exists
-                existing = await self.db.execute(
-                    select(Injuries).where(
-                        Injuries.gsis_id == gsis_id,
-                        Injuries.season == season,
-                        Injuries.week == row.get('week', 1)
-                    )
-                )
-                existing_injury = existing.scalar_one_or_none()
-                
-                if existing_injury:
-                    # Update existing record
-                    existing_injury.status = row.get('status', '')
-                    existing_injury.report = row.get('report')
-                    existing_injury.practice_status = row.get('practice_status')
-                    existing_injury.team = row.get('team', '')
-                    existing_injury.position = row.get('position', '')
-                    existing_injury.updated_at = datetime.now(timezone.utc)
-                    injuries_updated += 1
-                else:
-                    # Create new record
-                    new_injury = Injuries(
-                        gsis_id=gsis_id,
-                        season=season,
-                        week=row.get('week', 1),
-                        status=row.get('status', ''),
-                        report=row.get('report'),
-                        practice_status=row.get('practice_status'),
-                        team=row.get('team', ''),
-                        position=row.get('position', ''),
-                        created_at=datetime.now(timezone.utc),
-                        updated_at=datetime.now(timezone.utc)
-                    )
-                    self.db.add(new_injury)
-                    injuries_created += 1
+            rows = await asyncio.to_thread(_injury_rows, injury_data, season)
             
+            injuries_created, injuries_updated = await self._upsert(Injuries, rows)
             await self.db.commit()
+            await self.invalidate_season_cache(season)
             
             return {
                 "success": True,
+                "kind": "injury",
                 "injuries_created": injuries_created,
                 "injuries_updated": injuries_updated,
                 "total_processed": len(injury_data)
@@ -205,13 +271,15 @@ class NFLDataIngestionService:
         except ImportError:
             return {
                 "success": False,
+                "kind": "error",
                 "error": "nfl_data_py not installed. Install with: pip install nfl_data_py"
             }
         except Exception as e:
             await self.db.rollback()
             return {
                 "success": False,
-                "error": f"Failed to import injuries: {str(e)}"
+                "kind": "error",
+                "error": f"Failed to import injuries: {e}"
             }
     
     async def import_depth_charts(self, season: int, week: Optional[int] = None) -> Dict[str, Any]:
@@ -229,11 +297,12 @@ class NFLDataIngestionService:
             import nfl_data_py as nfl
             
             # Import depth chart data
-            depth_data = nfl.import_depth_charts([season])
+            depth_data = await asyncio.to_thread(nfl.import_depth_charts, [season])
             
             if depth_data.empty:
                 return {
                     "success": False,
+                    "kind": "error",
                     "error": f"No depth chart data found for season {season}"
                 }
             
@@ -242,55 +311,15 @@ class NFLDataIngestionService:
                 depth_data = depth_data[depth_data['week'] == week]
             
             # Process and store data
-            charts_created = 0
-            charts_updated = 0
-            
-            for _, row in depth_data.iterrows():
-                team = row.get('team')
-                position = row.get('position')
-                week_num = row.get('week', 1)
-                
-                if not all([team, position]):
-                    continue
-                
-                # Check if record exists
-                existing = await self.db.execute(
-                    select(DepthCharts).where(
-                        DepthCharts.team == team,
-                        DepthCharts.week == week_num,
-                        DepthCharts.season == season,
-                        DepthCharts.position == position
-                    )
-                )
-                existing_chart = existing.scalar_one_or_none()
-                
-                if existing_chart:
-                    # Update existing record
-                    existing_chart.gsis_id = row.get('player_id', '')
-                    existing_chart.depth_order = row.get('depth_order', 1)
-                    existing_chart.role = row.get('role')
-                    existing_chart.updated_at = datetime.now(timezone.utc)
-                    charts_updated += 1
-                else:
-                    # Create new record
-                    new_chart = DepthCharts(
-                        team=team,
-                        week=week_num,
-                        season=season,
-                        position=position,
-                        gsis_id=row.get('player_id', ''),
-                        depth_order=row.get('depth_order', 1),
-                        role=row.get('role'),
-                        created_at=datetime.now(timezone.utc),
-                        updated_at=datetime.now(timezone.utc)
-                    )
-                    self.db.add(new_chart)
-                    charts_created += 1
+            rows = await asyncio.to_thread(_depth_chart_rows, depth_data, season)
             
+            charts_created, charts_updated = await self._upsert(DepthCharts, rows)
             await self.db.commit()
+            await self.invalidate_season_cache(season)
             
             return {
                 "success": True,
+                "kind": "depth",
                 "charts_created": charts_created,
                 "charts_updated": charts_updated,
                 "total_processed": len(depth_data)
@@ -299,13 +328,15 @@ class NFLDataIngestionService:
         except ImportError:
             return {
                 "success": False,
+                "kind": "error",
                 "error": "nfl_data_py not installed. Install with: pip install nfl_data_py"
             }
         except Exception as e:
             await self.db.rollback()
             return {
                 "success": False,
-                "error": f"Failed to import depth charts: {str(e)}"
+                "kind": "error",
+                "error": f"Failed to import depth charts: {e}"
             }
     
     async def import_snap_counts(self, season: int, week: Optional[int] = None) -> Dict[str, Any]:
@@ -323,11 +354,12 @@ class NFLDataIngestionService:
             import nfl_data_py as nfl
             
             # Import snap count data
-            snap_data = nfl.import_snap_counts([season])
+            snap_data = await asyncio.to_thread(nfl.import_snap_counts, [season])
             
             if snap_data.empty:
                 return {
                     "success": False,
+                    "kind": "error",
                     "error": f"No snap count data found for season {season}"
                 }
             
@@ -339,39 +371,31 @@ class NFLDataIngestionService:
             # as additional statistics. In the future, we might create a separate table.
             stats_updated = 0
             
-            for _, row in snap_data.iterrows():
-                gsis_id = row.get('player_id')
-                if not gsis_id:
-                    continue
-                
+            for row in await asyncio.to_thread(_snap_count_rows, snap_data):
                 # Find existing weekly stats record
                 existing = await self.db.execute(
                     select(WeeklyStats).where(
-                        WeeklyStats.gsis_id == gsis_id,
+                        WeeklyStats.gsis_id == row["gsis_id"],
                         WeeklyStats.season == season,
-                        WeeklyStats.week == row.get('week', 1)
+                        WeeklyStats.week == row["week"]
                     )
                 )
                 existing_stats = existing.scalar_one_or_none()
                 
                 if existing_stats:
                     # Update existing stats with snap count data
-                    stats_dict = existing_stats.stats
-                    stats_dict.update({
-                        'snap_counts': row.get('snap_counts', 0),
-                        'snap_pct': row.get('snap_pct', 0.0),
-                        'offensive_snaps': row.get('offensive_snaps', 0),
-                        'defensive_snaps': row.get('defensive_snaps', 0),
-                        'special_teams_snaps': row.get('special_teams_snaps', 0)
-                    })
-                    existing_stats.stat_json = json.dumps(stats_dict)
+                    stats_dict = dict(existing_stats.stats)
+                    stats_dict.update(row["snaps"])
+                    existing_stats.stat_json = orjson.dumps(stats_dict, option=JSON_OPTIONS).decode()
                     existing_stats.updated_at = datetime.now(timezone.utc)
                     stats_updated += 1
             
             await self.db.commit()
+            await self.invalidate_season_cache(season)
             
             return {
                 "success": True,
+                "kind": "snaps",
                 "stats_updated": stats_updated,
                 "total_processed": len(snap_data)
             }
@@ -379,13 +403,15 @@ class NFLDataIngestionService:
         except ImportError:
             return {
                 "success": False,
+                "kind": "error",
                 "error": "nfl_data_py not installed. Install with: pip install nfl_data_py"
             }
         except Exception as e:
             await self.db.rollback()
             return {
                 "success": False,
-                "error": f"Failed to import snap counts: {str(e)}"
+                "kind": "error",
+                "error": f"Failed to import snap counts: {e}"
             }
     
     async def get_weekly_stats(self, gsis_id: str, season: int, week: int) -> Optional[WeeklyStats]:
@@ -420,3 +446,74 @@ class NFLDataIngestionService:
             ).order_by(DepthCharts.position, DepthCharts.depth_order)
         )
         return result.scalars().all()
+    
+    async def create_import_job(self, job_type: str, season: int, week: Optional[int] = None) -> ImportJob:
+        """Record a pending background import."""
+        job = ImportJob(
+            id=uuid.uuid4().hex,
+            job_type=job_type,
+            season=season,
+            week=week,
+            status="pending"
+        )
+        self.db.add(job)
+        await self.db.commit()
+        return job
+    
+    async def get_import_job(self, job_id: str) -> Optional[ImportJob]:
+        """Get a background import by ID."""
+        return await self.db.get(ImportJob, job_id, populate_existing=True)
+    
+    async def update_import_job(
+        self,
+        job_id: str,
+        status: str,
+        result: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Update the status of a background import, storing its results once finished."""
+        await self.db.execute(
+            update(ImportJob).where(ImportJob.id == job_id).values(
+                status=status,
+                result_json=json.dumps(result, default=str) if result is not None else None,
+                updated_at=datetime.now(timezone.utc)
+            )
+        )
+        await self.db.commit()
+    
+    async def get_cached_response(self, cache_key: str) -> Optional[bytes]:
+        """Get a cached JSON response body from Redis, if configured."""
+        redis = get_redis()
+        if redis is None:
+            return None
+        return await redis.get(f"{NFL_CACHE_PREFIX}{cache_key}")
+    
+    async def cache_response(self, cache_key: str, body: bytes, season: int) -> None:
+        """
+        Cache a JSON response body in Redis, if configured.
+        
+        Data from past seasons no longer changes, so it's kept much longer
+        than data from the season in progress.
+        """
+        redis = get_redis()
+        if redis is None:
+            return
+        if season < self._current_season():
+            ttl = settings.nfl_data_cache_ttl_seconds
+        else:
+            ttl = settings.nfl_live_data_cache_ttl_seconds
+        await redis.set(f"{NFL_CACHE_PREFIX}{cache_key}", body, ex=ttl)
+    
+    async def invalidate_season_cache(self, season: int) -> None:
+        """Drop cached responses for a season after its data is reimported."""
+        redis = get_redis()
+        if redis is None:
+            return
+        keys = [key async for key in redis.scan_iter(match=f"{NFL_CACHE_PREFIX}{season}:*")]
+        if keys:
+            await redis.delete(*keys)
+    
+    @staticmethod
+    def _current_season() -> int:
+        """Get the NFL season in progress; seasons end in early February."""
+        now = datetime.now(timezone.utc)
+        return now.year if now.month >= 3 else now.year - 1
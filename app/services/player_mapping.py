@@ -5,12 +5,45 @@ Player ID mapping service to bridge Yahoo player IDs with public NFL data source
 import asyncio
 from typing import Dict, Any, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Row, select, func
 import pandas as pd
 
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import dialect_insert
+from app.core.redis_client import get_redis
 from app.models.fantasy import Player
 from app.models.nfl_data import PlayerIDMapping
 
+# Columns copied from nfl_data_py import_ids() into PlayerIDMapping
+MAPPING_COLUMNS = [
+    "gsis_id", "pfr_id", "espn_id", "full_name",
+    "first_name", "last_name", "position", "team"
+]
+
+# Rows upserted per INSERT ... ON CONFLICT statement
+MAPPING_BATCH_SIZE = 5000
+
+# Redis key prefixes for cached ID mappings
+YAHOO_TO_GSIS_PREFIX = "map:y2g:"
+GSIS_TO_YAHOO_PREFIX = "map:g2y:"
+
+# Per-worker caches of resolved ID mappings, backed by Redis when configured
+_yahoo_to_gsis_cache = TTLCache(
+    maxsize=settings.player_mapping_cache_size,
+    ttl=settings.player_mapping_cache_ttl_seconds
+)
+_gsis_to_yahoo_cache = TTLCache(
+    maxsize=settings.player_mapping_cache_size,
+    ttl=settings.player_mapping_cache_ttl_seconds
+)
+
+
+def clear_mapping_caches() -> None:
+    """Clear the per-worker ID mapping caches."""
+    _yahoo_to_gsis_cache.clear()
+    _gsis_to_yahoo_cache.clear()
+
 
 class PlayerMappingService:
     """Service for mapping player IDs between different data sources."""
@@ -23,7 +56,7 @@ class PlayerMappingService:
         Import player IDs from nfl_data_py.
         
         This function uses nfl_data_py.import_ids() to get player ID mappings
-        and stores them in our local database.
+        and upserts them into our local database in batches.
         
         Returns:
             Summary of import results
@@ -36,14 +69,36 @@ class PlayerMappingService:
             ids_df = nfl.import_ids()
             
             # Process the data
+            records = self._prepare_mapping_records(ids_df)
             mappings_created = 0
             mappings_updated = 0
             
-            for _, row in ids_df.iterrows():
-                # Create or update mapping
-                mapping = await self._create_or_update_mapping(row)
-                if mapping:
-                    mappings_created += 1
+            for start in range(0, len(records), MAPPING_BATCH_SIZE):
+                batch = records[start:start + MAPPING_BATCH_SIZE]
+                
+                # Count existing mappings so the summary can tell inserts from updates
+                gsis_ids = [record["gsis_id"] for record in batch]
+                result = await self.db.execute(
+                    select(func.count()).select_from(PlayerIDMapping).where(PlayerIDMapping.gsis_id.in_(gsis_ids))
+                )
+                existing = result.scalar_one()
+                
+                stmt = dialect_insert(self.db, PlayerIDMapping)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[PlayerIDMapping.gsis_id],
+                    set_={
+                        **{column: stmt.excluded[column] for column in MAPPING_COLUMNS if column != "gsis_id"},
+                        "is_active": True,
+                        "updated_at": func.now()
+                    }
+                )
+                await self.db.execute(stmt, batch)
+                
+                mappings_created += len(batch) - existing
+                mappings_updated += existing
+            
+            await self.db.commit()
+            await self.invalidate_mapping_cache()
             
             return {
                 "success": True,
@@ -58,76 +113,47 @@ class PlayerMappingService:
                 "error": "nfl_data_py not installed. Install with: pip install nfl_data_py"
             }
         except Exception as e:
+            await self.db.rollback()
             return {
                 "success": False,
-                "error": f"Failed to import NFL data IDs: {str(e)}"
+                "error": f"Failed to import NFL data IDs: {e}"
             }
     
-    async def _create_or_update_mapping(self, row: pd.Series) -> Optional[PlayerIDMapping]:
+    async def invalidate_mapping_cache(self) -> None:
+        """Drop cached ID mappings, locally and in Redis, after mappings are reimported."""
+        clear_mapping_caches()
+        redis = get_redis()
+        if redis is None:
+            return
+        keys = []
+        for prefix in (YAHOO_TO_GSIS_PREFIX, GSIS_TO_YAHOO_PREFIX):
+            keys.extend([key async for key in redis.scan_iter(match=f"{prefix}*")])
+        if keys:
+            await redis.delete(*keys)
+    
+    def _prepare_mapping_records(self, ids_df: pd.DataFrame) -> List[Dict[str, Any]]:
         """
-        Create or update a player ID mapping from nfl_data_py data.
+        Convert nfl_data_py import_ids() output to mapping rows.
+        
+        Rows without a GSIS ID or name are dropped, missing optional values
+        become None, and only the last row for each GSIS ID is kept.
         
         Args:
-            row: Row from nfl_data_py import_ids() DataFrame
+            ids_df: DataFrame from nfl_data_py import_ids()
             
         Returns:
-            PlayerIDMapping object or None if failed
+            List of PlayerIDMapping column dictionaries
         """
-        try:
-            # Extract data from row
-            gsis_id = str(row.get('gsis_id', ''))
-            pfr_id = str(row.get('pfr_id', '')) if pd.notna(row.get('pfr_id')) else None
-            espn_id = str(row.get('espn_id', '')) if pd.notna(row.get('espn_id')) else None
-            full_name = str(row.get('full_name', ''))
-            first_name = str(row.get('first_name', '')) if pd.notna(row.get('first_name')) else None
-            last_name = str(row.get('last_name', '')) if pd.notna(row.get('last_name')) else None
-            position = str(row.get('position', ''))
-            team = str(row.get('team', '')) if pd.notna(row.get('team')) else None
-            
-            if not gsis_id or not full_name:
-                return None
-            
-            # Check if mapping exists
-            stmt = select(PlayerIDMapping).where(PlayerIDMapping.gsis_id == gsis_id)
-            result = await self.db.execute(stmt)
-            existing_mapping = result.scalar_one_or_none()
-            
-            if existing_mapping:
-                # Update existing mapping
-                existing_mapping.pfr_id = pfr_id
-                existing_mapping.espn_id = espn_id
-                existing_mapping.full_name = full_name
-                existing_mapping.first_name = first_name
-                existing_mapping.last_name = last_name
-                existing_mapping.position = position
-                existing_mapping.team = team
-                existing_mapping.is_active = True
-                
-                await self.db.commit()
-                await self.db.refresh(existing_mapping)
-                return existing_mapping
-            else:
-                # Create new mapping
-                mapping = PlayerIDMapping(
-                    gsis_id=gsis_id,
-                    pfr_id=pfr_id,
-                    espn_id=espn_id,
-                    full_name=full_name,
-                    first_name=first_name,
-                    last_name=last_name,
-                    position=position,
-                    team=team,
-                    is_active=True
-                )
-                
-                self.db.add(mapping)
-                await self.db.commit()
-                await self.db.refresh(mapping)
-                return mapping
-                
-        except Exception as e:
-            print(f"Error creating mapping for row {row}: {e}")
-            return None
+        df = ids_df.reindex(columns=MAPPING_COLUMNS)
+        df = df.astype(str).where(df.notna(), None)
+        df = df[df["gsis_id"].fillna("").ne("") & df["full_name"].fillna("").ne("")]
+        df = df.assign(position=df["position"].fillna(""))
+        df = df.drop_duplicates(subset="gsis_id", keep="last")
+        
+        records = df.to_dict("records")
+        for record in records:
+            record["is_active"] = True
+        return records
     
     async def map_yahoo_to_gsis(self, yahoo_player_id: str) -> Optional[str]:
         """
@@ -139,6 +165,15 @@ class PlayerMappingService:
         Returns:
             GSIS ID if found, None otherwise
         """
+        gsis_id = await self._get_cached_mapping(_yahoo_to_gsis_cache, YAHOO_TO_GSIS_PREFIX, yahoo_player_id)
+        if gsis_id is None:
+            gsis_id = await self._lookup_gsis_id(yahoo_player_id)
+            if gsis_id is not None:
+                await self._set_cached_mapping(_yahoo_to_gsis_cache, YAHOO_TO_GSIS_PREFIX, yahoo_player_id, gsis_id)
+        return gsis_id
+    
+    async def _lookup_gsis_id(self, yahoo_player_id: str) -> Optional[str]:
+        """Look up the GSIS ID for a Yahoo player in the database."""
         # First, get the Yahoo player
         stmt = select(Player).where(Player.player_id_yahoo == yahoo_player_id)
         result = await self.db.execute(stmt)
@@ -168,6 +203,15 @@ class PlayerMappingService:
         Returns:
             Yahoo player ID if found, None otherwise
         """
+        yahoo_id = await self._get_cached_mapping(_gsis_to_yahoo_cache, GSIS_TO_YAHOO_PREFIX, gsis_id)
+        if yahoo_id is None:
+            yahoo_id = await self._lookup_yahoo_id(gsis_id)
+            if yahoo_id is not None:
+                await self._set_cached_mapping(_gsis_to_yahoo_cache, GSIS_TO_YAHOO_PREFIX, gsis_id, yahoo_id)
+        return yahoo_id
+    
+    async def _lookup_yahoo_id(self, gsis_id: str) -> Optional[str]:
+        """Look up the Yahoo player ID for a GSIS ID in the database."""
         # Get the GSIS mapping
         stmt = select(PlayerIDMapping).where(
             PlayerIDMapping.gsis_id == gsis_id,
@@ -190,6 +234,30 @@ class PlayerMappingService:
         
         return yahoo_player.player_id_yahoo if yahoo_player else None
     
+    async def _get_cached_mapping(self, cache: TTLCache, key_prefix: str, key: str) -> Optional[str]:
+        """Get a mapping from the local cache, then Redis, filling the local cache on a Redis hit."""
+        value = cache.get(key)
+        if value is not None:
+            return value
+        
+        redis = get_redis()
+        if redis is None:
+            return None
+        
+        value = await redis.get(f"{key_prefix}{key}")
+        if value is None:
+            return None
+        value = value.decode("utf-8") if isinstance(value, bytes) else value
+        cache.set(key, value)
+        return value
+    
+    async def _set_cached_mapping(self, cache: TTLCache, key_prefix: str, key: str, value: str) -> None:
+        """Store a resolved mapping in the local cache and Redis."""
+        cache.set(key, value)
+        redis = get_redis()
+        if redis is not None:
+            await redis.set(f"{key_prefix}{key}", value, ex=settings.player_mapping_cache_ttl_seconds)
+    
     async def find_player_by_name(self, full_name: str, position: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Find player mappings by name.
@@ -224,20 +292,28 @@ class PlayerMappingService:
             for mapping in mappings
         ]
     
-    async def get_unmapped_yahoo_players(self) -> List[Player]:
+    async def get_unmapped_yahoo_players(self) -> List[Row]:
         """
         Get Yahoo players that don't have GSIS ID mappings.
         
+        Only the columns needed for display are selected, so results are
+        lightweight rows rather than ORM instances.
+        
         Returns:
-            List of unmapped Yahoo players
+            List of unmapped Yahoo player rows (player_id_yahoo, full_name, position, team)
         """
         # Get Yahoo players that don't have GSIS ID
-        stmt = select(Player).where(
+        stmt = select(
+            Player.player_id_yahoo,
+            Player.full_name,
+            Player.position,
+            Player.team
+        ).where(
             Player.is_active == True,
             Player.gsis_id.is_(None)
         )
         result = await self.db.execute(stmt)
-        unmapped_players = result.scalars().all()
+        unmapped_players = result.all()
         
         return unmapped_players
     
@@ -252,21 +328,106 @@ class PlayerMappingService:
             List of potential mappings with confidence scores
         """
         # Search for similar names in our mapping table
-        stmt = select(PlayerIDMapping).where(
+        stmt = select(
+            PlayerIDMapping.gsis_id,
+            PlayerIDMapping.pfr_id,
+            PlayerIDMapping.full_name,
+            PlayerIDMapping.position,
+            PlayerIDMapping.team
+        ).where(
             PlayerIDMapping.is_active == True
         )
         result = await self.db.execute(stmt)
-        all_mappings = result.scalars().all()
+        candidates = [dict(row._mapping) for row in result]
+        
+        suggestions = self._rank_suggestions(yahoo_player.full_name, yahoo_player.position, candidates)
+        for suggestion in suggestions:
+            suggestion["yahoo_player"] = yahoo_player
+        return suggestions
+    
+    async def suggest_mappings_by_yahoo_id(
+        self,
+        yahoo_player_id: str
+    ) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Suggest potential mappings for a Yahoo player by ID.
+        
+        The player and all candidate mappings are loaded in one query, an
+        outer join from the player to active mappings selecting only the
+        columns needed for scoring.
+        
+        Args:
+            yahoo_player_id: Yahoo player ID
+            
+        Returns:
+            Tuple of the Yahoo player's details and its suggestions,
+            or None if the player doesn't exist
+        """
+        stmt = select(
+            Player.player_id_yahoo,
+            Player.full_name,
+            Player.position,
+            Player.team,
+            PlayerIDMapping.gsis_id,
+            PlayerIDMapping.pfr_id,
+            PlayerIDMapping.full_name.label("mapping_full_name"),
+            PlayerIDMapping.position.label("mapping_position"),
+            PlayerIDMapping.team.label("mapping_team")
+        ).select_from(Player).outerjoin(
+            PlayerIDMapping, PlayerIDMapping.is_active == True
+        ).where(
+            Player.player_id_yahoo == yahoo_player_id
+        )
+        result = await self.db.execute(stmt)
+        rows = result.all()
+        
+        if not rows:
+            return None
+        
+        player = rows[0]
+        yahoo_player = {
+            "player_id_yahoo": player.player_id_yahoo,
+            "full_name": player.full_name,
+            "position": player.position,
+            "team": player.team
+        }
+        candidates = [
+            {
+                "gsis_id": row.gsis_id,
+                "pfr_id": row.pfr_id,
+                "full_name": row.mapping_full_name,
+                "position": row.mapping_position,
+                "team": row.mapping_team
+            }
+            for row in rows
+            if row.gsis_id is not None
+        ]
         
+        return yahoo_player, self._rank_suggestions(player.full_name, player.position, candidates)
+    
+    def _rank_suggestions(
+        self,
+        full_name: str,
+        position: str,
+        candidates: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Score candidate mappings against a player's name and position.
+        
+        Args:
+            full_name: Yahoo player's full name
+            position: Yahoo player's position
+            candidates: Mapping dictionaries with gsis_id, pfr_id, full_name, position and team
+            
+        Returns:
+            Top 5 candidates with confidence scores, best first
+        """
         suggestions = []
-        for mapping in all_mappings:
+        for candidate in candidates:
             # Calculate similarity score
-            name_similarity = self._calculate_name_similarity(
-                yahoo_player.full_name, 
-                mapping.full_name
-            )
+            name_similarity = self._calculate_name_similarity(full_name, candidate["full_name"])
             
-            position_match = yahoo_player.position == mapping.position
+            position_match = position == candidate["position"]
             
             # Only include if there's some similarity
             if name_similarity > 0.5 or (name_similarity > 0.3 and position_match):
@@ -274,15 +435,7 @@ class PlayerMappingService:
                 if position_match:
                     confidence += 0.2
                 
-                suggestions.append({
-                    "gsis_id": mapping.gsis_id,
-                    "pfr_id": mapping.pfr_id,
-                    "full_name": mapping.full_name,
-                    "position": mapping.position,
-                    "team": mapping.team,
-                    "confidence": min(confidence, 1.0),
-                    "yahoo_player": yahoo_player
-                })
+                suggestions.append({**candidate, "confidence": min(confidence, 1.0)})
         
         # Sort by confidence
         suggestions.sort(key=lambda x: x["confidence"], reverse=True)
@@ -2,14 +2,15 @@
 Fantasy football projection engine using usage-driven models.
 """
 
-import json
 import math
+import orjson
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_
 
+from app.core.database import dialect_insert
 from app.models.nfl_data import WeeklyStats, WeeklyProjections, Injuries, DepthCharts, PlayerIDMapping
 from app.models.fantasy import Player
 
@@ -43,6 +44,15 @@ class ProjectionOutput:
     extra_points: float = 0.0
     extra_point_attempts: float = 0.0
     confidence: float = 0.5
+    
+    def stats(self) -> Dict[str, float]:
+        """Get the projected stats as a dictionary, without confidence."""
+        return {name: getattr(self, name) for name in PROJECTION_STAT_FIELDS}
+
+
+PROJECTION_STAT_FIELDS = tuple(
+    field.name for field in fields(ProjectionOutput) if field.name != "confidence"
+)
 
 
 class UsageDrivenProjectionModel:
@@ -450,15 +460,17 @@ class KProjectionModel(UsageDrivenProjectionModel):
 class ProjectionEngine:
     """Main projection engine that coordinates all position models."""
     
+    # Position models hold no per-request state, so every engine shares them
+    models: Dict[str, UsageDrivenProjectionModel] = {
+        "QB": QBProjectionModel(),
+        "RB": RBProjectionModel(),
+        "WR": WRProjectionModel(),
+        "TE": TEProjectionModel(),
+        "K": KProjectionModel(),
+    }
+    
     def __init__(self, db: AsyncSession):
         self.db = db
-        self.models = {
-            "QB": QBProjectionModel(),
-            "RB": RBProjectionModel(),
-            "WR": WRProjectionModel(),
-            "TE": TEProjectionModel(),
-            "K": KProjectionModel(),
-        }
     
     async def generate_player_projection(
         self, 
@@ -507,7 +519,7 @@ class ProjectionEngine:
     async def _get_recent_stats(self, gsis_id: str, season: int, week: int, num_games: int) -> List[Dict[str, Any]]:
         """Get recent stats for a player."""
         result = await self.db.execute(
-            select(WeeklyStats).where(
+            select(WeeklyStats.stat_json).where(
                 and_(
                     WeeklyStats.gsis_id == gsis_id,
                     WeeklyStats.season == season,
@@ -516,8 +528,7 @@ class ProjectionEngine:
             ).order_by(WeeklyStats.week.desc()).limit(num_games)
         )
         
-        stats_records = result.scalars().all()
-        return [record.stats for record in stats_records]
+        return [orjson.loads(stat_json) for stat_json in result.scalars()]
     
     async def _get_depth_chart_order(self, gsis_id: str, season: int, week: int) -> int:
         """Get depth chart order for a player."""
@@ -537,7 +548,7 @@ class ProjectionEngine:
     async def _get_snap_share(self, gsis_id: str, season: int, week: int) -> float:
         """Get snap share for a player."""
         result = await self.db.execute(
-            select(WeeklyStats).where(
+            select(WeeklyStats.stat_json).where(
                 and_(
                     WeeklyStats.gsis_id == gsis_id,
                     WeeklyStats.season == season,
@@ -546,9 +557,9 @@ class ProjectionEngine:
             )
         )
         
-        stats_record = result.scalar_one_or_none()
-        if stats_record:
-            stats = stats_record.stats
+        stat_json = result.scalar_one_or_none()
+        if stat_json:
+            stats = orjson.loads(stat_json)
             return stats.get('snap_pct', 50.0)  # Default to 50%
         
         return 50.0
@@ -575,57 +586,54 @@ class ProjectionEngine:
         week: int, 
         projection: ProjectionOutput,
         source: str = "internal"
-    ) -> WeeklyProjections:
-        """Save projection to database."""
-        
-        # Convert projection to dictionary
-        proj_dict = {
-            "passing_yards": projection.passing_yards,
-            "passing_tds": projection.passing_tds,
-            "passing_ints": projection.passing_ints,
-            "rushing_yards": projection.rushing_yards,
-            "rushing_tds": projection.rushing_tds,
-            "receiving_yards": projection.receiving_yards,
-            "receiving_tds": projection.receiving_tds,
-            "receptions": projection.receptions,
-            "fumbles_lost": projection.fumbles_lost,
-            "field_goals": projection.field_goals,
-            "field_goal_attempts": projection.field_goal_attempts,
-            "extra_points": projection.extra_points,
-            "extra_point_attempts": projection.extra_point_attempts,
-        }
-        
-        # Check if projection already exists
-        existing = await self.db.execute(
-            select(WeeklyProjections).where(
-                and_(
-                    WeeklyProjections.gsis_id == gsis_id,
-                    WeeklyProjections.season == season,
-                    WeeklyProjections.week == week,
-                    WeeklyProjections.source == source
-                )
-            )
+    ) -> None:
+        """Save projection to database, replacing any existing one."""
+        await self.save_projections(season, week, [(gsis_id, projection)], source)
+    
+    async def save_projections(
+        self,
+        season: int,
+        week: int,
+        projections: List[Tuple[str, ProjectionOutput]],
+        source: str = "internal"
+    ) -> None:
+        """Save many projections in one upsert, replacing any that already exist."""
+        if not projections:
+            return
+        
+        now = datetime.now(timezone.utc)
+        records = [
+            {
+                "gsis_id": gsis_id,
+                "season": season,
+                "week": week,
+                "source": source,
+                "proj_json": self._projection_json(projection),
+                "confidence": projection.confidence,
+                "created_at": now,
+                "updated_at": now
+            }
+            for gsis_id, projection in projections
+        ]
+        
+        stmt = dialect_insert(self.db, WeeklyProjections)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                WeeklyProjections.gsis_id,
+                WeeklyProjections.season,
+                WeeklyProjections.week,
+                WeeklyProjections.source
+            ],
+            set_={
+                "proj_json": stmt.excluded.proj_json,
+                "confidence": stmt.excluded.confidence,
+                "updated_at": stmt.excluded.updated_at
+            }
         )
-        existing_proj = existing.scalar_one_or_none()
-        
-        if existing_proj:
-            # Update existing projection
-            existing_proj.proj_json = json.dumps(proj_dict)
-            existing_proj.confidence = projection.confidence
-            existing_proj.updated_at = datetime.now(timezone.utc)
-            return existing_proj
-        else:
-            # Create new projection
-            new_proj = WeeklyProjections(
-                gsis_id=gsis_id,
-                season=season,
-                week=week,
-                source=source,
-                proj_json=json.dumps(proj_dict),
-                confidence=projection.confidence,
-                created_at=datetime.now(timezone.utc),
-                updated_at=datetime.now(timezone.utc)
-            )
-            self.db.add(new_proj)
-            await self.db.commit()
-            return new_proj
+        await self.db.execute(stmt, records)
+        await self.db.commit()
+    
+    @staticmethod
+    def _projection_json(projection: ProjectionOutput) -> str:
+        """Serialize projected stats, without confidence, for storage."""
+        return orjson.dumps(projection.stats()).decode()
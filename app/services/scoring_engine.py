@@ -4,11 +4,22 @@ Fantasy football scoring engine for calculating points based on league rules.
 
 import json
 import re
+from functools import lru_cache
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
-from app.schemas.nfl_data import ScoringRule, ScoringSystem
+import numpy as np
+import orjson
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.schemas.nfl_data import ScoringSystem, ScoringSystemAdapter
+
+# Points are reported to hundredths, as Yahoo shows them. Rounding also keeps
+# float noise like 0.30000000000000004 out of responses, so orjson writes
+# fewer digits per value.
+POINTS_DECIMALS = 2
 
 
 class StatType(Enum):
@@ -98,7 +109,7 @@ class YahooScoringParser:
             return rules
             
         except (json.JSONDecodeError, KeyError, ValueError) as e:
-            raise ValueError(f"Failed to parse Yahoo scoring rules: {str(e)}")
+            raise ValueError(f"Failed to parse Yahoo scoring rules: {e}")
     
     def _parse_stat_config(self, stat_name: str, config: Dict[str, Any]) -> Optional[ScoringRule]:
         """Parse individual stat configuration."""
@@ -133,22 +144,121 @@ class YahooScoringParser:
             )
             
         except (ValueError, TypeError) as e:
-            print(f"Warning: Failed to parse stat config for {stat_name}: {str(e)}")
+            print(f"Warning: Failed to parse stat config for {stat_name}: {e}")
             return None
 
 
 class ScoringEngine:
     """Fantasy football scoring engine."""
     
+    # Common stat field names for each internal stat type
+    STAT_FIELD_NAMES = {
+        StatType.PASSING_YARDS.value: ("passing_yards", "pass_yds", "passing_yds"),
+        StatType.PASSING_TDS.value: ("passing_tds", "pass_td", "passing_td"),
+        StatType.PASSING_INTS.value: ("passing_ints", "pass_int", "passing_int"),
+        StatType.RUSHING_YARDS.value: ("rushing_yards", "rush_yds", "rushing_yds"),
+        StatType.RUSHING_TDS.value: ("rushing_tds", "rush_td", "rushing_td"),
+        StatType.RECEIVING_YARDS.value: ("receiving_yards", "rec_yds", "receiving_yds"),
+        StatType.RECEIVING_TDS.value: ("receiving_tds", "rec_td", "receiving_td"),
+        StatType.RECEPTIONS.value: ("receptions", "rec", "catches"),
+        StatType.FUMBLES_LOST.value: ("fumbles_lost", "fumbles", "fum_lost"),
+        StatType.FIELD_GOALS.value: ("field_goals", "fg_made", "fg"),
+        StatType.FIELD_GOAL_ATTEMPTS.value: ("field_goal_attempts", "fg_att", "fg_attempts"),
+        StatType.EXTRA_POINTS.value: ("extra_points", "xp_made", "xp"),
+        StatType.EXTRA_POINT_ATTEMPTS.value: ("extra_point_attempts", "xp_att", "xp_attempts"),
+    }
+    
     def __init__(self, scoring_rules: Dict[str, ScoringRule]):
         self.scoring_rules = scoring_rules
+        self._scoring_system: Optional[ScoringSystem] = None
+        self._scoring_system_dict: Optional[Dict[str, Any]] = None
+        self._stat_keys: Optional[List[str]] = None
+    
+    def compile(self) -> None:
+        """
+        Lay the scoring rules out as parallel arrays for batch scoring.
+        
+        Column j of a stats matrix holds stat `_stat_keys[j]`, scored with
+        `_coeffs[j]` points per unit once it reaches `_thresholds[j]` and
+        capped at `_max_points[j]`. Tiered stats can't be expressed this way
+        and are scored separately.
+        """
+        if self._stat_keys is not None:
+            return
+        
+        stat_keys = list(self.scoring_rules)
+        rules = [self.scoring_rules[stat_type] for stat_type in stat_keys]
+        self._stat_index = {stat_type: j for j, stat_type in enumerate(stat_keys)}
+        self._coeffs = np.array([rule.points for rule in rules], dtype=np.float64)
+        self._thresholds = np.array(
+            [-np.inf if rule.threshold is None else rule.threshold for rule in rules],
+            dtype=np.float64
+        )
+        self._max_points = np.array(
+            [np.inf if rule.max_points is None else rule.max_points for rule in rules],
+            dtype=np.float64
+        )
+        self._tiered_columns = [j for j, rule in enumerate(rules) if rule.tier_rules]
+        self._stat_keys = stat_keys
+    
+    def build_stats_matrix(self, stats_list: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Build an (N_players, N_stats) matrix of stat values.
+        
+        Stats a player has no value for are NaN.
+        """
+        self.compile()
+        matrix = np.full((len(stats_list), len(self._stat_keys)), np.nan)
+        for i, stats in enumerate(stats_list):
+            for j, stat_type in enumerate(self._stat_keys):
+                stat_value = self._get_stat_value(stats, stat_type)
+                if stat_value is not None:
+                    matrix[i, j] = stat_value
+        return matrix
+    
+    def calculate_fantasy_points_batch(self, stats_matrix: np.ndarray) -> np.ndarray:
+        """
+        Calculate fantasy points for many players at once.
+        
+        Args:
+            stats_matrix: Matrix from build_stats_matrix
+            
+        Returns:
+            Matrix of points per player and stat, NaN where the stat is missing
+        """
+        self.compile()
+        points = np.minimum(stats_matrix * self._coeffs, self._max_points)
+        points = np.where(stats_matrix < self._thresholds, 0.0, points)
+        
+        for j in self._tiered_columns:
+            rule = self.scoring_rules[self._stat_keys[j]]
+            for i, stat_value in enumerate(stats_matrix[:, j]):
+                if not np.isnan(stat_value):
+                    points[i, j] = self._calculate_stat_points(float(stat_value), rule)
+        
+        return points
+    
+    def breakdowns(self, points_matrix: np.ndarray) -> List[Dict[str, float]]:
+        """Turn a points matrix into per-player breakdowns by stat."""
+        self.compile()
+        return [
+            {
+                stat_type: round(points, POINTS_DECIMALS)
+                for stat_type, points in zip(self._stat_keys, row)
+                if points == points  # Skip NaN
+            }
+            for row in points_matrix.tolist()
+        ]
     
     @classmethod
     def from_yahoo_scoring(cls, scoring_json: str) -> 'ScoringEngine':
-        """Create scoring engine from Yahoo scoring rules."""
-        parser = YahooScoringParser()
-        rules = parser.parse_yahoo_scoring(scoring_json)
-        return cls(rules)
+        """
+        Create scoring engine from Yahoo scoring rules.
+        
+        Engines are shared between callers with identical rules, so each
+        distinct rules JSON is only parsed once.
+        """
+        return _parse_yahoo_scoring(scoring_json)
     
     def calculate_fantasy_points(self, stats: Dict[str, Any]) -> Tuple[float, Dict[str, float]]:
         """
@@ -166,32 +276,15 @@ class ScoringEngine:
         for stat_type, rule in self.scoring_rules.items():
             stat_value = self._get_stat_value(stats, stat_type)
             if stat_value is not None:
-                points = self._calculate_stat_points(stat_value, rule)
+                points = round(self._calculate_stat_points(stat_value, rule), POINTS_DECIMALS)
                 total_points += points
                 breakdown[stat_type] = points
         
-        return total_points, breakdown
+        return round(total_points, POINTS_DECIMALS), breakdown
     
     def _get_stat_value(self, stats: Dict[str, Any], stat_type: str) -> Optional[float]:
         """Extract stat value from stats dictionary."""
-        # Map internal stat types to common stat field names
-        stat_mapping = {
-            StatType.PASSING_YARDS.value: ["passing_yards", "pass_yds", "passing_yds"],
-            StatType.PASSING_TDS.value: ["passing_tds", "pass_td", "passing_td"],
-            StatType.PASSING_INTS.value: ["passing_ints", "pass_int", "passing_int"],
-            StatType.RUSHING_YARDS.value: ["rushing_yards", "rush_yds", "rushing_yds"],
-            StatType.RUSHING_TDS.value: ["rushing_tds", "rush_td", "rushing_td"],
-            StatType.RECEIVING_YARDS.value: ["receiving_yards", "rec_yds", "receiving_yds"],
-            StatType.RECEIVING_TDS.value: ["receiving_tds", "rec_td", "receiving_td"],
-            StatType.RECEPTIONS.value: ["receptions", "rec", "catches"],
-            StatType.FUMBLES_LOST.value: ["fumbles_lost", "fumbles", "fum_lost"],
-            StatType.FIELD_GOALS.value: ["field_goals", "fg_made", "fg"],
-            StatType.FIELD_GOAL_ATTEMPTS.value: ["field_goal_attempts", "fg_att", "fg_attempts"],
-            StatType.EXTRA_POINTS.value: ["extra_points", "xp_made", "xp"],
-            StatType.EXTRA_POINT_ATTEMPTS.value: ["extra_point_attempts", "xp_att", "xp_attempts"],
-        }
-        
-        possible_keys = stat_mapping.get(stat_type, [stat_type])
+        possible_keys = self.STAT_FIELD_NAMES.get(stat_type, (stat_type,))
         
         for key in possible_keys:
             if key in stats:
@@ -225,21 +318,62 @@ class ScoringEngine:
         
         return points
     
+    def get_scoring_system_dict(self) -> Dict[str, Any]:
+        """Get the scoring system as a dictionary, built once per engine."""
+        if self._scoring_system_dict is None:
+            self._scoring_system_dict = ScoringSystemAdapter.dump_python(self.get_scoring_system(), mode="json")
+        return self._scoring_system_dict
+    
     def get_scoring_system(self) -> ScoringSystem:
-        """Get the scoring system as a Pydantic model."""
-        return ScoringSystem(
-            passing_yards=ScoringRule(**self.scoring_rules.get(StatType.PASSING_YARDS.value, {}).__dict__) if StatType.PASSING_YARDS.value in self.scoring_rules else None,
-            passing_tds=ScoringRule(**self.scoring_rules.get(StatType.PASSING_TDS.value, {}).__dict__) if StatType.PASSING_TDS.value in self.scoring_rules else None,
-            passing_ints=ScoringRule(**self.scoring_rules.get(StatType.PASSING_INTS.value, {}).__dict__) if StatType.PASSING_INTS.value in self.scoring_rules else None,
-            rushing_yards=ScoringRule(**self.scoring_rules.get(StatType.RUSHING_YARDS.value, {}).__dict__) if StatType.RUSHING_YARDS.value in self.scoring_rules else None,
-            rushing_tds=ScoringRule(**self.scoring_rules.get(StatType.RUSHING_TDS.value, {}).__dict__) if StatType.RUSHING_TDS.value in self.scoring_rules else None,
-            receiving_yards=ScoringRule(**self.scoring_rules.get(StatType.RECEIVING_YARDS.value, {}).__dict__) if StatType.RECEIVING_YARDS.value in self.scoring_rules else None,
-            receiving_tds=ScoringRule(**self.scoring_rules.get(StatType.RECEIVING_TDS.value, {}).__dict__) if StatType.RECEIVING_TDS.value in self.scoring_rules else None,
-            receptions=ScoringRule(**self.scoring_rules.get(StatType.RECEPTIONS.value, {}).__dict__) if StatType.RECEPTIONS.value in self.scoring_rules else None,
-            fumbles_lost=ScoringRule(**self.scoring_rules.get(StatType.FUMBLES_LOST.value, {}).__dict__) if StatType.FUMBLES_LOST.value in self.scoring_rules else None,
-            field_goals=ScoringRule(**self.scoring_rules.get(StatType.FIELD_GOALS.value, {}).__dict__) if StatType.FIELD_GOALS.value in self.scoring_rules else None,
-            extra_points=ScoringRule(**self.scoring_rules.get(StatType.EXTRA_POINTS.value, {}).__dict__) if StatType.EXTRA_POINTS.value in self.scoring_rules else None,
-        )
+        """Get the scoring system as a Pydantic model, built once per engine."""
+        if self._scoring_system is None:
+            self._scoring_system = self._build_scoring_system()
+        return self._scoring_system
+    
+    def _build_scoring_system(self) -> ScoringSystem:
+        return ScoringSystemAdapter.validate_python({
+            stat_type: {
+                "stat": rule.stat,
+                "points": rule.points,
+                "threshold": rule.threshold,
+                "max_points": rule.max_points
+            }
+            for stat_type, rule in self.scoring_rules.items()
+            if stat_type in ScoringSystem.model_fields
+        })
+
+
+@lru_cache(maxsize=settings.scoring_cache_size)
+def _parse_yahoo_scoring(scoring_json: str) -> ScoringEngine:
+    """Parse Yahoo scoring rules into an engine, memoized by rules JSON."""
+    return ScoringEngine(YahooScoringParser().parse_yahoo_scoring(scoring_json))
+
+
+# League name and scoring engine by league key
+_league_scoring_cache = TTLCache(
+    maxsize=settings.scoring_cache_size,
+    ttl=settings.scoring_cache_ttl_seconds
+)
+
+
+# League keys recently looked up and not found, so repeated requests for
+# unknown leagues don't each hit the database
+_missing_league_cache = TTLCache(
+    maxsize=settings.league_not_found_cache_size,
+    ttl=settings.league_not_found_cache_ttl_seconds
+)
+
+
+def invalidate_league_scoring(league_key: str) -> None:
+    """Drop a league's cached scoring rules after its settings change."""
+    _league_scoring_cache.pop(league_key)
+    _missing_league_cache.pop(league_key)
+
+
+def clear_scoring_cache() -> None:
+    """Drop all cached league scoring rules."""
+    _league_scoring_cache.clear()
+    _missing_league_cache.clear()
 
 
 class FantasyPointsCalculator:
@@ -248,51 +382,76 @@ class FantasyPointsCalculator:
     def __init__(self, db):
         self.db = db
     
-    async def calculate_player_points(self, gsis_id: str, season: int, week: int, league_key: str) -> Dict[str, Any]:
+    async def get_league_scoring(self, league_key: str) -> Tuple[str, ScoringEngine]:
         """
-        Calculate fantasy points for a player in a specific league.
+        Get a league's name and scoring engine, caching them per league.
         
         Args:
-            gsis_id: Player GSIS ID
-            season: NFL season year
-            week: Week number
-            league_key: League key for scoring rules
+            league_key: League key
             
         Returns:
-            Dictionary with calculated points and breakdown
+            Tuple of (league_name, scoring_engine)
         """
         from app.models.fantasy import League
-        from app.models.nfl_data import WeeklyStats
         from sqlalchemy import select
         
-        # Get league scoring rules
+        cached = _league_scoring_cache.get(league_key)
+        if cached is not None:
+            return cached
+        
+        if _missing_league_cache.get(league_key):
+            raise ValueError(f"League {league_key} not found")
+        
         league_result = await self.db.execute(
-            select(League).where(League.league_key == league_key)
+            select(League.name, League.scoring_json).where(League.league_key == league_key)
         )
-        league = league_result.scalar_one_or_none()
+        league = league_result.one_or_none()
         
         if not league:
+            _missing_league_cache.set(league_key, True)
             raise ValueError(f"League {league_key} not found")
         
         if not league.scoring_json:
             raise ValueError(f"No scoring rules found for league {league_key}")
         
+        scoring = (league.name, ScoringEngine.from_yahoo_scoring(league.scoring_json))
+        _league_scoring_cache.set(league_key, scoring)
+        return scoring
+    
+    async def calculate_player_points(self, gsis_id: str, season: int, week: int, league_key: str) -> Dict[str, Any]:
+        """
+        Calculate fantasy points for a player in a specific league.
+        
+        Args:
+            gsis_id: Player GSIS ID
+            season: NFL season year
+            week: Week number
+            league_key: League key for scoring rules
+            
+        Returns:
+            Dictionary with calculated points and breakdown
+        """
+        from app.models.nfl_data import WeeklyStats
+        from sqlalchemy import select
+        
+        # Get league scoring rules
+        _, scoring_engine = await self.get_league_scoring(league_key)
+        
         # Get player stats
         stats_result = await self.db.execute(
-            select(WeeklyStats).where(
+            select(WeeklyStats.stat_json).where(
                 WeeklyStats.gsis_id == gsis_id,
                 WeeklyStats.season == season,
                 WeeklyStats.week == week
             )
         )
-        stats_record = stats_result.scalar_one_or_none()
+        stat_json = stats_result.scalar_one_or_none()
         
-        if not stats_record:
+        if stat_json is None:
             raise ValueError(f"No stats found for player {gsis_id} in season {season}, week {week}")
         
-        # Create scoring engine and calculate points
-        scoring_engine = ScoringEngine.from_yahoo_scoring(league.scoring_json)
-        total_points, breakdown = scoring_engine.calculate_fantasy_points(stats_record.stats)
+        # Calculate points
+        total_points, breakdown = scoring_engine.calculate_fantasy_points(orjson.loads(stat_json))
         
         return {
             "gsis_id": gsis_id,
@@ -301,7 +460,7 @@ class FantasyPointsCalculator:
             "league_key": league_key,
             "fantasy_points": total_points,
             "scoring_breakdown": breakdown,
-            "scoring_system": scoring_engine.get_scoring_system().dict()
+            "scoring_system": scoring_engine.get_scoring_system_dict()
         }
     
     async def calculate_team_points(self, team_key: str, season: int, week: int, league_key: str) -> Dict[str, Any]:
@@ -317,63 +476,75 @@ class FantasyPointsCalculator:
         Returns:
             Dictionary with team total and player breakdowns
         """
-        from app.models.fantasy import Roster
-        from sqlalchemy import select
+        from app.models.fantasy import Roster, Player
+        from app.models.nfl_data import PlayerIDMapping, WeeklyStats
+        from sqlalchemy import select, and_
+        
+        _, scoring_engine = await self.get_league_scoring(league_key)
         
-        # Get team roster for the week
-        roster_result = await self.db.execute(
-            select(Roster).where(
+        # Get mapped starters and their stats for the week in one query
+        starters_result = await self.db.execute(
+            select(Roster.player_id_yahoo, Roster.slot, PlayerIDMapping.gsis_id, WeeklyStats.stat_json)
+            .join(Player, Player.player_id_yahoo == Roster.player_id_yahoo)
+            .join(PlayerIDMapping, PlayerIDMapping.gsis_id == Player.gsis_id)
+            .outerjoin(
+                WeeklyStats,
+                and_(
+                    WeeklyStats.gsis_id == PlayerIDMapping.gsis_id,
+                    WeeklyStats.season == season,
+                    WeeklyStats.week == week
+                )
+            )
+            .where(
                 Roster.team_key == team_key,
-                Roster.week == week
+                Roster.week == week,
+                Roster.is_starting.is_(True)
             )
         )
-        roster = roster_result.scalars().all()
+        
+        starters = starters_result.all()
+        
+        # Score every starter with stats in one pass over a stats matrix
+        scored = [starter for starter in starters if starter.stat_json is not None]
+        stats_matrix = scoring_engine.build_stats_matrix([orjson.loads(starter.stat_json) for starter in scored])
+        points_matrix = scoring_engine.calculate_fantasy_points_batch(stats_matrix)
+        breakdowns = dict(zip(
+            (starter.slot for starter in scored),
+            scoring_engine.breakdowns(points_matrix)
+        ))
         
         total_points = 0.0
         player_points = []
         
-        for roster_slot in roster:
-            if roster_slot.player_id_yahoo and roster_slot.is_starting:
-                # Get player's GSIS ID from mapping
-                from app.models.nfl_data import PlayerIDMapping
-                mapping_result = await self.db.execute(
-                    select(PlayerIDMapping).where(
-                        PlayerIDMapping.gsis_id.in_(
-                            select(Player.gsis_id).where(Player.player_id_yahoo == roster_slot.player_id_yahoo)
-                        )
-                    )
-                )
-                mapping = mapping_result.scalar_one_or_none()
-                
-                if mapping:
-                    try:
-                        player_result = await self.calculate_player_points(
-                            mapping.gsis_id, season, week, league_key
-                        )
-                        total_points += player_result["fantasy_points"]
-                        player_points.append({
-                            "player_id_yahoo": roster_slot.player_id_yahoo,
-                            "gsis_id": mapping.gsis_id,
-                            "slot": roster_slot.slot,
-                            "fantasy_points": player_result["fantasy_points"],
-                            "scoring_breakdown": player_result["scoring_breakdown"]
-                        })
-                    except ValueError:
-                        # Player stats not available
-                        player_points.append({
-                            "player_id_yahoo": roster_slot.player_id_yahoo,
-                            "gsis_id": mapping.gsis_id,
-                            "slot": roster_slot.slot,
-                            "fantasy_points": 0.0,
-                            "scoring_breakdown": {},
-                            "error": "Stats not available"
-                        })
+        for player_id_yahoo, slot, gsis_id, stat_json in starters:
+            if stat_json is None:
+                # Player stats not available
+                player_points.append({
+                    "player_id_yahoo": player_id_yahoo,
+                    "gsis_id": gsis_id,
+                    "slot": slot,
+                    "fantasy_points": 0.0,
+                    "scoring_breakdown": {},
+                    "error": "Stats not available"
+                })
+                continue
+            
+            breakdown = breakdowns[slot]
+            points = round(sum(breakdown.values()), POINTS_DECIMALS)
+            total_points += points
+            player_points.append({
+                "player_id_yahoo": player_id_yahoo,
+                "gsis_id": gsis_id,
+                "slot": slot,
+                "fantasy_points": points,
+                "scoring_breakdown": breakdown
+            })
         
         return {
             "team_key": team_key,
             "season": season,
             "week": week,
             "league_key": league_key,
-            "total_fantasy_points": total_points,
+            "total_fantasy_points": round(total_points, POINTS_DECIMALS),
             "player_points": player_points
         }
@@ -3,17 +3,46 @@ Yahoo Fantasy API client service for league and team data synchronization.
 """
 
 import httpx
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from app.core.config import settings
-from app.services.yahoo_oauth import YahooOAuthService
+from app.core.ratelimit import ThrottledRateLimiter
+from app.services.yahoo_oauth import YahooOAuthService, get_oauth_service
+
+# Shared by all clients so concurrent syncs together stay under Yahoo's quota
+yahoo_rate_limiter = ThrottledRateLimiter(
+    rate=settings.yahoo_api_rate_limit,
+    burst=settings.yahoo_api_max_concurrency
+)
+
+
+def parse_team_standings(team: Dict[str, Any]) -> Tuple[Optional[int], int, int, int]:
+    """
+    Extract standings from a Yahoo team without building empty fallbacks.
+    
+    Returns:
+        Tuple of (rank, wins, losses, ties), with missing totals as 0
+    """
+    standings = team.get("team_standings")
+    if not standings:
+        return None, 0, 0, 0
+    outcomes = standings.get("outcome_totals")
+    if not outcomes:
+        return standings.get("rank"), 0, 0, 0
+    return (
+        standings.get("rank"),
+        outcomes.get("wins", 0),
+        outcomes.get("losses", 0),
+        outcomes.get("ties", 0)
+    )
 
 
 class YahooAPIClient:
     """Yahoo Fantasy API client for data synchronization."""
     
-    def __init__(self, access_token: str):
+    def __init__(self, access_token: str, http_client: Optional[httpx.AsyncClient] = None):
         self.access_token = access_token
+        self.http_client = http_client
         self.base_url = "https://fantasysports.yahooapis.com/fantasy/v2"
         self.headers = {
             "Authorization": f"Bearer {access_token}",
@@ -36,10 +65,14 @@ class YahooAPIClient:
         """
         url = f"{self.base_url}/{endpoint}"
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json()
+        await yahoo_rate_limiter.acquire()
+        if self.http_client is not None:
+            response = await self.http_client.get(url, headers=self.headers, params=params)
+        else:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(url, headers=self.headers, params=params)
+        response.raise_for_status()
+        return response.json()
     
     async def get_user_leagues(self) -> List[Dict[str, Any]]:
         """
@@ -198,7 +231,20 @@ class YahooAPIService:
     
     def __init__(self, oauth_service: YahooOAuthService):
         self.oauth_service = oauth_service
-        self._client: Optional[YahooAPIClient] = None
+        self._http_client: Optional[httpx.AsyncClient] = None
+    
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """HTTP client kept open so API clients reuse pooled connections."""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient()
+        return self._http_client
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
     
     async def get_client(self, access_token: str) -> YahooAPIClient:
         """
@@ -210,7 +256,7 @@ class YahooAPIService:
         Returns:
             Yahoo API client
         """
-        return YahooAPIClient(access_token)
+        return YahooAPIClient(access_token, self.http_client)
     
     async def refresh_and_get_client(self, refresh_token: str) -> YahooAPIClient:
         """
@@ -225,4 +271,12 @@ class YahooAPIService:
         token_data = await self.oauth_service.refresh_token(refresh_token)
         parsed_tokens = self.oauth_service.parse_token_response(token_data)
         
-        return YahooAPIClient(parsed_tokens["access_token"])
+        return YahooAPIClient(parsed_tokens["access_token"], self.http_client)
+
+
+_api_service = YahooAPIService(get_oauth_service())
+
+
+def get_api_service() -> YahooAPIService:
+    """Dependency to get the shared Yahoo API service."""
+    return _api_service
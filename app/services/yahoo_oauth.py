@@ -19,9 +19,23 @@ class YahooOAuthService:
         self.redirect_uri = settings.yahoo_redirect_uri
         self.auth_url = "https://api.login.yahoo.com/oauth2/request_auth"
         self.token_url = "https://api.login.yahoo.com/oauth2/get_token"
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client kept open so token requests reuse pooled connections."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient()
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     def generate_state(self) -> str:
-        """Generate a random state parameter for OAuth security."""
+        """Generate a random, URL-safe OAuth state with 256 bits of entropy."""
         return secrets.token_urlsafe(32)
     
     def get_authorization_url(self, state: str) -> str:
@@ -64,10 +78,9 @@ class YahooOAuthService:
             "client_secret": self.client_secret
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(self.token_url, data=data)
-            response.raise_for_status()
-            return response.json()
+        response = await self.client.post(self.token_url, data=data)
+        response.raise_for_status()
+        return response.json()
     
     async def refresh_token(self, refresh_token: str) -> Dict[str, Any]:
         """
@@ -89,10 +102,9 @@ class YahooOAuthService:
             "client_secret": self.client_secret
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(self.token_url, data=data)
-            response.raise_for_status()
-            return response.json()
+        response = await self.client.post(self.token_url, data=data)
+        response.raise_for_status()
+        return response.json()
     
     def parse_token_response(self, token_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -120,3 +132,11 @@ class YahooOAuthService:
             "scope": token_data.get("scope"),
             "expires_in": expires_in
         }
+
+
+_oauth_service = YahooOAuthService()
+
+
+def get_oauth_service() -> YahooOAuthService:
+    """Dependency to get the shared Yahoo OAuth service."""
+    return _oauth_service
@@ -11,9 +11,11 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sess
 from sqlalchemy.pool import StaticPool
 from httpx import AsyncClient, ASGITransport
 
-from app.core.database import get_db, Base
+from app.core.database import get_db, get_session_maker, Base
 from app.core.config import settings
 from app.main import app
+from app.services.player_mapping import clear_mapping_caches
+from app.services.scoring_engine import clear_scoring_cache
 
 
 # Test database URL
@@ -43,6 +45,16 @@ def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def reset_caches() -> Generator[None, None, None]:
+    """Keep cached ID mappings and scoring rules from leaking between tests."""
+    clear_mapping_caches()
+    clear_scoring_cache()
+    yield
+    clear_mapping_caches()
+    clear_scoring_cache()
+
+
 @pytest_asyncio.fixture(scope="function")
 async def db_session() -> AsyncGenerator[AsyncSession, None]:
     """Create a test database session."""
@@ -67,6 +79,7 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         return db_session
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_maker] = lambda: TestSessionLocal
     
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
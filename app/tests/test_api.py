@@ -6,9 +6,12 @@ import pytest
 from httpx import AsyncClient
 from unittest.mock import patch, MagicMock
 import json
+import pandas as pd
 
+from app.core.oauth_state_store import get_oauth_state_store
 from app.models.user import User, YahooToken
 from app.models.fantasy import League, Team, Player
+from app.services.projection_engine import ProjectionOutput
 
 
 class TestAuthEndpoints:
@@ -25,7 +28,18 @@ class TestAuthEndpoints:
         data = response.json()
         assert data["authenticated"] is False
         assert "message" in data
-    
+
+    @pytest.mark.asyncio
+    async def test_auth_status_etag(self, client: AsyncClient):
+        """Test auth status returns 304 when the ETag matches."""
+        response = await client.get("/api/v1/auth/status")
+        etag = response.headers["etag"]
+
+        response = await client.get("/api/v1/auth/status", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+
     @pytest.mark.asyncio
     @pytest.mark.asyncio
     @pytest.mark.asyncio
@@ -76,9 +90,11 @@ class TestAuthEndpoints:
             "scope": "read"
         }
         
-        # Mock the OAuth state and Yahoo API calls
-        with patch("app.api.v1.auth.oauth_states", {"test-state": {"user_id": "test-user-123"}}), \
-             patch("httpx.AsyncClient.post") as mock_post:
+        # Seed the OAuth state and mock the Yahoo API calls
+        await get_oauth_state_store().put(
+            "test-state", json.dumps({"user_id": "test-user-123"}), ttl=600
+        )
+        with patch("httpx.AsyncClient.post") as mock_post:
             
             mock_response = MagicMock()
             mock_response.status_code = 200
@@ -100,9 +116,11 @@ class TestAuthEndpoints:
     @pytest.mark.asyncio
     async def test_yahoo_oauth_callback_error(self, client: AsyncClient):
         """Test OAuth callback with error."""
-        # Mock the OAuth state and Yahoo API error response
-        with patch("app.api.v1.auth.oauth_states", {"test-state": {"user_id": "test-user-123"}}), \
-             patch("httpx.AsyncClient.post") as mock_post:
+        # Seed the OAuth state and mock the Yahoo API error response
+        await get_oauth_state_store().put(
+            "test-state", json.dumps({"user_id": "test-user-123"}), ttl=600
+        )
+        with patch("httpx.AsyncClient.post") as mock_post:
             
             # Mock Yahoo API error response
             mock_response = MagicMock()
@@ -127,6 +145,14 @@ class TestAuthEndpoints:
 class TestYahooEndpoints:
     """Test Yahoo API endpoints."""
     
+    def test_routes_registered_once(self):
+        """Test each Yahoo route is registered exactly once."""
+        from app.api.v1 import yahoo
+        
+        routes = [(route.path, method) for route in yahoo.router.routes for method in route.methods]
+        assert len(yahoo.router.routes) == 7
+        assert len(routes) == len(set(routes))
+    
     @pytest.mark.asyncio
     @pytest.mark.asyncio
     @pytest.mark.asyncio
@@ -179,6 +205,14 @@ class TestYahooEndpoints:
         assert "slots" in data
         assert "week" in data
         assert data["week"] == 5
+
+    @pytest.mark.asyncio
+    async def test_get_team_roster_slot_fields(self, client: AsyncClient):
+        """Test roster slots serialize with the same fields as the response model."""
+        response = await client.get("/api/v1/yahoo/team/414.l.123456.t.1/roster")
+
+        assert response.status_code == 200
+        assert response.json()["slots"][0] == {"slot": "QB", "player_id_yahoo": "12345", "is_starting": True}
     
     @pytest.mark.asyncio
     @pytest.mark.asyncio
@@ -204,6 +238,27 @@ class TestYahooEndpoints:
         assert "draft_picks" in data
         assert isinstance(data["draft_picks"], list)
     
+    @pytest.mark.asyncio
+    async def test_stream_draft_results(self, client: AsyncClient, db_session):
+        """Test draft picks stream as NDJSON in draft order."""
+        from app.models.fantasy import DraftPick
+        
+        db_session.add(Player(player_id_yahoo="414.p.1", full_name="First Pick", position="QB"))
+        db_session.add(DraftPick(league_key="414.l.123456", round=2, pick=1, team_key="414.l.123456.t.2"))
+        db_session.add(DraftPick(
+            league_key="414.l.123456", round=1, pick=1, team_key="414.l.123456.t.1", player_id_yahoo="414.p.1"
+        ))
+        await db_session.commit()
+        
+        response = await client.get("/api/v1/yahoo/league/414.l.123456/draft/stream")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        picks = [json.loads(line) for line in response.text.splitlines()]
+        assert [(pick["round"], pick["pick"]) for pick in picks] == [(1, 1), (2, 1)]
+        assert picks[0]["player_name"] == "First Pick"
+        assert picks[1]["player_name"] is None
+    
     @pytest.mark.asyncio
     @pytest.mark.asyncio
     @pytest.mark.asyncio
@@ -258,15 +313,55 @@ class TestDataSyncEndpoints:
         assert data["league_key"] == "414.l.123456"
         assert "message" in data
     
+    @pytest.mark.asyncio
+    async def test_stream_league_sync_without_token(self, client: AsyncClient, db_session, sample_user_data, sample_yahoo_token_data):
+        """Test streaming a league sync requires the requesting user's own Yahoo account."""
+        db_session.add(User(**sample_user_data))
+        db_session.add(YahooToken(**sample_yahoo_token_data))
+        await db_session.commit()
+
+        response = await client.get(
+            "/api/v1/data/sync/league/414.l.123456/events",
+            params={"user_id": "other-user"}
+        )
+
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_stream_league_sync_refreshes_expired_token(self, client: AsyncClient, db_session, sample_user_data, sample_yahoo_token_data):
+        """Test streaming a league sync refreshes a token that is about to expire."""
+        from unittest.mock import AsyncMock
+        from app.services.data_sync import DataSyncService
+        from app.services.yahoo_api import YahooAPIService
+
+        db_session.add(User(**sample_user_data))
+        db_session.add(YahooToken(**sample_yahoo_token_data))
+        await db_session.commit()
+
+        async def sync_league_from_yahoo(self, api_client, league_key):
+            yield {"stage": "complete"}
+
+        with patch.object(YahooAPIService, "refresh_and_get_client", AsyncMock()) as refresh, \
+             patch.object(YahooAPIService, "get_client", AsyncMock()) as get_client, \
+             patch.object(DataSyncService, "sync_league_from_yahoo", sync_league_from_yahoo):
+            response = await client.get(
+                "/api/v1/data/sync/league/414.l.123456/events",
+                params={"user_id": sample_user_data["id"]}
+            )
+
+        assert response.status_code == 200
+        assert response.text == 'data: {"stage":"complete"}\n\n'
+        refresh.assert_awaited_once_with("test-refresh-token")
+        get_client.assert_not_called()
+    
     @pytest.mark.asyncio
     @pytest.mark.asyncio
     @pytest.mark.asyncio
     async def test_import_nfl_data_ids(self, client: AsyncClient):
         """Test importing NFL data IDs."""
         # Mock nfl_data_py import
-        mock_ids_df = MagicMock()
-        mock_ids_df.iterrows.return_value = [
-            (0, {
+        mock_ids_df = pd.DataFrame([
+            {
                 "gsis_id": "00-0012345",
                 "pfr_id": "P123456",
                 "espn_id": "12345",
@@ -275,8 +370,8 @@ class TestDataSyncEndpoints:
                 "last_name": "Player",
                 "position": "QB",
                 "team_abbr": "TEST"
-            })
-        ]
+            }
+        ])
         
         with patch("nfl_data_py.import_ids", return_value=mock_ids_df):
             response = await client.post("/api/v1/data/mapping/import-nfl-ids")
@@ -645,6 +740,245 @@ class TestDataSyncEndpoints:
         assert "league" in data["data"]
 
 
+class TestNFLDataEndpoints:
+    """Test NFL data ingestion endpoints."""
+    
+    @pytest.mark.asyncio
+    async def test_import_all_reports_failed_imports(self, client: AsyncClient):
+        """Test a queued import of all NFL data collects each failed import."""
+        service = "app.services.nfl_data_ingestion.NFLDataIngestionService"
+        with patch(f"{service}.import_weekly_stats", return_value={"success": True}), \
+             patch(f"{service}.import_injuries", side_effect=RuntimeError("boom")), \
+             patch(f"{service}.import_depth_charts", return_value={"success": True}), \
+             patch(f"{service}.import_snap_counts", return_value={"success": False, "error": "no data"}):
+            response = await client.post("/api/v1/nfl/import/all/2024")
+        
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        
+        # Background tasks finish before the test client returns the response
+        response = await client.get(f"/api/v1/nfl/import/status/{job_id}")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "failed"
+        assert data["result"]["failed_imports"] == ["Injuries: boom", "Snap counts: no data"]
+
+    @pytest.mark.asyncio
+    async def test_import_all_reports_cancelled_imports(self, client: AsyncClient):
+        """Test a cancelled import is reported as failed instead of breaking the job."""
+        import asyncio
+
+        service = "app.services.nfl_data_ingestion.NFLDataIngestionService"
+        with patch(f"{service}.import_weekly_stats", return_value={"success": True}), \
+             patch(f"{service}.import_injuries", side_effect=asyncio.CancelledError()), \
+             patch(f"{service}.import_depth_charts", return_value={"success": True}), \
+             patch(f"{service}.import_snap_counts", return_value={"success": True}):
+            response = await client.post("/api/v1/nfl/import/all/2024")
+
+        response = await client.get(f"/api/v1/nfl/import/status/{response.json()['job_id']}")
+
+        data = response.json()
+        assert data["status"] == "failed"
+        assert data["result"]["failed_imports"] == ["Injuries: CancelledError"]
+
+    @pytest.mark.asyncio
+    async def test_import_job_failed_when_result_cannot_be_recorded(self, client: AsyncClient):
+        """Test a job whose final status write fails is still marked failed."""
+        from app.services.nfl_data_ingestion import NFLDataIngestionService
+
+        update_import_job = NFLDataIngestionService.update_import_job
+
+        async def fail_on_completion(self, job_id, status, result=None):
+            if status == "completed":
+                raise RuntimeError("write failed")
+            await update_import_job(self, job_id, status, result)
+
+        with patch.object(NFLDataIngestionService, "import_weekly_stats", return_value={"success": True}), \
+             patch.object(NFLDataIngestionService, "update_import_job", fail_on_completion):
+            response = await client.post("/api/v1/nfl/import/weekly-stats/2024")
+
+        response = await client.get(f"/api/v1/nfl/import/status/{response.json()['job_id']}")
+
+        data = response.json()
+        assert data["status"] == "failed"
+        assert data["result"]["error"] == "write failed"
+
+    @pytest.mark.asyncio
+    async def test_import_status_not_found(self, client: AsyncClient):
+        """Test polling an unknown import job returns 404."""
+        response = await client.get("/api/v1/nfl/import/status/missing")
+
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_get_team_depth_chart(self, client: AsyncClient, db_session):
+        """Test a depth chart is returned as one list of entries ordered by position."""
+        from app.models.nfl_data import DepthCharts
+
+        # The primary key allows one entry per team, week, season and position
+        db_session.add_all([
+            DepthCharts(team="KC", week=1, season=2024, position="WR", gsis_id="00-0000003", depth_order=2),
+            DepthCharts(team="KC", week=1, season=2024, position="QB", gsis_id="00-0000001", depth_order=1),
+            DepthCharts(team="KC", week=1, season=2024, position="RB", gsis_id="00-0000002", depth_order=1),
+        ])
+        await db_session.commit()
+
+        response = await client.get("/api/v1/nfl/depth-chart/KC/2024/1")
+
+        assert response.status_code == 200
+        entries = response.json()["entries"]
+        assert [(entry["position"], entry["gsis_id"]) for entry in entries] == [
+            ("QB", "00-0000001"), ("RB", "00-0000002"), ("WR", "00-0000003")
+        ]
+        assert [entry["is_starter"] for entry in entries] == [True, True, False]
+
+
+class TestProjectionEndpoints:
+    """Test projection endpoints."""
+    
+    @pytest.mark.asyncio
+    async def test_generate_batch_projections(self, client: AsyncClient):
+        """Test batch projections report each player's result in order."""
+        with patch(
+            "app.services.projection_engine.ProjectionEngine.generate_player_projection",
+            return_value=ProjectionOutput(passing_yards=250.0, confidence=0.7)
+        ):
+            response = await client.post(
+                "/api/v1/projections/generate/batch?season=2024&week=1&save=false",
+                json=[
+                    {"gsis_id": "00-0012345", "position": "QB"},
+                    {"gsis_id": "00-0067890", "position": "QB"}
+                ]
+            )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["successful"] == 2
+        assert data["failed"] == 0
+        assert data["results"][0]["gsis_id"] == "00-0012345"
+        assert data["results"][0]["projection"]["passing_yards"] == 250.0
+    
+    @pytest.mark.asyncio
+    async def test_generate_batch_projections_rejects_invalid_players(self, client: AsyncClient):
+        """Test batch projections reject players without a supported position."""
+        response = await client.post(
+            "/api/v1/projections/generate/batch?season=2024&week=1",
+            json=[{"gsis_id": "00-0012345"}, {"gsis_id": "00-0067890", "position": "LB"}]
+        )
+        
+        assert response.status_code == 422
+    
+    @pytest.mark.asyncio
+    async def test_get_league_projections(self, client: AsyncClient, db_session):
+        """Test league projections include only mapped players with projections."""
+        from datetime import datetime, timezone
+        from app.models.fantasy import LeaguePlayer
+        from app.models.nfl_data import PlayerIDMapping, WeeklyProjections
+        
+        db_session.add(League(
+            league_key="414.l.123456",
+            name="Test League",
+            season=2024,
+            scoring_json='{"passing_yards": 0.04}',
+            roster_slots_json='{"QB": 1}',
+            league_type="standard",
+            num_teams=12,
+            is_finished=False
+        ))
+        for yahoo_id, gsis_id in [("414.p.1", "00-0000001"), ("414.p.2", "00-0000002")]:
+            db_session.add(Player(
+                player_id_yahoo=yahoo_id,
+                gsis_id=gsis_id,
+                full_name=f"Player {yahoo_id}",
+                position="QB",
+                is_active=True
+            ))
+            db_session.add(PlayerIDMapping(
+                gsis_id=gsis_id,
+                full_name=f"Player {yahoo_id}",
+                position="QB",
+                is_active=True
+            ))
+            db_session.add(LeaguePlayer(league_key="414.l.123456", player_id_yahoo=yahoo_id, status="FA"))
+        db_session.add(WeeklyProjections(
+            gsis_id="00-0000001",
+            season=2024,
+            week=1,
+            source="internal",
+            proj_json='{"passing_yards": 250.0}',
+            created_at=datetime.now(timezone.utc),
+            confidence=0.7
+        ))
+        await db_session.commit()
+        
+        response = await client.get("/api/v1/projections/league/414.l.123456/2024/1")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_projections"] == 1
+        assert data["projections"][0]["player_id_yahoo"] == "414.p.1"
+        assert data["projections"][0]["projection"] == {"passing_yards": 250.0}
+
+    @pytest.mark.asyncio
+    async def test_get_player_projection(self, client: AsyncClient, db_session):
+        """Test getting a saved projection embeds the stored projection JSON."""
+        from datetime import datetime, timezone
+        from app.models.nfl_data import WeeklyProjections
+
+        db_session.add(WeeklyProjections(
+            gsis_id="00-0012345",
+            season=2024,
+            week=1,
+            source="internal",
+            proj_json='{"rushing_yards": 80.0}',
+            created_at=datetime.now(timezone.utc),
+            confidence=0.5
+        ))
+        await db_session.commit()
+
+        response = await client.get("/api/v1/projections/player/00-0012345/2024/1")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["projections"] == {"rushing_yards": 80.0}
+        assert data["confidence"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_delete_player_projection_not_found(self, client: AsyncClient):
+        """Test deleting a missing projection returns 404."""
+        response = await client.delete("/api/v1/projections/player/00-0012345/2024/1")
+
+        assert response.status_code == 404
+
+
+class TestCSVImportEndpoints:
+    """Test CSV import endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_oversized_upload_rejected_before_parsing(self, client: AsyncClient):
+        """Test an upload over the size limit is rejected from its Content-Length without reading the form."""
+        from starlette.requests import Request
+        from app.core.config import settings
+
+        files = {"file": ("projections.csv", b"player_name,position\n" * 10, "text/csv")}
+        with patch.object(settings, "csv_upload_max_bytes", 100), \
+             patch.object(Request, "form") as form:
+            response = await client.post("/api/v1/csv/validate/projections", files=files)
+
+        assert response.status_code == 413
+        form.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_non_csv_upload_rejected(self, client: AsyncClient):
+        """Test an upload whose content isn't comma separated is rejected."""
+        files = {"file": ("projections.csv", b"player_name\tposition\n", "text/csv")}
+        response = await client.post("/api/v1/csv/validate/projections", files=files)
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "File must be a CSV file"
+
+
 class TestHealthEndpoints:
     """Test health check endpoints."""
     
@@ -656,6 +990,64 @@ class TestHealthEndpoints:
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "healthy"
+
+    @pytest.mark.asyncio
+    async def test_readiness_check(self, client: AsyncClient):
+        """Test readiness fails until startup work has finished, unlike liveness."""
+        from app.main import READY
+
+        assert (await client.get("/health/live")).status_code == 200
+        assert (await client.get("/health/ready")).status_code == 503
+
+        READY.set()
+        try:
+            response = await client.get("/health/ready")
+        finally:
+            READY.clear()
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+
+    @pytest.mark.asyncio
+    async def test_startup_failure_fails_health_checks(self, client: AsyncClient):
+        """Test a failed deferred startup is logged and reported by both probes."""
+        import app.main as main
+
+        with patch("app.main.create_tables", side_effect=RuntimeError("database unreachable")), \
+             patch.object(main.logger, "exception") as log_exception:
+            await main._deferred_init()
+        try:
+            live = await client.get("/health/live")
+            ready = await client.get("/health/ready")
+        finally:
+            main.STARTUP_ERROR = None
+
+        log_exception.assert_called_once()
+        assert not main.READY.is_set()
+        assert live.status_code == 503
+        assert live.json() == {"status": "failed", "error": "database unreachable"}
+        assert ready.status_code == 503
+
+    @pytest.mark.asyncio
+    async def test_cors_preflight(self, client: AsyncClient):
+        """Test preflights are allowed only for configured origins and are cacheable."""
+        from app.core.config import settings
+
+        headers = {"Access-Control-Request-Method": "GET", "Origin": settings.cors_origins[0]}
+        response = await client.options("/health", headers=headers)
+        assert response.status_code == 200
+        assert response.headers["access-control-max-age"] == str(settings.cors_max_age_seconds)
+
+        response = await client.options("/health", headers={**headers, "Origin": "https://example.com"})
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_openapi_includes_schema_examples(self, client: AsyncClient):
+        """Test schema examples are attached when the OpenAPI schema is generated."""
+        response = await client.get("/openapi.json")
+
+        assert response.status_code == 200
+        schemas = response.json()["components"]["schemas"]
+        assert schemas["LeagueSyncResponse"]["example"]["league_key"] == "414.l.123456"
     
     @pytest.mark.asyncio
     @pytest.mark.asyncio
@@ -2,6 +2,7 @@
 Tests for core functionality (config, database).
 """
 
+import asyncio
 import pytest
 import os
 from unittest.mock import patch
@@ -9,8 +10,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from pydantic import ValidationError
 
+from app.core.cache import TTLCache
 from app.core.config import Settings
-from app.core.database import get_db, create_tables, async_session_maker
+from app.core.database import get_db, create_tables, async_session_maker, keep_pool_alive
+from app.core.oauth_state_store import InMemoryOAuthStateStore
+from app.core.ratelimit import InMemoryRateLimiter, ThrottledRateLimiter, TokenBucket
 
 
 class TestSettings:
@@ -85,6 +89,18 @@ class TestDatabase:
             result = await session.execute(text("SELECT 1"))
             assert result.scalar() == 1
     
+    @pytest.mark.asyncio
+    async def test_keep_pool_alive_runs_until_cancelled(self):
+        """Test the pool heartbeat keeps checking until it is cancelled."""
+        with patch("app.core.database.engine") as mock_engine:
+            heartbeat = asyncio.create_task(keep_pool_alive(0))
+            await asyncio.sleep(0.01)
+            heartbeat.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await heartbeat
+        
+        assert mock_engine.connect.call_count >= 1
+    
     @pytest.mark.asyncio
     @pytest.mark.asyncio
     async def test_create_tables(self):
@@ -300,3 +316,128 @@ class TestDatabaseSessionManagement:
                 text(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table_name}'")
             )
             assert result.scalar() is None
+
+
+class TestOAuthStateStore:
+    """Test the in-memory OAuth state store."""
+    
+    @pytest.mark.asyncio
+    async def test_put_and_pop(self):
+        """Test that a stored state can be consumed exactly once."""
+        store = InMemoryOAuthStateStore()
+        
+        assert await store.put("state-1", '{"redirect_after_auth": null}', ttl=600) is True
+        assert await store.pop("state-1") == '{"redirect_after_auth": null}'
+        assert await store.pop("state-1") is None
+    
+    @pytest.mark.asyncio
+    async def test_put_existing_state(self):
+        """Test that an unexpired state is not overwritten."""
+        store = InMemoryOAuthStateStore()
+        
+        assert await store.put("state-1", "first", ttl=600) is True
+        assert await store.put("state-1", "second", ttl=600) is False
+        assert await store.pop("state-1") == "first"
+    
+    @pytest.mark.asyncio
+    async def test_expired_state(self):
+        """Test that expired states are rejected and swept."""
+        store = InMemoryOAuthStateStore()
+        
+        await store.put("expired", "value", ttl=0)
+        await store.put("live", "value", ttl=600)
+        
+        assert store.sweep() == 1
+        assert len(store) == 1
+        assert await store.pop("expired") is None
+        assert await store.pop("live") == "value"
+
+
+class TestRateLimit:
+    """Test token-bucket rate limiting."""
+    
+    def test_token_bucket_consume_and_refill(self):
+        """Test that a bucket empties after its capacity and refills over time."""
+        bucket = TokenBucket(capacity=2, refill_rate=1.0, tokens=2, last_refill=0.0)
+        
+        assert bucket.consume(0.0) is True
+        assert bucket.consume(0.0) is True
+        assert bucket.consume(0.0) is False
+        assert bucket.consume(1.0) is True
+    
+    def test_token_bucket_caps_at_capacity(self):
+        """Test that refilling never exceeds capacity."""
+        bucket = TokenBucket(capacity=2, refill_rate=1.0, tokens=0, last_refill=0.0)
+        
+        bucket.refill(100.0)
+        assert bucket.tokens == 2
+    
+    @pytest.mark.asyncio
+    async def test_in_memory_limiter_keys_are_independent(self):
+        """Test that each key gets its own bucket."""
+        limiter = InMemoryRateLimiter()
+        
+        assert await limiter.hit("oauth:1.1.1.1", capacity=1, refill_rate=0.001) is True
+        assert await limiter.hit("oauth:1.1.1.1", capacity=1, refill_rate=0.001) is False
+        assert await limiter.hit("oauth:2.2.2.2", capacity=1, refill_rate=0.001) is True
+    
+    @pytest.mark.asyncio
+    async def test_throttled_limiter_waits_for_tokens(self):
+        """Test that the client-side limiter delays requests beyond the burst."""
+        limiter = ThrottledRateLimiter(rate=20.0, burst=2)
+        loop = asyncio.get_running_loop()
+        
+        start = loop.time()
+        for _ in range(3):
+            await limiter.acquire()
+        
+        assert loop.time() - start >= 0.04
+
+
+class TestTTLCache:
+    """Test the in-process TTL cache."""
+    
+    def test_get_and_set(self):
+        """Test that stored values are returned until removed."""
+        cache = TTLCache(maxsize=10, ttl=600)
+        
+        cache.set("414.p.12345", "00-0012345")
+        assert cache.get("414.p.12345") == "00-0012345"
+        assert cache.pop("414.p.12345") == "00-0012345"
+        assert cache.get("414.p.12345") is None
+    
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted when full."""
+        cache = TTLCache(maxsize=2, ttl=600)
+        
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert len(cache) == 2
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+    
+    def test_expired_entry(self):
+        """Test that expired entries are not returned."""
+        cache = TTLCache(maxsize=10, ttl=600)
+        
+        cache.set("expired", "value", ttl=0)
+        
+        assert cache.get("expired") is None
+        assert len(cache) == 0
+
+
+class TestResponses:
+    """Test shared response classes."""
+    
+    def test_orjson_response_marks_naive_datetimes_utc(self):
+        """Test naive datetimes from SQLite are sent with a UTC offset."""
+        from datetime import datetime
+        from app.core.responses import ORJSONResponse
+        
+        response = ORJSONResponse({"created_at": datetime(2024, 9, 8, 17, 0), 1: "a"})
+        
+        assert response.body == b'{"created_at":"2024-09-08T17:00:00+00:00","1":"a"}'
@@ -2,9 +2,10 @@
 Tests for SQLAlchemy models.
 """
 
+import json
 import pytest
 import pytest_asyncio
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
@@ -58,6 +59,19 @@ class TestUserModels:
         assert token.yahoo_user_id == sample_yahoo_token_data["yahoo_user_id"]
         assert token.yahoo_guid == sample_yahoo_token_data["yahoo_guid"]
     
+    def test_yahoo_token_expiry(self, sample_yahoo_token_data):
+        """Test token expiry checks for aware and naive (SQLite) expiry times."""
+        token = YahooToken(**{**sample_yahoo_token_data, "expires_at": datetime.now(timezone.utc) + timedelta(minutes=2)})
+        assert token.is_expired is False
+        assert token.needs_refresh is True
+        
+        token.expires_at = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=1)
+        assert token.is_expired is False
+        assert token.needs_refresh is False
+        
+        token.expires_at = datetime(2020, 1, 1)
+        assert token.is_expired is True
+    
     @pytest.mark.asyncio
     async def test_user_token_relationship(self, db_session: AsyncSession, sample_user_data, sample_yahoo_token_data):
         """Test user-token relationship."""
@@ -81,6 +95,18 @@ class TestUserModels:
         
         assert len(user_with_tokens.yahoo_tokens) == 1
         assert user_with_tokens.yahoo_tokens[0].id == token.id
+    
+    @pytest.mark.asyncio
+    async def test_relationship_lazy_load_raises(self, db_session: AsyncSession, sample_user_data):
+        """Test relationships must be loaded explicitly rather than lazily."""
+        from sqlalchemy.exc import InvalidRequestError
+        
+        db_session.add(User(**sample_user_data))
+        await db_session.commit()
+        
+        user = (await db_session.execute(select(User))).scalar_one()
+        with pytest.raises(InvalidRequestError):
+            user.yahoo_tokens
 
 
 class TestFantasyModels:
@@ -115,7 +141,33 @@ class TestFantasyModels:
         assert isinstance(scoring_rules, dict)
         assert scoring_rules["passing_yards"] == 0.04
         assert scoring_rules["passing_tds"] == 4
-    
+
+    @pytest.mark.asyncio
+    async def test_league_scoring_rules_follow_scoring_json(self, db_session: AsyncSession, sample_league_data):
+        """Test scoring rules are decoded once and recomputed when the JSON changes."""
+        league = League(**sample_league_data)
+        db_session.add(league)
+        await db_session.commit()
+        await db_session.refresh(league)
+
+        assert league.scoring_rules is league.scoring_rules
+
+        league.scoring_json = json.dumps({"passing_yards": 0.05})
+        assert league.scoring_rules == {"passing_yards": 0.05}
+
+    @pytest.mark.asyncio
+    async def test_league_to_dict(self, db_session: AsyncSession, sample_league_data):
+        """Test to_dict returns every column keyed by name."""
+        league = League(**sample_league_data)
+        db_session.add(league)
+        await db_session.commit()
+        await db_session.refresh(league)
+
+        data = league.to_dict()
+        assert set(data) == {column.name for column in League.__table__.columns}
+        assert data["league_key"] == sample_league_data["league_key"]
+        assert data["created_at"] is not None
+
     @pytest.mark.asyncio
     async def test_league_roster_slots_property(self, db_session: AsyncSession, sample_league_data):
         """Test league roster slots property."""
@@ -4,7 +4,7 @@ Tests for Pydantic schemas.
 
 import pytest
 from datetime import datetime, timezone
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 
 from app.schemas.auth import (
     OAuthStartRequest, OAuthStartResponse, OAuthCallbackRequest, 
@@ -15,6 +15,7 @@ from app.schemas.yahoo import (
     LeaguePlayerStatus, DraftPickInfo, LeagueSyncRequest, 
     LeagueSyncResponse, UserLeaguesResponse, SyncError
 )
+from app.schemas.nfl_data import ImportErrorResponse, ImportResponse, InjuryImportResponse, InjuryResponse
 
 
 class TestAuthSchemas:
@@ -391,6 +392,30 @@ class TestYahooSchemas:
         assert error.error == "validation_error"
         assert error.error_description == "Invalid league key format"
     
+    def test_player_records_are_hashable(self):
+        """Test player info and status records are immutable and usable as cache keys."""
+        player = PlayerInfo(player_id_yahoo="414.p.12345", full_name="Test Player", position="QB")
+        status = LeaguePlayerStatus(player_id_yahoo="414.p.12345", status="FA")
+        
+        assert {player: 1}[PlayerInfo(player_id_yahoo="414.p.12345", full_name="Test Player", position="QB")] == 1
+        assert hash(status) == hash(LeaguePlayerStatus(player_id_yahoo="414.p.12345", status="FA"))
+        with pytest.raises(ValidationError):
+            player.team = "KC"
+    
+    def test_closed_value_sets(self):
+        """Test positions, roster slots and statuses outside their known values are rejected."""
+        with pytest.raises(ValidationError):
+            RosterSlot(slot="XX")
+        
+        with pytest.raises(ValidationError):
+            TeamRoster(team_key="414.l.123456.t.1", week=1, slots=[{"slot": "XX"}])
+        
+        with pytest.raises(ValidationError):
+            LeaguePlayerStatus(player_id_yahoo="414.p.12345", status="free agent")
+        
+        roster = TeamRoster(team_key="414.l.123456.t.1", week=1, slots=[RosterSlot(slot="W/R/T")])
+        assert roster.slots[0].slot == "W/R/T"
+    
     def test_schema_validation_errors(self):
         """Test schema validation with invalid data."""
         # Test missing required field
@@ -439,3 +464,42 @@ class TestYahooSchemas:
                 is_active=True
             )
 
+
+class TestNFLDataSchemas:
+    """Test NFL data schemas."""
+    
+    def test_import_response_dispatches_on_kind(self):
+        """Test import results validate as the model named by their kind."""
+        adapter = TypeAdapter(ImportResponse)
+        
+        result = adapter.validate_python({
+            "success": True,
+            "kind": "injury",
+            "injuries_created": 2,
+            "injuries_updated": 1,
+            "total_processed": 3
+        })
+        assert isinstance(result, InjuryImportResponse)
+        assert result.injuries_created == 2
+        
+        error = adapter.validate_python({"success": False, "kind": "error", "error": "boom"})
+        assert isinstance(error, ImportErrorResponse)
+        
+        with pytest.raises(ValidationError):
+            adapter.validate_python({"success": True, "injuries_created": 2})
+    
+    def test_injury_response_team(self):
+        """Test injury reports only accept known NFL team abbreviations."""
+        injury = {
+            "gsis_id": "00-0012345",
+            "season": 2024,
+            "week": 1,
+            "status": "Questionable",
+            "position": "QB",
+            "is_out": False,
+            "is_questionable": True
+        }
+        
+        assert InjuryResponse(**injury, team="KC").team == "KC"
+        with pytest.raises(ValidationError):
+            InjuryResponse(**injury, team="Kansas City")
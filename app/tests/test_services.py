@@ -6,6 +6,7 @@ import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from datetime import datetime, timezone, timedelta
 import json
+import pandas as pd
 
 from app.services.yahoo_oauth import YahooOAuthService
 from app.services.yahoo_api import YahooAPIClient, YahooAPIService
@@ -166,6 +167,34 @@ class TestYahooAPIClient:
             assert leagues[0]["league_key"] == "414.l.123456"
             assert leagues[0]["name"] == "Test League"
             assert leagues[0]["season"] == "2024"
+    
+    def test_parse_team_standings(self):
+        """Test standings are extracted with defaults for missing totals."""
+        from app.services.yahoo_api import parse_team_standings
+        
+        team = {"team_standings": {"rank": 3, "outcome_totals": {"wins": 7, "losses": 4}}}
+        assert parse_team_standings(team) == (3, 7, 4, 0)
+        assert parse_team_standings({"team_standings": {"rank": 5}}) == (5, 0, 0, 0)
+        assert parse_team_standings({}) == (None, 0, 0, 0)
+    
+    @pytest.mark.asyncio
+    async def test_service_clients_share_http_client(self):
+        """Test API clients from the service reuse one pooled HTTP client."""
+        service = YahooAPIService(YahooOAuthService())
+        
+        first = await service.get_client("token-1")
+        second = await service.get_client("token-2")
+        assert first.http_client is second.http_client
+        assert not first.http_client.is_closed
+        
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"ok": True}
+        with patch("httpx.AsyncClient.get", return_value=mock_response) as mock_get:
+            assert await first._make_request("test/endpoint") == {"ok": True}
+            assert mock_get.call_args.kwargs["headers"]["Authorization"] == "Bearer token-1"
+        
+        await service.aclose()
+        assert first.http_client.is_closed
 
 
 class TestDataSyncService:
@@ -303,6 +332,45 @@ class TestDataSyncService:
         saved_teams = result.scalars().all()
         assert len(saved_teams) == 2
     
+    @pytest.mark.asyncio
+    async def test_sync_teams_data_updates_existing(self, db_session):
+        """Test re-syncing teams updates rows in place and keeps input order."""
+        service = DataSyncService(db_session)
+        
+        await service.sync_teams_data("414.l.123456", [
+            {"team_key": "414.l.123456.t.1", "name": "Team 1"},
+            {"team_key": "414.l.123456.t.2", "name": "Team 2"}
+        ])
+        teams = await service.sync_teams_data("414.l.123456", [
+            {"team_key": "414.l.123456.t.2", "name": "Renamed", "team_standings": {"outcome_totals": {"wins": 3}}},
+            {"team_key": "414.l.123456.t.1", "name": "Team 1"}
+        ])
+        
+        assert [team.team_key for team in teams] == ["414.l.123456.t.2", "414.l.123456.t.1"]
+        assert teams[0].name == "Renamed"
+        assert teams[0].wins == 3
+        
+        from sqlalchemy import select, func
+        count = await db_session.scalar(select(func.count()).select_from(Team))
+        assert count == 2
+    
+    @pytest.mark.asyncio
+    async def test_sync_roster_data_rejects_shared_slots(self, db_session):
+        """Test a roster with several players in one slot fails instead of dropping players."""
+        service = DataSyncService(db_session)
+        roster_data = {"0": {"players": {
+            str(i): {"player": {"player_id": player_id}, "selected_position": {"position": "BN"}}
+            for i, player_id in enumerate(["414.p.1", "414.p.2"])
+        }}}
+        
+        # The rosters key is (team_key, week, slot), so two bench players collide
+        with pytest.raises(ValueError, match="Conflicting rosters rows"):
+            await service.sync_roster_data("414.l.123456.t.1", 1, roster_data)
+        await db_session.rollback()
+        
+        from sqlalchemy import select, func
+        assert await db_session.scalar(select(func.count()).select_from(Roster)) == 0
+    
     @pytest.mark.asyncio
     @pytest.mark.asyncio
     async def test_sync_players_data(self, db_session):
@@ -390,6 +458,52 @@ class TestDataSyncService:
         assert "teams" in cached_data
         assert "players" in cached_data
 
+    @pytest.mark.asyncio
+    async def test_sync_league_from_yahoo_progress(self, db_session):
+        """Test that a Yahoo league sync reports progress for each stage."""
+        service = DataSyncService(db_session)
+        
+        client = AsyncMock()
+        client.get_league_details.return_value = {
+            "league_key": "414.l.123456",
+            "name": "Test League",
+            "season": 2024
+        }
+        client.get_league_teams.return_value = []
+        client.get_league_players.return_value = []
+        client.get_draft_results.return_value = []
+        
+        events = [event async for event in service.sync_league_from_yahoo(client, "414.l.123456")]
+        
+        assert [event["stage"] for event in events] == ["league", "teams", "players", "draft", "complete"]
+        assert events[-1]["teams_synced"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_get_league_cache_summary(self, db_session):
+        """Test getting a league summary falls back to the database."""
+        service = DataSyncService(db_session)
+
+        league = League(
+            league_key="414.l.123456",
+            name="Test League",
+            season=2024,
+            scoring_json='{"passing_yards": 0.04}',
+            roster_slots_json='{"QB": 1}',
+            league_type="standard",
+            num_teams=12,
+            is_finished=False,
+            updated_at=datetime.now(timezone.utc)
+        )
+        db_session.add(league)
+        await db_session.commit()
+
+        summary = await service.get_league_cache_summary("414.l.123456", max_age_hours=24)
+
+        assert summary is not None
+        assert summary["league"]["league_key"] == "414.l.123456"
+        assert summary["teams_count"] == 0
+        assert summary["players_count"] == 0
+
 
 class TestPlayerMappingService:
     """Test player mapping service."""
@@ -401,9 +515,8 @@ class TestPlayerMappingService:
         service = PlayerMappingService(db_session)
         
         # Mock nfl_data_py import
-        mock_ids_df = MagicMock()
-        mock_ids_df.iterrows.return_value = [
-            (0, {
+        mock_ids_df = pd.DataFrame([
+            {
                 "gsis_id": "00-0012345",
                 "pfr_id": "P123456",
                 "espn_id": "12345",
@@ -412,9 +525,8 @@ class TestPlayerMappingService:
                 "last_name": "Player",
                 "position": "QB",
                 "team": "TEST"
-            })
-        ]
-        mock_ids_df.__len__ = MagicMock(return_value=1)
+            }
+        ])
         
         with patch("nfl_data_py.import_ids", return_value=mock_ids_df):
             result = await service.import_nfl_data_ids()
@@ -434,7 +546,34 @@ class TestPlayerMappingService:
             
             assert result["success"] is False
             assert "nfl_data_py not installed" in result["error"]
-    
+
+    @pytest.mark.asyncio
+    async def test_import_nfl_data_ids_invalidates_mapping_cache(self, db_session):
+        """Test importing IDs drops cached mappings locally and in Redis."""
+        from app.services.player_mapping import _yahoo_to_gsis_cache
+
+        service = PlayerMappingService(db_session)
+        _yahoo_to_gsis_cache.set("12345", "00-0099999")
+
+        cached_keys = {"map:y2g:*": ["map:y2g:12345"], "map:g2y:*": ["map:g2y:00-0099999"]}
+
+        async def scan_iter(match):
+            for key in cached_keys[match]:
+                yield key
+
+        redis = MagicMock(scan_iter=scan_iter, delete=AsyncMock())
+        mock_ids_df = pd.DataFrame([
+            {"gsis_id": "00-0012345", "full_name": "Test Player", "position": "QB"}
+        ])
+
+        with patch("nfl_data_py.import_ids", return_value=mock_ids_df), \
+             patch("app.services.player_mapping.get_redis", return_value=redis):
+            result = await service.import_nfl_data_ids()
+
+        assert result["success"] is True
+        assert _yahoo_to_gsis_cache.get("12345") is None
+        redis.delete.assert_awaited_once_with("map:y2g:12345", "map:g2y:00-0099999")
+
     @pytest.mark.asyncio
     @pytest.mark.asyncio
     async def test_map_yahoo_to_gsis_found(self, db_session):
@@ -695,6 +834,37 @@ class TestPlayerMappingService:
         assert suggestions[0]["gsis_id"] == "00-0012345"
         assert suggestions[0]["confidence"] > 0.8
     
+    @pytest.mark.asyncio
+    async def test_suggest_mappings_by_yahoo_id(self, db_session):
+        """Test suggesting mappings by Yahoo player ID."""
+        service = PlayerMappingService(db_session)
+        
+        db_session.add_all([
+            Player(
+                player_id_yahoo="414.p.12345",
+                full_name="Test Player",
+                first_name="Test",
+                last_name="Player",
+                position="QB",
+                team="TEST",
+                is_active=True
+            ),
+            PlayerIDMapping(
+                gsis_id="00-0012345",
+                full_name="Test Player",
+                position="QB",
+                team="TEST",
+                is_active=True
+            )
+        ])
+        await db_session.commit()
+        
+        yahoo_player, suggestions = await service.suggest_mappings_by_yahoo_id("414.p.12345")
+        
+        assert yahoo_player["full_name"] == "Test Player"
+        assert [s["gsis_id"] for s in suggestions] == ["00-0012345"]
+        assert await service.suggest_mappings_by_yahoo_id("414.p.99999") is None
+    
     def test_calculate_name_similarity(self):
         """Test name similarity calculation."""
         service = PlayerMappingService(None)  # db not needed for this test
@@ -710,3 +880,295 @@ class TestPlayerMappingService:
         # Test no match
         similarity = service._calculate_name_similarity("John Smith", "Jane Doe")
         assert similarity < 0.5
+
+
+class TestProjectionEngine:
+    """Test projection engine."""
+    
+    @pytest.mark.asyncio
+    async def test_save_projections_upserts(self, db_session):
+        """Test saving projections inserts new rows and replaces existing ones."""
+        from sqlalchemy import select
+        from app.models.nfl_data import WeeklyProjections
+        from app.services.projection_engine import ProjectionEngine, ProjectionOutput
+        
+        engine = ProjectionEngine(db_session)
+        await engine.save_projections(2024, 1, [
+            ("00-0000001", ProjectionOutput(passing_yards=200.0, confidence=0.5)),
+            ("00-0000002", ProjectionOutput(rushing_yards=80.0, confidence=0.6))
+        ])
+        await engine.save_projections(2024, 1, [
+            ("00-0000001", ProjectionOutput(passing_yards=275.0, confidence=0.8))
+        ])
+        
+        result = await db_session.execute(
+            select(WeeklyProjections).order_by(WeeklyProjections.gsis_id).execution_options(populate_existing=True)
+        )
+        projections = result.scalars().all()
+        assert len(projections) == 2
+        assert projections[0].projections["passing_yards"] == 275.0
+        assert projections[0].confidence == 0.8
+        assert projections[1].projections["rushing_yards"] == 80.0
+    
+    def test_projection_output_stats(self):
+        """Test projected stats exclude confidence."""
+        from app.services.projection_engine import ProjectionOutput, PROJECTION_STAT_FIELDS
+        
+        stats = ProjectionOutput(passing_yards=250.0, confidence=0.9).stats()
+        
+        assert tuple(stats) == PROJECTION_STAT_FIELDS
+        assert stats["passing_yards"] == 250.0
+        assert "confidence" not in stats
+
+
+class TestNFLDataIngestionService:
+    """Test NFL data ingestion service."""
+    
+    @pytest.mark.asyncio
+    async def test_cache_response_ttl_by_season(self, db_session):
+        """Test past seasons are cached longer than the season in progress."""
+        from app.core.config import settings
+        from app.services.nfl_data_ingestion import NFLDataIngestionService
+        
+        service = NFLDataIngestionService(db_session)
+        redis = AsyncMock()
+        current_season = service._current_season()
+        
+        with patch("app.services.nfl_data_ingestion.get_redis", return_value=redis):
+            await service.cache_response("2020:stats:00-0012345:1", b"{}", 2020)
+            await service.cache_response(f"{current_season}:stats:00-0012345:1", b"{}", current_season)
+        
+        assert redis.set.call_args_list[0].kwargs["ex"] == settings.nfl_data_cache_ttl_seconds
+        assert redis.set.call_args_list[1].kwargs["ex"] == settings.nfl_live_data_cache_ttl_seconds
+
+    @pytest.mark.asyncio
+    async def test_import_injuries_upserts(self, db_session):
+        """Test re-importing injuries updates existing rows instead of duplicating them."""
+        from sqlalchemy import select
+        from app.models.nfl_data import Injuries
+        from app.services.nfl_data_ingestion import NFLDataIngestionService
+
+        service = NFLDataIngestionService(db_session)
+        injury_df = pd.DataFrame([
+            {"player_id": "00-0012345", "week": 1, "status": "Questionable", "team": "KC", "position": "QB"},
+            {"player_id": "00-0023456", "week": 1, "status": "Out", "team": "SF", "position": "RB"}
+        ])
+
+        with patch("nfl_data_py.import_injuries", return_value=injury_df), \
+             patch.object(service, "invalidate_season_cache", AsyncMock()):
+            first = await service.import_injuries(2024)
+            injury_df.loc[0, "status"] = "Out"
+            second = await service.import_injuries(2024)
+
+        assert (first["injuries_created"], first["injuries_updated"]) == (2, 0)
+        assert (second["injuries_created"], second["injuries_updated"]) == (0, 2)
+
+        statuses = (await db_session.execute(
+            select(Injuries.gsis_id, Injuries.status).order_by(Injuries.gsis_id)
+        )).all()
+        assert statuses == [("00-0012345", "Out"), ("00-0023456", "Out")]
+
+    @pytest.mark.asyncio
+    async def test_imports_download_concurrently(self, db_session):
+        """Test nfl_data_py downloads run in worker threads, so concurrent imports overlap."""
+        import asyncio
+        import threading
+        from app.services.nfl_data_ingestion import NFLDataIngestionService
+
+        # Each download waits for the other, so this only finishes if they overlap
+        barrier = threading.Barrier(2, timeout=5)
+
+        def download(*args):
+            barrier.wait()
+            return pd.DataFrame()
+
+        service = NFLDataIngestionService(db_session)
+        with patch("nfl_data_py.import_weekly_data", side_effect=download), \
+             patch("nfl_data_py.import_injuries", side_effect=download):
+            stats, injuries = await asyncio.gather(
+                service.import_weekly_stats(2024),
+                service.import_injuries(2024)
+            )
+
+        assert stats["error"] == "No weekly data found for season 2024"
+        assert injuries["error"] == "No injury data found for season 2024"
+
+
+class TestFantasyPointsCalculator:
+    """Test fantasy points calculator."""
+    
+    @pytest.mark.asyncio
+    async def test_get_league_scoring_is_cached(self, db_session):
+        """Test league scoring rules are parsed once and dropped on invalidation."""
+        from app.services.scoring_engine import FantasyPointsCalculator, invalidate_league_scoring
+        
+        league = League(
+            league_key="414.l.123456",
+            name="Test League",
+            season=2024,
+            scoring_json='{"Passing Yards": {"value": 0.04}}',
+            roster_slots_json='{"QB": 1}',
+            league_type="standard",
+            num_teams=12,
+            is_finished=False
+        )
+        db_session.add(league)
+        await db_session.commit()
+        
+        calculator = FantasyPointsCalculator(db_session)
+        name, engine = await calculator.get_league_scoring("414.l.123456")
+        assert name == "Test League"
+        assert "passing_yards" in engine.scoring_rules
+        
+        league.scoring_json = '{"Rushing Yards": {"value": 0.1}}'
+        await db_session.commit()
+        assert (await calculator.get_league_scoring("414.l.123456"))[1] is engine
+        
+        invalidate_league_scoring("414.l.123456")
+        _, engine = await calculator.get_league_scoring("414.l.123456")
+        assert "rushing_yards" in engine.scoring_rules
+    
+    @pytest.mark.asyncio
+    async def test_missing_league_is_negatively_cached(self, db_session):
+        """Test unknown leagues aren't re-queried until invalidated."""
+        from app.services.scoring_engine import FantasyPointsCalculator, invalidate_league_scoring
+        
+        calculator = FantasyPointsCalculator(db_session)
+        with pytest.raises(ValueError, match="not found"):
+            await calculator.get_league_scoring("414.l.123456")
+        
+        db_session.add(League(
+            league_key="414.l.123456",
+            name="Test League",
+            season=2024,
+            scoring_json='{"Passing Yards": {"value": 0.04}}',
+            roster_slots_json='{"QB": 1}',
+            league_type="standard",
+            num_teams=12,
+            is_finished=False
+        ))
+        await db_session.commit()
+        
+        with pytest.raises(ValueError, match="not found"):
+            await calculator.get_league_scoring("414.l.123456")
+        
+        invalidate_league_scoring("414.l.123456")
+        name, _ = await calculator.get_league_scoring("414.l.123456")
+        assert name == "Test League"
+    
+    @pytest.mark.asyncio
+    async def test_calculate_team_points(self, db_session):
+        """Test team points sum starters' stats and flag starters without stats."""
+        from app.services.scoring_engine import FantasyPointsCalculator
+        from app.models.nfl_data import WeeklyStats
+        
+        db_session.add(League(
+            league_key="414.l.123456",
+            name="Test League",
+            season=2024,
+            scoring_json='{"Passing Yards": {"value": 0.04}}',
+            roster_slots_json='{"QB": 2}',
+            league_type="standard",
+            num_teams=12,
+            is_finished=False
+        ))
+        db_session.add(Team(team_key="414.l.123456.t.1", league_key="414.l.123456", name="Test Team"))
+        for suffix, slot, is_starting in (("1", "QB", True), ("2", "QB2", True), ("3", "BN", False)):
+            db_session.add(Player(
+                player_id_yahoo=f"414.p.{suffix}",
+                gsis_id=f"00-000000{suffix}",
+                full_name=f"Player {suffix}",
+                position="QB",
+                is_active=True
+            ))
+            db_session.add(PlayerIDMapping(
+                gsis_id=f"00-000000{suffix}",
+                full_name=f"Player {suffix}",
+                position="QB",
+                is_active=True
+            ))
+            db_session.add(Roster(
+                team_key="414.l.123456.t.1",
+                week=1,
+                slot=slot,
+                player_id_yahoo=f"414.p.{suffix}",
+                is_starting=is_starting
+            ))
+        for gsis_id in ("00-0000001", "00-0000003"):
+            db_session.add(WeeklyStats(
+                gsis_id=gsis_id,
+                season=2024,
+                week=1,
+                stat_json='{"passing_yards": 250}',
+                team="TEST"
+            ))
+        await db_session.commit()
+        
+        calculator = FantasyPointsCalculator(db_session)
+        result = await calculator.calculate_team_points("414.l.123456.t.1", 2024, 1, "414.l.123456")
+        
+        assert result["total_fantasy_points"] == pytest.approx(10.0)
+        by_slot = {entry["slot"]: entry for entry in result["player_points"]}
+        assert set(by_slot) == {"QB", "QB2"}
+        assert by_slot["QB"]["fantasy_points"] == pytest.approx(10.0)
+        assert by_slot["QB2"]["error"] == "Stats not available"
+    
+    def test_scoring_system_is_built_once(self):
+        """Test the scoring system model and dict are memoized per engine."""
+        from app.services.scoring_engine import ScoringEngine
+        
+        engine = ScoringEngine.from_yahoo_scoring('{"Passing Yards": {"value": 0.04}}')
+        
+        assert engine.get_scoring_system() is engine.get_scoring_system()
+        assert engine.get_scoring_system_dict() is engine.get_scoring_system_dict()
+        assert engine.get_scoring_system_dict()["passing_yards"]["points"] == 0.04
+
+    def test_scoring_system_skips_unlisted_stats(self):
+        """Test stats without a ScoringSystem field are left out of the scoring system."""
+        from app.services.scoring_engine import ScoringEngine, ScoringRule
+
+        engine = ScoringEngine({
+            "receptions": ScoringRule(stat="Receptions", points=1.0, tier_rules=[(0, 4, 0.5)]),
+            "defensive_sacks": ScoringRule(stat="Sacks", points=1.0),
+        })
+
+        system = engine.get_scoring_system()
+        assert system.receptions.points == 1.0
+        assert "defensive_sacks" not in engine.get_scoring_system_dict()
+
+    def test_points_are_rounded_to_hundredths(self):
+        """Test points carry no floating point noise past two decimal places."""
+        from app.services.scoring_engine import ScoringEngine, ScoringRule
+
+        engine = ScoringEngine({"rushing_yards": ScoringRule(stat="Rushing Yards", points=0.1)})
+
+        total, breakdown = engine.calculate_fantasy_points({"rushing_yards": 3})
+        assert total == 0.3
+        assert breakdown == {"rushing_yards": 0.3}
+
+        points_matrix = engine.calculate_fantasy_points_batch(engine.build_stats_matrix([{"rushing_yards": 3}]))
+        assert engine.breakdowns(points_matrix) == [{"rushing_yards": 0.3}]
+
+    def test_batch_scoring_matches_per_player_scoring(self):
+        """Test batch scoring agrees with scoring players one at a time."""
+        from app.services.scoring_engine import ScoringEngine, ScoringRule
+        
+        engine = ScoringEngine({
+            "passing_yards": ScoringRule(stat="Passing Yards", points=0.04, max_points=12.0),
+            "passing_tds": ScoringRule(stat="Passing Touchdowns", points=4.0),
+            "rushing_yards": ScoringRule(stat="Rushing Yards", points=0.1, threshold=10),
+            "receptions": ScoringRule(stat="Receptions", points=1.0, tier_rules=[(0, 4, 0.5), (5, 99, 1.0)]),
+        })
+        stats_list = [
+            {"passing_yards": 350, "passing_tds": 2, "rushing_yards": 5},
+            {"rush_yds": 80, "rec": 3},
+            {"receptions": 7, "rushing_yards": "12"},
+            {},
+        ]
+        
+        points_matrix = engine.calculate_fantasy_points_batch(engine.build_stats_matrix(stats_list))
+        
+        for stats, breakdown in zip(stats_list, engine.breakdowns(points_matrix)):
+            expected_total, expected_breakdown = engine.calculate_fantasy_points(stats)
+            assert breakdown == pytest.approx(expected_breakdown)
+            assert sum(breakdown.values()) == pytest.approx(expected_total)
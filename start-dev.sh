@@ -45,7 +45,7 @@ source .venv/bin/activate
 
 # Start backend server
 echo "🔧 Starting FastAPI backend server on http://localhost:8000..."
-python -m uvicorn app.main:app --reload --host 0.0.0.0 --port 8000 &
+python -m uvicorn app.main:app --reload --loop uvloop --host 0.0.0.0 --port 8000 &
 BACKEND_PID=$!
 
 # Wait a moment for backend to start